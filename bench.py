@@ -0,0 +1,242 @@
+"""Benchmarks for the hot paths, with JSON results and baseline comparison.
+
+Every case runs on seeded strands at sizes from 1e2 to 1e8 bp (cases with
+a size cap skip the larger sizes).  Times are the median of several runs;
+peak memory comes from a separate run under tracemalloc.
+
+    python bench.py -o results.json                  # full run
+    python bench.py --max-size 1e5 --cases gc_content,complement
+    python bench.py --baseline before.json           # flag slowdowns, exit 1
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from dna_api_simulation import TextHelixView, get_text_helix
+from dna_lazy import module_available
+from dna_sequence import generate_dna_strand, get_complement_strand
+from dna_stats import _compositions, calculate_gc_content, get_statistics_text
+
+SIZES = [10 ** e for e in range(2, 9)]
+
+# Keep repeating a case until this much time has been spent (or MAX_REPEATS)
+TARGET_SECONDS = 0.5
+MIN_REPEATS = 3
+MAX_REPEATS = 50
+
+# Default tolerance before a result counts as a regression against the baseline
+REGRESSION_THRESHOLD = 0.10
+
+# Viewer settings reproduced by the headless geometry cases
+VIEW_WIDTH, VIEW_HEIGHT = 900, 700
+VIEW_ZOOM, VIEW_ROTATION_X, VIEW_ROTATION_Y = -60.0, 15.0, 30.0
+MAX_MESH_BLOCKS = 96
+
+
+# ---- Cases ------------------------------------------------------------------
+#
+# A case is ``setup(size) -> state`` plus ``run(state)``; only ``run`` is
+# timed.  Caches the code keeps on purpose are cleared inside ``run`` so
+# every repetition measures the real work.
+
+def _strand_pair(size):
+    strand = generate_dna_strand(size, seed=size)
+    return strand, get_complement_strand(strand)
+
+
+def _run_generate(size):
+    generate_dna_strand(size, seed=size)
+
+
+def _run_complement(state):
+    get_complement_strand(state[0])
+
+
+def _run_gc_content(state):
+    _compositions.clear()
+    calculate_gc_content(state[0])
+
+
+def _run_statistics_text(state):
+    _compositions.clear()
+    get_statistics_text(state[0])
+
+
+def _run_text_helix(state):
+    get_text_helix(*state)
+
+
+def _run_text_helix_window(state):
+    # One screenful from the middle of the virtual Text Helix tab
+    view = TextHelixView(*state)
+    view.lines(view.line_count // 2, view.line_count // 2 + 40)
+
+
+def _geometry_setup(size):
+    from dna_geometry import block_bounds, helix_height, perspective_matrix, view_matrix
+    strand, complement = _strand_pair(size)
+    far = 200.0 + 3 * helix_height(size)
+    return {
+        "strands": (strand, complement),
+        "bounds": block_bounds(size),
+        "projection": perspective_matrix(45, VIEW_WIDTH / VIEW_HEIGHT, 0.5, far),
+        "modelview": view_matrix(VIEW_ZOOM, VIEW_ROTATION_X, VIEW_ROTATION_Y,
+                                 helix_height(size)),
+    }
+
+
+def _run_geometry_scene(state):
+    """What the viewer computes once per strand: helix layout plus impostors."""
+    from dna_geometry import build_helix_impostors, helix_geometry
+    strand, complement = state["strands"]
+    helix_geometry.cache_clear()
+    build_helix_impostors(strand, complement, helix_geometry(len(strand)))
+
+
+def _run_geometry_frame(state):
+    """One cold frame of ``_render_helix``: cull, pick LODs, bake the meshes."""
+    from dna_geometry import LOD_BLOCK_SIZE, build_helix_mesh, helix_geometry, plan_frame
+    strand, complement = state["strands"]
+    geometry = helix_geometry(len(strand))
+    centres, radii = state["bounds"]
+    mesh_blocks, _, levels, _ = plan_frame(centres, radii, state["modelview"],
+                                           state["projection"], VIEW_HEIGHT,
+                                           MAX_MESH_BLOCKS)
+    for block in mesh_blocks.tolist():
+        start = block * LOD_BLOCK_SIZE
+        build_helix_mesh(strand, complement, geometry, start,
+                         min(start + LOD_BLOCK_SIZE, len(strand)), int(levels[block]))
+
+
+# name -> (setup, run, largest size or None, needs NumPy)
+CASES = {
+    "generate": (lambda size: size, _run_generate, None, False),
+    "complement": (_strand_pair, _run_complement, None, False),
+    "gc_content": (_strand_pair, _run_gc_content, None, False),
+    "statistics_text": (_strand_pair, _run_statistics_text, None, False),
+    "text_helix": (_strand_pair, _run_text_helix, 10 ** 7, False),
+    "text_helix_window": (_strand_pair, _run_text_helix_window, None, False),
+    "geometry_scene": (_geometry_setup, _run_geometry_scene, 10 ** 6, True),
+    "geometry_frame": (_geometry_setup, _run_geometry_frame, 10 ** 6, True),
+}
+
+
+# ---- Measuring --------------------------------------------------------------
+
+def measure(setup, run, size):
+    """Return ``(median seconds, fastest seconds, repeats, peak bytes)``."""
+    state = setup(size)
+    run(state)  # warm-up: imports, lazily built tables
+    times = []
+    started = time.perf_counter()
+    while len(times) < MAX_REPEATS and (len(times) < MIN_REPEATS
+                                        or time.perf_counter() - started < TARGET_SECONDS):
+        gc.collect()
+        t0 = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - t0)
+
+    gc.collect()
+    tracemalloc.start()
+    run(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), min(times), len(times), peak
+
+
+def environment():
+    numpy_version = None
+    if module_available("numpy"):
+        import numpy
+        numpy_version = numpy.__version__
+    return {
+        "python": platform.python_version(),
+        "numpy": numpy_version,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def run_benchmarks(cases, sizes, log=print):
+    results = []
+    for name in cases:
+        setup, run, max_size, needs_numpy = CASES[name]
+        if needs_numpy and not module_available("numpy"):
+            log(f"{name:18} skipped (needs NumPy)")
+            continue
+        for size in sizes:
+            if max_size is not None and size > max_size:
+                continue
+            seconds, fastest, repeats, peak = measure(setup, run, size)
+            results.append({
+                "case": name, "size": size, "seconds": seconds, "fastest": fastest,
+                "repeats": repeats, "bp_per_second": size / seconds if seconds else None,
+                "peak_bytes": peak,
+            })
+            log(f"{name:18} {size:>11,} bp  {seconds * 1e3:11.3f} ms"
+                f"  {size / seconds / 1e6 if seconds else 0:10.1f} Mbp/s"
+                f"  {peak / 2 ** 20:9.1f} MiB peak")
+    return results
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Return ``[(case, size, old seconds, new seconds), ...]`` that got slower."""
+    old = {(r["case"], r["size"]): r["seconds"] for r in baseline["results"]}
+    slower = []
+    for r in results:
+        before = old.get((r["case"], r["size"]))
+        if before and r["seconds"] > before * (1 + threshold):
+            slower.append((r["case"], r["size"], before, r["seconds"]))
+    return slower
+
+
+# ---- Command line -----------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", default=",".join(CASES),
+                        help="comma-separated cases (default: all)")
+    parser.add_argument("--min-size", type=float, default=SIZES[0])
+    parser.add_argument("--max-size", type=float, default=SIZES[-1])
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="allowed slowdown as a fraction (default 0.10)")
+    args = parser.parse_args(argv)
+
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+    sizes = [s for s in SIZES if args.min_size <= s <= args.max_size]
+
+    report = {"environment": environment(),
+              "results": run_benchmarks(cases, sizes)}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        slower = compare(report["results"], baseline, args.threshold)
+        for case, size, before, after in slower:
+            print(f"SLOWER  {case:18} {size:>11,} bp  {before * 1e3:.3f} ms -> "
+                  f"{after * 1e3:.3f} ms  (+{(after / before - 1) * 100:.0f}%)")
+        if slower:
+            return 1
+        print(f"No slowdowns beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Import-time benchmark: keeps the core modules fast to import.
+
+Imports each module in fresh interpreters (``python -X importtime``),
+reports the median cumulative import time and fails if a module goes over
+its budget or pulls in one of the heavy GUI / GL / HTTP / NumPy packages.
+
+    python bench_import.py            # table + exit status 1 on failure
+    python bench_import.py --runs 20
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Module -> import budget in milliseconds (cumulative, interpreter startup excluded)
+IMPORT_BUDGETS_MS = {
+    "dna_sequence": 25,
+    "dna_stats": 25,
+    "dna_io": 25,
+    "dna_api_simulation": 30,
+}
+
+# Packages that must only be imported by the features that need them
+HEAVY_MODULES = ("tkinter", "pygame", "OpenGL", "requests", "numpy")
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure(module):
+    """Import *module* in a fresh interpreter; return (ms, heavy modules loaded)."""
+    code = (f"import sys, {module}\n"
+            f"print(' '.join(sorted({{m.split('.')[0] for m in sys.modules}}"
+            f" & set({HEAVY_MODULES!r}))))")
+    # Allow bytecode caching so runs time the import, not compilation
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=HERE, env=env, capture_output=True, text=True, check=True)
+    micros = None
+    for line in proc.stderr.splitlines():
+        fields = [f.strip() for f in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            micros = int(fields[1])
+    return micros / 1000, proc.stdout.split()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7,
+                        help="fresh interpreters per module (default 7)")
+    args = parser.parse_args(argv)
+
+    failed = False
+    print(f"{'module':20} {'median ms':>10} {'budget':>8}  heavy imports")
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        measure(module)  # warm-up: writes the bytecode caches
+        runs = [measure(module) for _ in range(args.runs)]
+        median = statistics.median(ms for ms, _ in runs)
+        heavy = sorted({name for _, loaded in runs for name in loaded})
+        ok = median <= budget and not heavy
+        failed |= not ok
+        print(f"{module:20} {median:10.1f} {budget:8}  {', '.join(heavy) or '-'}"
+              f"{'' if ok else '   <-- FAIL'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""Headless batch mode: strand statistics as JSON Lines or CSV.
+
+Generates random strands or reads FASTA / .2bit files, computes the
+figures shown on the Statistics tab for every strand across a process
+pool, and streams one row per strand to stdout or a file.  ``compare``
+compares one sequence per species of ``ANIMALS`` (see ``dna_compare``);
+``orfs`` lists open reading frames in all six frames (see ``dna_translate``).
+Nothing here imports tkinter, pygame or OpenGL.
+
+    python dna_cli.py generate --count 1000 --length 100000 -k 3
+    python dna_cli.py stats genome.2bit reads.fa --format csv -o stats.csv
+    python dna_cli.py compare --length 10000 --format csv -o distances.csv
+    python dna_cli.py orfs genome.2bit --min-codons 300 --proteins
+"""
+
+import argparse
+import csv
+import functools
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from dna_compare import ALIGN_BAND, METRICS, compare_all, load_species, species_sequences
+from dna_io import open_sequence_file
+from dna_sequence import generate_dna_strand
+from dna_stats import (COMPOSITION_BASES, MAX_KMER_K, PARALLEL_CHUNK_SIZE,
+                       StrandStats, get_statistics)
+from dna_translate import ORF_MIN_CODONS, iter_orfs
+
+# Columns written by --format csv (top k-mers are packed into one column)
+CSV_FIELDS = (["name", "source", "length", "gc_content", "at_content"]
+              + list(COMPOSITION_BASES) + ["top_kmers"])
+
+# Columns of the orfs command (plus "protein" with --proteins)
+ORF_FIELDS = ["name", "strand", "frame", "start", "end", "codons"]
+
+
+# ---- Worker tasks -----------------------------------------------------------
+
+def _generate_task(task):
+    """Worker: ``(name, length, seed, gc_content, k)`` -> (name, source, StrandStats)."""
+    name, length, seed, gc_content, k = task
+    strand = generate_dna_strand(length, seed=seed, gc_content=gc_content)
+    return name, "Random Generation", StrandStats.from_strand(strand, k)
+
+
+@functools.lru_cache(maxsize=16)
+def _open_cached(path):
+    """Each worker opens (and indexes) a file once, however many tasks read it."""
+    return open_sequence_file(path)
+
+
+def _record_task(task):
+    """Worker: statistics of bases ``start:stop`` of one record in a file."""
+    path, index, start, stop, k = task
+    record = _open_cached(path).records[index]
+    piece = record[start:stop + max(k - 1, 0)]
+    return StrandStats.from_strand(piece, k, count_len=stop - start)
+
+
+def _record_tasks(paths, k, chunk_size):
+    """Yield ``(key, task)`` pairs, cutting long records into *chunk_size* ranges.
+
+    *key* is ``(name, source, last)``; *last* marks a record's final piece.
+    """
+    for path in paths:
+        with open_sequence_file(path) as seq_file:
+            for index, record in enumerate(seq_file.records):
+                length = len(record)
+                source = os.path.basename(path)
+                starts = range(0, length, chunk_size) if length else [0]
+                for start in starts:
+                    stop = min(start + chunk_size, length)
+                    yield (record.name, source, stop == length), (path, index, start, stop, k)
+
+
+def _run(fn, tasks, workers):
+    """Map *fn* over *tasks* in order, in-process or across a process pool."""
+    if workers == 1:
+        yield from map(fn, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Small tasks are sent in batches to keep the IPC overhead down
+        yield from pool.map(fn, tasks, chunksize=16)
+
+
+def generate_rows(count, length, k=0, seed=None, gc_content=None, workers=None):
+    """Yield ``(name, source, StrandStats)`` for *count* random strands."""
+    tasks = ((f"strand_{i}", length, None if seed is None else seed + i, gc_content, k)
+             for i in range(count))
+    yield from _run(_generate_task, tasks, workers or os.cpu_count() or 1)
+
+
+def file_rows(paths, k=0, workers=None, chunk_size=PARALLEL_CHUNK_SIZE):
+    """Yield ``(name, source, StrandStats)`` for every record in *paths*.
+
+    Long records are split into ranges reduced in parallel and merged
+    back in order, so one chromosome keeps every core busy.
+    """
+    keys = deque()
+
+    def tasks():
+        for key, task in _record_tasks(paths, k, chunk_size):
+            keys.append(key)
+            yield task
+
+    total = StrandStats(k=k)
+    for stats in _run(_record_task, tasks(), workers or os.cpu_count() or 1):
+        name, source, last = keys.popleft()
+        total = total.merge(stats)
+        if last:
+            yield name, source, total
+            total = StrandStats(k=k)
+
+
+# ---- Output -----------------------------------------------------------------
+
+def _row(name, source, stats, top_kmers):
+    row = {"name": name}
+    row.update(get_statistics(stats, source, top_kmers))
+    return row
+
+
+def write_jsonl(rows, out, top_kmers=10):
+    for name, source, stats in rows:
+        out.write(json.dumps(_row(name, source, stats, top_kmers)) + "\n")
+
+
+def write_csv(rows, out, top_kmers=10):
+    writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for name, source, stats in rows:
+        row = _row(name, source, stats, top_kmers)
+        row.update(row.pop("counts"))
+        kmers = row.pop("top_kmers", {})
+        row["top_kmers"] = " ".join(f"{kmer}:{n}" for kmer, n in kmers.items())
+        writer.writerow(row)
+
+
+def write_matrix_csv(comparison, out, metric="edit"):
+    """Distance matrix of *metric* as CSV, one row and one column per species."""
+    writer = csv.writer(out)
+    writer.writerow(["name"] + comparison.names)
+    for name, row in zip(comparison.names, comparison.distances(metric).tolist()):
+        writer.writerow([name] + [round(v, 6) for v in row])
+
+
+def orf_rows(strands, min_codons=ORF_MIN_CODONS, proteins=False):
+    """Yield one dict per ORF of every ``(name, strand)``, in strand order.
+
+    Proteins are translated only for the ORFs reported, one at a time.
+    """
+    for name, strand in strands:
+        for _, orfs in iter_orfs(strand, min_codons):
+            for orf in sorted(orfs, key=lambda orf: (orf.start, orf.frame)):
+                row = {"name": name, "strand": orf.strand, "frame": orf.frame,
+                       "start": orf.start, "end": orf.end, "codons": orf.codons}
+                if proteins:
+                    row["protein"] = orf.protein(strand)
+                yield row
+
+
+# ---- Command line -----------------------------------------------------------
+
+def _bounded(kind, low=None, high=None):
+    """An argparse ``type`` converting with *kind* and checking ``low <= value <= high``."""
+    def parse(text):
+        value = kind(text)
+        if low is not None and high is not None and not low <= value <= high:
+            raise argparse.ArgumentTypeError(f"must be between {low} and {high}, not {text}")
+        if low is not None and value < low:
+            raise argparse.ArgumentTypeError(f"must be at least {low}, not {text}")
+        return value
+    parse.__name__ = kind.__name__  # argparse names the type in "invalid int value"
+    return parse
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="dna_cli", description="Batch DNA statistics without the GUI.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-k", type=_bounded(int, 0, MAX_KMER_K), default=0,
+                        help=f"also tally k-mers of this length (1-{MAX_KMER_K})")
+    common.add_argument("--top", type=_bounded(int, 0), default=10,
+                        help="k-mers reported per strand (default 10)")
+    common.add_argument("-j", "--jobs", type=_bounded(int, 1), default=None,
+                        help="worker processes (default: all cores)")
+    common.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    common.add_argument("-o", "--output", default="-",
+                        help="output file (default: stdout)")
+
+    sub = parser.add_subparsers(dest="command", required=True)
+    gen = sub.add_parser("generate", parents=[common],
+                         help="statistics of random strands")
+    gen.add_argument("--count", type=_bounded(int, 0), default=1)
+    gen.add_argument("--length", type=_bounded(int, 0), default=100)
+    gen.add_argument("--seed", type=int, default=None,
+                     help="strand i uses seed + i, making the run reproducible")
+    gen.add_argument("--gc-content", type=_bounded(float, 0, 100), default=None,
+                     help="target GC content, as a percentage (0-100)")
+
+    stats = sub.add_parser("stats", parents=[common],
+                           help="statistics of every record in FASTA / .2bit files")
+    stats.add_argument("files", nargs="+")
+
+    compare = sub.add_parser(
+        "compare", help="all-pairs comparison of one sequence per species",
+        description="Compare one sequence per ANIMALS species: read from FASTA / "
+                    ".2bit files (records named after the species) or simulated. "
+                    "jsonl writes one row per pair, csv the distance matrix.")
+    compare.add_argument("files", nargs="*")
+    compare.add_argument("--length", type=_bounded(int, 0), default=10_000,
+                         help="length of simulated sequences (default 10000)")
+    compare.add_argument("--seed", type=int, default=None)
+    compare.add_argument("--divergence", type=_bounded(float, 0, 1), default=0.05,
+                         help="share of bases mutated per simulated branch (default 0.05)")
+    compare.add_argument("--band", type=_bounded(int, 0), default=ALIGN_BAND,
+                         help=f"alignment band half-width (default {ALIGN_BAND})")
+    compare.add_argument("--metric", choices=METRICS, default="edit",
+                         help="distance written by --format csv (default edit)")
+    compare.add_argument("-j", "--jobs", type=_bounded(int, 1), default=None,
+                         help="worker processes (default: all cores)")
+    compare.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    compare.add_argument("-o", "--output", default="-",
+                         help="output file (default: stdout)")
+
+    orfs = sub.add_parser(
+        "orfs", help="open reading frames in all six frames",
+        description="List the ORFs (ATG to stop) of every record in FASTA / .2bit "
+                    "files, or of a random strand if no file is given.")
+    orfs.add_argument("files", nargs="*")
+    orfs.add_argument("--length", type=_bounded(int, 0), default=1_000_000,
+                      help="length of the random strand (default 1000000)")
+    orfs.add_argument("--seed", type=int, default=None)
+    orfs.add_argument("--min-codons", type=_bounded(int, 1), default=ORF_MIN_CODONS,
+                      help=f"shortest ORF reported, in amino acids (default {ORF_MIN_CODONS})")
+    orfs.add_argument("--proteins", action="store_true",
+                      help="also write the protein of every ORF")
+    orfs.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    orfs.add_argument("-o", "--output", default="-",
+                      help="output file (default: stdout)")
+    return parser
+
+
+def _compare(args, out):
+    if args.files:
+        sequences = load_species(args.files)
+    else:
+        sequences = species_sequences(args.length, args.seed, args.divergence)
+    comparison = compare_all(sequences, args.band, args.jobs)
+    if args.format == "csv":
+        write_matrix_csv(comparison, out, args.metric)
+    else:
+        for row in comparison.pairs():
+            out.write(json.dumps(row) + "\n")
+
+
+def _file_records(paths):
+    """Yield ``(name, record)`` for every record in *paths*, closing each file after it."""
+    for path in paths:
+        with open_sequence_file(path) as seq_file:
+            for record in seq_file.records:
+                yield record.name, record
+
+
+def _orfs(args, out):
+    if args.files:
+        strands = _file_records(args.files)
+    else:
+        strands = [("strand_0", generate_dna_strand(args.length, seed=args.seed))]
+    rows = orf_rows(strands, args.min_codons, args.proteins)
+    if args.format == "csv":
+        writer = csv.DictWriter(out, fieldnames=ORF_FIELDS + ["protein"] * args.proteins)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        for row in rows:
+            out.write(json.dumps(row) + "\n")
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    out = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        if args.command == "compare":
+            _compare(args, out)
+        elif args.command == "orfs":
+            _orfs(args, out)
+        else:
+            if args.command == "generate":
+                rows = generate_rows(args.count, args.length, args.k, args.seed,
+                                     args.gc_content, args.jobs)
+            else:
+                rows = file_rows(args.files, args.k, args.jobs)
+            write = write_csv if args.format == "csv" else write_jsonl
+            write(rows, out, args.top)
+    except BrokenPipeError:  # e.g. piped into `head`
+        pass
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
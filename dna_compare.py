@@ -0,0 +1,318 @@
+"""All-pairs comparison of one sequence per species.
+
+Every pair of sequences gets an ungapped identity, a Hamming distance, a
+banded edit distance and a banded Smith-Waterman local alignment score.
+Both dynamic programmes walk the DP matrix row by row in diagonal
+coordinates (``d = j - i``, ``|d| <= band``) for a whole batch of pairs
+at once: a row is a NumPy array of pairs x band, and the dependency on
+the cell to the left becomes a running minimum (or maximum) along it.
+Batches of pairs are spread over a process pool.
+
+    comparison = compare_all(species_sequences(10_000, seed=1))
+    comparison.distances("edit")  # n x n, ready for clustering
+"""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from dna_api_simulation import ANIMALS
+from dna_io import open_sequence_file
+from dna_mutation import MutationEngine
+from dna_sequence import UNKNOWN_CODE, codes_array, generate_dna_strand, np
+from dna_stats import _require_numpy
+
+# Default half-width of the alignment band, in diagonals
+ALIGN_BAND = 64
+
+# Smith-Waterman scores (linear gap penalty)
+MATCH_SCORE = 2
+MISMATCH_SCORE = -1
+GAP_SCORE = -2
+
+# Pairs aligned together by one worker task
+PAIR_BATCH = 256
+
+# Metrics :meth:`Comparison.distances` can turn into a distance matrix
+METRICS = ("edit", "hamming", "score")
+
+
+# ---- Species sequences ------------------------------------------------------
+
+def species_sequences(length=10_000, seed=None, divergence=0.05, species=None):
+    """Simulate one related sequence per species in *species* (default ``ANIMALS``).
+
+    Sequences descend from a random ancestor along a random tree: each
+    species copies an earlier one and mutates about *divergence* of its
+    bases (substitutions and short indels), so the distances carry a
+    structure that clustering can recover.
+    """
+    names = list(ANIMALS if species is None else species)
+    rng = random.Random(seed)
+    sequences = {}
+    parent = generate_dna_strand(length, seed=rng.randrange(1 << 32))
+    for name in names:
+        if sequences:
+            parent = sequences[rng.choice(list(sequences))]
+        engine = MutationEngine(parent, seed=rng.randrange(1 << 32))
+        engine.step(int(len(parent) * divergence))
+        sequences[name] = str(engine.strand)
+    return sequences
+
+
+def _species_key(name):
+    return name.lower().replace("_", " ").strip()
+
+
+def load_species(paths, species=None):
+    """Read one sequence per species from FASTA / .2bit *paths*.
+
+    A record is matched to a species by its common or scientific name
+    (case-insensitive, ``_`` read as a space); unmatched records are
+    ignored and the first record found for a species wins.
+    """
+    catalogue = ANIMALS if species is None else species
+    wanted = {}
+    for common, scientific in catalogue.items():
+        wanted[_species_key(common)] = common
+        wanted[_species_key(scientific)] = common
+    sequences = {}
+    for path in paths:
+        with open_sequence_file(path) as seq_file:
+            for record in seq_file.records:
+                name = wanted.get(_species_key(record.name))
+                if name is not None and name not in sequences:
+                    sequences[name] = record[0:len(record)]
+    return sequences
+
+
+# ---- Pairwise kernels -------------------------------------------------------
+
+def hamming(codes_a, codes_b):
+    """Mismatching positions of two code arrays, plus their length difference.
+
+    Unknown bases always count as mismatches.
+    """
+    n = min(len(codes_a), len(codes_b))
+    a, b = codes_a[:n], codes_b[:n]
+    mismatches = np.count_nonzero((a != b) | (a == UNKNOWN_CODE))
+    return int(mismatches) + abs(len(codes_a) - len(codes_b))
+
+
+def _pad_batch(seqs, lefts, width, fill):
+    """Stack code arrays into an int8 matrix, row *r* starting at column ``lefts[r]``."""
+    out = np.full((len(seqs), width), fill, dtype=np.int8)
+    for row, (s, left) in enumerate(zip(seqs, lefts)):
+        out[row, left:left + len(s)] = s
+    return out
+
+
+def align_batch(pairs, band=ALIGN_BAND):
+    """Banded edit distances and Smith-Waterman scores of a batch of pairs.
+
+    *pairs* are ``(codes_a, codes_b)`` int8 code arrays.  Both DPs are
+    confined to the diagonals ``j - i`` from ``min(0, lb - la) - band``
+    to ``max(0, lb - la) + band``: the edit distance is exact whenever an
+    optimal alignment stays inside the band (an upper bound otherwise),
+    and so is the local score.  Returns ``(edit, score)`` int arrays.
+
+    The DP runs along anti-diagonals ``t = i + j``, whose cells depend
+    only on the two anti-diagonals before, so each step is a handful of
+    whole-batch array operations.  Cell *k* of anti-diagonal *t* is
+    diagonal ``d = low + 2k + t % 2``.
+    """
+    n = len(pairs)
+    lengths_a = np.array([len(a) for a, _ in pairs])
+    lengths_b = np.array([len(b) for _, b in pairs])
+    delta = lengths_b - lengths_a
+    low = np.minimum(delta, 0) - band
+    low -= low & 1  # even, so that cell k of every pair has the same parity
+    high = np.maximum(delta, 0) + band
+    cells = int(((high - low) // 2).max()) + 1
+    steps = int((lengths_a + lengths_b).max())
+    half_low = low // 2
+
+    # Rolling anti-diagonals t - 2, t - 1 and t, as rows of cells with a
+    # guard column on each side: out of the band, so inf for edits and 0
+    # for scores.  Steps work on the flattened arrays, where the up and
+    # left neighbours are one element away, and then restore the guards.
+    width = cells + 2
+
+    # a reversed and b forward, padded so that anti-diagonal t reads
+    # a[i - 1] from columns steps // 2 - t // 2 + c of a and b[j - 1] from
+    # columns (t + 1) // 2 + c of b, c = k + 1 being the column with
+    # guards.  Unknown bases and padding never match: 5 on the a side,
+    # 6 on the b side.
+    start_a = steps // 2 - half_low  # column of a[0]
+    a = np.full((n, int(start_a.max()) + width), 5, dtype=np.int8)
+    for p, (codes, _) in enumerate(pairs):
+        codes = np.where(codes == UNKNOWN_CODE, 5, codes)[::-1]
+        a[p, start_a[p] - len(codes) + 1:start_a[p] + 1] = codes
+    b = _pad_batch([np.where(codes == UNKNOWN_CODE, 6, codes) for _, codes in pairs],
+                   (2 - half_low).tolist(), int((2 - half_low).max()) + steps // 2 + width + 1, 6)
+
+    # int16 halves the memory traffic whenever every value fits
+    inf = steps + 1  # above any edit distance of the batch
+    small = inf + width < 1 << 15 and MATCH_SCORE * steps < 1 << 16
+    dtype = np.int16 if small else np.int32
+    inf, one, zero, gap = dtype(inf), dtype(1), dtype(0), dtype(-GAP_SCORE)
+    substitution = np.int8(MATCH_SCORE - MISMATCH_SCORE)
+    mismatch = np.int8(MISMATCH_SCORE)
+
+    edit = [np.full(n * width, inf, dtype=dtype) for _ in range(3)]
+    score = [np.zeros(n * width, dtype=dtype) for _ in range(3)]
+    best = np.zeros(n * width, dtype=dtype)
+    edit[1][np.arange(n) * width + 1 - half_low] = 0  # t = 0: the cell (0, 0)
+    guards = np.concatenate((np.arange(n) * width, np.arange(n) * width + width - 1))
+    diagonals = half_low[:, None] * 2 + 2 * np.arange(cells)
+    outside = int(max(high.max(), -low.min()))  # later t have no i < 0 or j < 0 cells
+    result = np.zeros(n, dtype=np.int64)
+    inner = slice(1, n * width - 1)
+    # Up and left neighbours: cells k - 1, k (even t) or k, k + 1 (odd t)
+    neighbours = [(slice(odd, n * width - 2 + odd), slice(odd + 1, n * width - 1 + odd))
+                  for odd in (0, 1)]
+
+    finish = {}  # t -> pairs whose last cell (la, lb) is on anti-diagonal t
+    for p, t in enumerate((lengths_a + lengths_b).tolist()):
+        finish.setdefault(t, []).append(p)
+    finish = {t: np.array(done) for t, done in finish.items()}
+
+    for t in range(1, steps + 1):
+        older, prev, cur = edit
+        s_older, s_prev, s_cur = score
+        odd = t & 1
+        first, second = neighbours[odd]
+        column_a, column_b = steps // 2 - t // 2, (t + 1) // 2
+        match = (a[:, column_a:column_a + width] == b[:, column_b:column_b + width]).reshape(-1)
+        match = match[inner]
+
+        # Edit distance
+        out = cur[inner]
+        np.minimum(prev[first], prev[second], out=out)
+        out += one
+        np.minimum(out, older[inner] + ~match, out=out)
+        cur[guards] = inf
+        if t <= outside:
+            d = diagonals + odd
+            grid = cur.reshape(n, width)
+            grid[:, 1:-1][(d > t) | (d < -t)] = inf  # i < 0 or j < 0: outside the matrix
+
+        # Smith-Waterman with a linear gap, floored at zero
+        out = s_cur[inner]
+        np.maximum(s_prev[first], s_prev[second], out=out)
+        out -= gap
+        np.maximum(out, s_older[inner] + (match.view(np.int8) * substitution + mismatch),
+                   out=out)
+        np.maximum(out, zero, out=out)
+        s_cur[guards] = zero
+        np.maximum(best, s_cur, out=best)
+
+        if t in finish:
+            done = finish[t]
+            result[done] = cur[done * width + 1 + (delta[done] - low[done] - odd) // 2]
+        edit = prev, cur, older
+        score = s_prev, s_cur, s_older
+    return result, best.reshape(n, width).max(axis=1).astype(np.int64)
+
+
+def _compare_task(task):
+    """Worker: ``(pair indices, pairs, band)`` -> (indices, hamming, edit, score)."""
+    indices, pairs, band = task
+    hammings = [hamming(a, b) for a, b in pairs]
+    edit, score = align_batch(pairs, band)
+    return indices, hammings, edit.tolist(), score.tolist()
+
+
+# ---- All pairs --------------------------------------------------------------
+
+class Comparison:
+    """Pairwise results over *names*; every matrix is symmetric, n x n."""
+
+    def __init__(self, names, lengths):
+        n = len(names)
+        self.names = list(names)
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.hamming = np.zeros((n, n), dtype=np.int64)
+        self.edit = np.zeros((n, n), dtype=np.int64)
+        self.score = np.zeros((n, n), dtype=np.int64)
+
+    def _set(self, i, j, hamming, edit, score):
+        self.hamming[i, j] = self.hamming[j, i] = hamming
+        self.edit[i, j] = self.edit[j, i] = edit
+        self.score[i, j] = self.score[j, i] = score
+
+    def _longer(self):
+        longer = np.maximum.outer(self.lengths, self.lengths)
+        return np.maximum(longer, 1)
+
+    @property
+    def identity(self):
+        """Share of identical positions, ungapped, over the longer sequence."""
+        return 1 - self.hamming / self._longer()
+
+    def distances(self, metric="edit"):
+        """Distance matrix in [0, 1] from one of ``METRICS``, zero on the diagonal.
+
+        ``edit`` and ``hamming`` are divided by the longer length (so the
+        latter is one minus the identity); ``score`` is one minus the local
+        score over a perfect match of the shorter sequence.
+        """
+        if metric == "edit":
+            out = self.edit / self._longer()
+        elif metric == "hamming":
+            out = self.hamming / self._longer()
+        elif metric == "score":
+            shorter = np.maximum(np.minimum.outer(self.lengths, self.lengths), 1)
+            out = 1 - self.score / (MATCH_SCORE * shorter)
+        else:
+            raise ValueError(f"unknown metric {metric!r}; expected one of {METRICS}")
+        out = np.clip(out, 0.0, 1.0)
+        np.fill_diagonal(out, 0.0)
+        return out
+
+    def pairs(self):
+        """Yield one dict of figures per pair (i < j)."""
+        identity = self.identity
+        for i in range(len(self.names)):
+            for j in range(i + 1, len(self.names)):
+                yield {"a": self.names[i], "b": self.names[j],
+                       "identity": round(float(identity[i, j]), 6),
+                       "hamming": int(self.hamming[i, j]),
+                       "edit": int(self.edit[i, j]),
+                       "score": int(self.score[i, j])}
+
+
+def compare_all(sequences, band=ALIGN_BAND, workers=None, batch=PAIR_BATCH):
+    """Compare every pair of *sequences* (``{name: strand}``); return a :class:`Comparison`.
+
+    Pairs of similar length differences are batched together (a batch's
+    band is as wide as its widest pair's) and batches are shared out over *workers*
+    processes (default: all cores; 1 runs in-process).
+    """
+    _require_numpy("compare_all")
+    names = list(sequences)
+    codes = [codes_array(sequences[name]).astype(np.int8) for name in names]
+    comparison = Comparison(names, [len(c) for c in codes])
+    pairs = sorted(((i, j) for i in range(len(names)) for j in range(i + 1, len(names))),
+                   key=lambda p: (abs(len(codes[p[0]]) - len(codes[p[1]])), p))
+    if not pairs:
+        return comparison
+
+    workers = workers or os.cpu_count() or 1
+    # Enough batches to keep every worker busy, but no bigger than *batch*
+    size = max(1, min(batch, -(-len(pairs) // workers)))
+    tasks = [(pairs[k:k + size], [(codes[i], codes[j]) for i, j in pairs[k:k + size]], band)
+             for k in range(0, len(pairs), size)]
+    if workers == 1 or len(tasks) == 1:
+        results = map(_compare_task, tasks)
+    else:
+        pool = ProcessPoolExecutor(max_workers=min(workers, len(tasks)))
+        results = pool.map(_compare_task, tasks)
+    try:
+        for indices, hammings, edits, scores in results:
+            for (i, j), h, e, s in zip(indices, hammings, edits, scores):
+                comparison._set(i, j, h, e, s)
+    finally:
+        if workers != 1 and len(tasks) > 1:
+            pool.shutdown()
+    return comparison
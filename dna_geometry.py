@@ -0,0 +1,349 @@
+"""Helix geometry as NumPy arrays, shared by the 3-D viewer and exporters.
+
+Nothing here touches OpenGL, so the geometry can be built and checked
+headlessly.  Coordinates depend only on the strand length and the helix
+parameters, and are cached per ``(length, radius, rise, twist)`` key.
+"""
+
+import functools
+import math
+
+import numpy as np
+
+from dna_sequence import CODE_BASES, codes_array
+
+# Color scheme for bases (RGB float tuples for OpenGL)
+BASE_COLORS_GL = {
+    'A': (1.0, 0.42, 0.42),   # Red
+    'T': (0.31, 0.80, 0.77),  # Cyan
+    'G': (1.0, 0.90, 0.43),   # Yellow
+    'C': (0.58, 0.88, 0.83),  # Green
+}
+
+# Helix layout used by the 3-D viewer
+HELIX_RADIUS = 3.0
+RISE_PER_BP = 0.5            # vertical rise per base pair
+TWIST = 2 * math.pi / 10     # 10 bp per full turn
+
+# Sizes, colours and tessellation of the helix parts
+NUCLEOTIDE_RADIUS = 0.35
+BOND_RADIUS = 0.06
+BACKBONE_RADIUS = 0.12
+BOND_COLOR = (0.6, 0.6, 0.6)
+BACKBONE_COLOR = (0.25, 0.25, 0.25)
+UNKNOWN_BASE_COLOR = (0.5, 0.5, 0.5)
+SPHERE_SLICES, SPHERE_STACKS = 12, 12
+CYLINDER_SLICES = 10
+
+# Levels of detail: full and coarse meshes, then impostor points and lines
+LOD_FULL, LOD_COARSE, LOD_IMPOSTOR, LOD_CULLED = 0, 1, 2, -1
+
+# Tessellation per mesh level: (sphere slices, sphere stacks, cylinder slices)
+MESH_DETAIL = {
+    LOD_FULL: (SPHERE_SLICES, SPHERE_STACKS, CYLINDER_SLICES),
+    LOD_COARSE: (6, 4, 5),
+}
+
+# Projected nucleotide diameter (pixels) at which each mesh level kicks in
+LOD_FULL_PIXELS = 8.0
+LOD_COARSE_PIXELS = 3.0
+
+# Base pairs per culling / LOD block
+LOD_BLOCK_SIZE = 32
+
+
+class HelixGeometry:
+    """Nucleotide positions and segment end points of a double helix.
+
+    ``positions1``/``positions2`` are (n, 3); ``bonds``, ``backbone1`` and
+    ``backbone2`` are (m, 2, 3) arrays of segment start/end points.  The
+    arrays are read-only because instances are shared through the cache.
+    """
+
+    __slots__ = ("length", "positions1", "positions2", "bonds",
+                 "backbone1", "backbone2")
+
+    def __init__(self, length, positions1, positions2):
+        self.length = length
+        self.positions1 = positions1
+        self.positions2 = positions2
+        self.bonds = np.stack((positions1, positions2), axis=1)
+        self.backbone1 = np.stack((positions1[:-1], positions1[1:]), axis=1)
+        self.backbone2 = np.stack((positions2[:-1], positions2[1:]), axis=1)
+        for name in self.__slots__[1:]:
+            getattr(self, name).setflags(write=False)
+
+    def __repr__(self):
+        return f"HelixGeometry(length={self.length})"
+
+
+@functools.lru_cache(maxsize=16)
+def helix_geometry(length, helix_radius=HELIX_RADIUS, rise_per_bp=RISE_PER_BP,
+                   twist=TWIST):
+    """Return the (cached) HelixGeometry for a strand of *length* bases."""
+    i = np.arange(length)
+    angle = i * twist
+    y = i * rise_per_bp
+    positions1 = np.stack((helix_radius * np.cos(angle), y,
+                           helix_radius * np.sin(angle)), axis=-1)
+    positions2 = np.stack((helix_radius * np.cos(angle + math.pi), y,
+                           helix_radius * np.sin(angle + math.pi)), axis=-1)
+    return HelixGeometry(length, positions1, positions2)
+
+
+def helix_height(length, rise_per_bp=RISE_PER_BP):
+    """Height of a helix of *length* base pairs along the y axis."""
+    return length * rise_per_bp
+
+
+# ---- Triangle meshes --------------------------------------------------------
+
+def _grid_indices(rows, cols):
+    """Triangle indices for a (rows + 1) x (cols + 1) grid of vertices."""
+    r, c = np.meshgrid(np.arange(rows), np.arange(cols), indexing="ij")
+    a = r * (cols + 1) + c
+    b = a + cols + 1
+    return np.stack((a, b, a + 1, a + 1, b, b + 1), axis=-1).ravel().astype(np.uint32)
+
+
+@functools.lru_cache(maxsize=None)
+def sphere_mesh(slices, stacks):
+    """Unit sphere as (vertices, indices); the vertices double as normals."""
+    theta, phi = np.meshgrid(np.linspace(0, math.pi, stacks + 1),
+                             np.linspace(0, 2 * math.pi, slices + 1), indexing="ij")
+    verts = np.stack((np.sin(theta) * np.cos(phi), np.sin(theta) * np.sin(phi),
+                      np.cos(theta)), axis=-1).reshape(-1, 3)
+    return verts, _grid_indices(stacks, slices)
+
+
+@functools.lru_cache(maxsize=None)
+def cylinder_mesh(slices):
+    """Open unit cylinder along +z, radius 1 and height 1, as (vertices, indices)."""
+    z, phi = np.meshgrid([0.0, 1.0], np.linspace(0, 2 * math.pi, slices + 1),
+                         indexing="ij")
+    verts = np.stack((np.cos(phi), np.sin(phi), z), axis=-1).reshape(-1, 3)
+    return verts, _grid_indices(1, slices)
+
+
+def bake_spheres(centres, radius, colors, mesh):
+    """Copies of the unit sphere *mesh* placed at *centres*: (pos, normal, color, idx)."""
+    verts, indices = mesh
+    positions = centres[:, None, :] + radius * verts[None]
+    normals = np.broadcast_to(verts, positions.shape)
+    colors = np.broadcast_to(colors[:, None, :], positions.shape)
+    return positions, normals, colors, indices
+
+
+def bake_cylinders(segments, radius, color, mesh):
+    """Copies of the unit cylinder *mesh* stretched along (m, 2, 3) *segments*."""
+    verts, indices = mesh
+    starts = segments[:, 0]
+    axis = segments[:, 1] - starts
+    length = np.linalg.norm(axis, axis=1)
+    keep = length > 1e-6
+    starts, axis, length = starts[keep], axis[keep], length[keep]
+    w = axis / length[:, None]
+
+    # Orthonormal frame (u, v, w) around each cylinder's axis
+    helper = np.where(np.abs(w[:, 2:3]) < 0.9, [0.0, 0.0, 1.0], [1.0, 0.0, 0.0])
+    u = np.cross(helper, w)
+    u /= np.linalg.norm(u, axis=1)[:, None]
+    v = np.cross(w, u)
+
+    x, y, z = verts[:, 0], verts[:, 1], verts[:, 2]
+    normals = x[None, :, None] * u[:, None, :] + y[None, :, None] * v[:, None, :]
+    positions = starts[:, None, :] + radius * normals + z[None, :, None] * axis[:, None, :]
+    colors = np.broadcast_to(np.asarray(color), positions.shape)
+    return positions, normals, colors, indices
+
+
+def merge_meshes(parts):
+    """Concatenate baked parts into flat float32/uint32 arrays keyed by name."""
+    arrays = {"positions": [], "normals": [], "colors": [], "indices": []}
+    offset = 0
+    for positions, normals, colors, indices in parts:
+        count, per_copy = positions.shape[:2]
+        copy_offsets = offset + np.arange(count, dtype=np.uint32) * per_copy
+        arrays["indices"].append((indices[None, :] + copy_offsets[:, None]).ravel())
+        arrays["positions"].append(positions.reshape(-1, 3))
+        arrays["normals"].append(normals.reshape(-1, 3))
+        arrays["colors"].append(colors.reshape(-1, 3))
+        offset += count * per_copy
+
+    return {
+        name: np.concatenate(chunks).astype(np.uint32 if name == "indices" else np.float32)
+        for name, chunks in arrays.items()
+    }
+
+
+def base_colors(strand):
+    """(n, 3) array of the GL colour of every base in *strand*."""
+    palette = np.array([BASE_COLORS_GL[b] for b in CODE_BASES] + [UNKNOWN_BASE_COLOR])
+    return palette[codes_array(strand)]
+
+
+def build_helix_mesh(strand1, strand2, geometry=None, start=0, stop=None,
+                     detail=LOD_FULL):
+    """Bake every sphere and cylinder of the helix into flat vertex arrays.
+
+    Returns float32 ``positions``, ``normals`` and ``colors`` (N x 3) and the
+    uint32 triangle ``indices`` into them.  *start*/*stop* restrict the mesh
+    to a range of base pairs (its backbone still reaches the next base), and
+    *detail* picks the tessellation from ``MESH_DETAIL``.  *geometry* may be
+    longer than the strands (see :func:`build_helix_impostors`).
+    """
+    geom = geometry or helix_geometry(len(strand1))
+    stop = len(strand1) if stop is None else stop
+    sphere_slices, sphere_stacks, cylinder_slices = MESH_DETAIL[detail]
+    sphere = sphere_mesh(sphere_slices, sphere_stacks)
+    cylinder = cylinder_mesh(cylinder_slices)
+    span = slice(start, stop)
+    links = slice(start, min(stop, len(strand1) - 1))  # no link past the last base
+    return merge_meshes([
+        # Nucleotide spheres
+        bake_spheres(geom.positions1[span], NUCLEOTIDE_RADIUS,
+                     base_colors(strand1[span]), sphere),
+        bake_spheres(geom.positions2[span], NUCLEOTIDE_RADIUS,
+                     base_colors(strand2[span]), sphere),
+        # Hydrogen bonds (connector between base pair)
+        bake_cylinders(geom.bonds[span], BOND_RADIUS, BOND_COLOR, cylinder),
+        # Backbone segments
+        bake_cylinders(geom.backbone1[links], BACKBONE_RADIUS, BACKBONE_COLOR, cylinder),
+        bake_cylinders(geom.backbone2[links], BACKBONE_RADIUS, BACKBONE_COLOR, cylinder),
+    ])
+
+
+def impostor_colors(strand1, strand2, start=0, stop=None):
+    """``point_colors`` of base pairs ``start:stop`` (2 float32 RGB rows per pair)."""
+    span = slice(start, len(strand1) if stop is None else stop)
+    return np.stack((base_colors(strand1[span]), base_colors(strand2[span])),
+                    axis=1).reshape(-1, 3).astype(np.float32)
+
+
+def build_helix_impostors(strand1, strand2, geometry=None):
+    """Point and line arrays standing in for far-away parts of the helix.
+
+    ``point_positions``/``point_colors`` hold 2 points per base pair and
+    ``line_positions``/``line_colors`` 6 line vertices per base pair (bond
+    plus both backbone links), so base pair *i* always starts at vertex
+    ``2 * i`` and ``6 * i`` respectively.  A *geometry* longer than the
+    strands leaves room for them to grow: the spare pairs get positions
+    and black points, and callers draw only ``len(strand1)`` pairs.
+    """
+    geom = geometry or helix_geometry(len(strand1))
+    n = geom.length
+    p1, p2 = geom.positions1, geom.positions2
+    # Degenerate backbone link after the last base keeps 6 vertices per pair
+    next1 = np.concatenate((p1[1:], p1[-1:]))
+    next2 = np.concatenate((p2[1:], p2[-1:]))
+    lines = np.stack((p1, p2, p1, next1, p2, next2), axis=1).reshape(-1, 3)
+    line_colors = np.empty((n, 6, 3))
+    line_colors[:, :2] = BOND_COLOR
+    line_colors[:, 2:] = BACKBONE_COLOR
+    return {
+        "point_positions": np.stack((p1, p2), axis=1).reshape(-1, 3).astype(np.float32),
+        "point_colors": np.concatenate((impostor_colors(strand1, strand2),
+                                        np.zeros((2 * (n - len(strand1)), 3), np.float32))),
+        "line_positions": lines.astype(np.float32),
+        "line_colors": line_colors.reshape(-1, 3).astype(np.float32),
+    }
+
+
+# ---- Culling and level of detail --------------------------------------------
+
+def block_bounds(length, block_size=LOD_BLOCK_SIZE, helix_radius=HELIX_RADIUS,
+                 rise_per_bp=RISE_PER_BP):
+    """Bounding spheres ``(centres, radii)`` of consecutive blocks of base pairs."""
+    starts = np.arange(0, length, block_size)
+    stops = np.minimum(starts + block_size, length)
+    # A block's backbone reaches one base into the next block
+    half = np.minimum(stops, length - 1) - starts
+    half = np.maximum(half, 0) * rise_per_bp / 2
+    centres = np.zeros((len(starts), 3))
+    centres[:, 1] = starts * rise_per_bp + half
+    radii = np.hypot(helix_radius, half) + NUCLEOTIDE_RADIUS
+    return centres, radii
+
+
+def frustum_planes(clip):
+    """The six normalised planes ``(a, b, c, d)`` of a 4x4 clip matrix."""
+    rows = np.asarray(clip, dtype=np.float64)
+    planes = np.array([rows[3] + rows[0], rows[3] - rows[0],
+                       rows[3] + rows[1], rows[3] - rows[1],
+                       rows[3] + rows[2], rows[3] - rows[2]])
+    return planes / np.linalg.norm(planes[:, :3], axis=1)[:, None]
+
+
+def spheres_in_frustum(planes, centres, radii):
+    """Boolean mask of the spheres at least partly inside the frustum."""
+    distances = centres @ planes[:, :3].T + planes[:, 3]
+    return (distances >= -radii[:, None]).all(axis=1)
+
+
+def block_lod_levels(centres, radii, modelview, projection, viewport_height):
+    """Pick a level of detail for every block.
+
+    *modelview* and *projection* are 4x4 matrices in the usual column-vector
+    convention.  Returns ``(levels, pixels)``: one of the ``LOD_*`` values
+    and the projected nucleotide diameter at the block's nearest point.
+    """
+    modelview = np.asarray(modelview, dtype=np.float64)
+    projection = np.asarray(projection, dtype=np.float64)
+    visible = spheres_in_frustum(frustum_planes(projection @ modelview), centres, radii)
+
+    homogeneous = np.column_stack((centres, np.ones(len(centres))))
+    depth = -(homogeneous @ modelview.T)[:, 2]
+    nearest = np.maximum(depth - radii, 1e-3)
+    pixels = 2 * NUCLEOTIDE_RADIUS * projection[1, 1] * viewport_height / 2 / nearest
+
+    levels = np.full(len(centres), LOD_IMPOSTOR)
+    levels[pixels >= LOD_COARSE_PIXELS] = LOD_COARSE
+    levels[pixels >= LOD_FULL_PIXELS] = LOD_FULL
+    levels[~visible] = LOD_CULLED
+    return levels, pixels
+
+
+def plan_frame(centres, radii, modelview, projection, viewport_height, max_mesh_blocks):
+    """Decide how each block is drawn this frame.
+
+    Returns ``(mesh_blocks, impostor, levels, pixels)``: the blocks that
+    get meshes, nearest first and at most *max_mesh_blocks* of them; a
+    boolean mask of the blocks drawn as points and lines; and the output of
+    :func:`block_lod_levels`.
+    """
+    levels, pixels = block_lod_levels(centres, radii, modelview, projection,
+                                      viewport_height)
+    wanted = np.flatnonzero((levels == LOD_FULL) | (levels == LOD_COARSE))
+    wanted = wanted[np.argsort(-pixels[wanted], kind="stable")]
+    impostor = levels == LOD_IMPOSTOR
+    impostor[wanted[max_mesh_blocks:]] = True
+    return wanted[:max_mesh_blocks], impostor, levels, pixels
+
+
+# ---- Camera matrices (as set up by the viewer, for headless use) ------------
+
+def perspective_matrix(fovy, aspect, near, far):
+    """The 4x4 projection matrix ``gluPerspective`` builds."""
+    f = 1.0 / math.tan(math.radians(fovy) / 2)
+    return np.array([[f / aspect, 0, 0, 0],
+                     [0, f, 0, 0],
+                     [0, 0, (far + near) / (near - far), 2 * far * near / (near - far)],
+                     [0, 0, -1, 0]])
+
+
+def view_matrix(zoom, rotation_x, rotation_y, height):
+    """The viewer's model-view matrix: pull back by *zoom*, tilt, spin, centre."""
+    ax, ay = math.radians(rotation_x), math.radians(rotation_y)
+    translate = np.eye(4)
+    translate[2, 3] = zoom
+    rot_x = np.array([[1, 0, 0, 0],
+                      [0, math.cos(ax), -math.sin(ax), 0],
+                      [0, math.sin(ax), math.cos(ax), 0],
+                      [0, 0, 0, 1]])
+    rot_y = np.array([[math.cos(ay), 0, math.sin(ay), 0],
+                      [0, 1, 0, 0],
+                      [-math.sin(ay), 0, math.cos(ay), 0],
+                      [0, 0, 0, 1]])
+    centre = np.eye(4)
+    centre[1, 3] = -height * 0.5
+    return translate @ rot_x @ rot_y @ centre
@@ -0,0 +1,1180 @@
+"""The tkinter GUI: statistics, text helix and API log tabs.
+
+Slow work (generation, file loading, statistics, HTTP) runs on a
+``dna_tasks.TaskRunner``; the 3-D viewer runs in one long-lived process
+(``dna_viewer_process``).
+"""
+
+import json
+import os
+import tkinter as tk
+import tkinter.font as tkfont
+from tkinter import filedialog, ttk, scrolledtext
+
+from dna_api_simulation import (ANIMALS, BASE_COLORS_HEX, MAX_BASE_PAIRS,
+                                TextHelixView, opengl_available)
+from dna_io import export_strand, open_sequence_file
+from dna_mutation import MutableStrand, MutationEngine, dirty_ranges
+from dna_sequence import (BASES, COMPLEMENT, NUMPY_AVAILABLE, PackedStrand,
+                          get_complement_strand, iter_dna_chunks, join_strands, np)
+from dna_search import IUPAC_CODES, KmerIndex, kmer_spectrum
+from dna_stats import MAX_KMER_K, StrandStats, gc_profile, get_composition, get_statistics_text
+from dna_tasks import TaskRunner
+from dna_translate import FRAMES, ORF_MIN_CODONS, iter_orfs
+from dna_viewer_process import ViewerProcess
+
+
+# Bases generated between progress updates
+GENERATE_CHUNK = 1 << 18
+
+# Motif hits listed on the k-mers tab (all of them are counted)
+MAX_MOTIF_HITS = 500
+
+# ORFs listed on the ORFs tab, longest first (all of them are mapped)
+MAX_ORFS_LISTED = 500
+
+# Amino acids shown per ORF in that list
+ORF_PROTEIN_PREVIEW = 40
+
+# Milliseconds between generations of the mutation animation
+MUTATION_INTERVAL_MS = 100
+
+# Quiet time after the last resize event before a canvas is laid out again
+RESIZE_DEBOUNCE_MS = 60
+
+# Endpoints used by the "Demo API Call" button
+DEMO_API_URL = "https://dog.ceo/api/breeds/list/all"
+DEMO_API_URL2 = "https://dog.ceo/api/breeds/image/random"
+
+
+def _analysis_job(task, strand, source):
+    """Complement and GC profile of *strand*, warming the composition memo.
+
+    Returns ``(strand, complement, profile, source)`` for the GUI, with
+    *profile* ``(window, step, starts, gc, skew)`` or None.
+    """
+    complement = get_complement_strand(strand)
+    task.report(0.75, "Computing statistics…")
+    get_composition(strand)
+    profile = None
+    if NUMPY_AVAILABLE and len(strand):  # an empty strand has no windows
+        task.report(0.9, "Computing GC profile…")
+        window, step = _profile_window(len(strand))
+        profile = (window, step) + gc_profile(strand, window, step)
+    return strand, complement, profile, source
+
+
+def _generate_job(task, bp):
+    """Worker side of "Generate DNA": a random strand, then its analysis."""
+    parts = []
+    done = 0
+    for part in iter_dna_chunks(bp, GENERATE_CHUNK):
+        parts.append(part)
+        done += len(part)
+        task.report(0.7 * done / bp, f"Generating strand… {done:,} / {bp:,} bp")
+    return _analysis_job(task, join_strands(parts), "Random Generation")
+
+
+def _load_job(task, path, index=0):
+    """Worker side of "Open File": record *index* of a FASTA / .2bit file.
+
+    Returns the analysis tuple plus the names of all records in the file
+    and the open file itself, which the record keeps reading from.
+    """
+    task.report(None, f"Opening {os.path.basename(path)}…")
+    seq_file = open_sequence_file(path)
+    try:
+        records = seq_file.records
+        if not records:
+            raise ValueError(f"no sequences in {os.path.basename(path)}")
+        record = records[index]
+        task.report(0.3, f"Reading {record.name}…")
+        len(record)  # measures the record
+        source = f"{os.path.basename(path)} – {record.name}"
+        return _analysis_job(task, record, source) + ([r.name for r in records], seq_file)
+    except BaseException:
+        seq_file.close()
+        raise
+
+
+def _export_job(task, path, strand, name):
+    """Worker side of "Export FASTA": the strand and its complement."""
+    task.report(None, f"Writing {os.path.basename(path)}…")
+    export_strand(path, strand, name)
+    return path
+
+
+def _kmer_job(task, strand, k):
+    """Worker side of the k-mers tab: the k-mer tally of *strand*."""
+    task.report(None, f"Counting {k}-mers…")
+    return strand, k, StrandStats.from_strand(strand, k).kmer_counts
+
+
+def _orf_job(task, strand, min_codons):
+    """Worker side of the ORFs tab: ORFs of *strand* in all six frames.
+
+    Returns ``(strand, min_codons, orfs, previews)``; *previews* holds the
+    start of the protein of each of the longest ``MAX_ORFS_LISTED`` ORFs.
+    """
+    length = len(strand)
+    orfs = []
+    for done, found in iter_orfs(strand, min_codons):
+        orfs += found
+        task.report(done / max(length, 1), f"Finding ORFs… {done:,} / {length:,} bp")
+    orfs.sort(key=lambda orf: (orf.start, orf.frame))
+    longest = sorted(orfs, key=lambda orf: -orf.codons)[:MAX_ORFS_LISTED]
+    previews = [(orf, orf.protein(strand, ORF_PROTEIN_PREVIEW)) for orf in longest]
+    return strand, min_codons, orfs, previews
+
+
+def _search_job(task, strand, index, pattern):
+    """Worker side of "Find": index *strand* unless *index* is given, then search."""
+    if index is None:
+        task.report(None, f"Indexing {len(strand):,} bp…")
+        index = KmerIndex(strand)
+    task.report(None, f"Searching for {pattern}…")
+    return (strand, index, pattern) + index.search(pattern)
+
+
+def _api_job(task):
+    """Worker side of "Demo API Call": both endpoints, fetched concurrently."""
+    task.report(None, "Sending GET requests…")
+    from dna_http import fetch_many  # deferred: requests is only needed here
+
+    # The breed list is cached; the random image is revalidated every time
+    return fetch_many([DEMO_API_URL, (DEMO_API_URL2, None, 0)])
+
+
+class TextHelixScroller:
+    """Virtual scroller for a :class:`TextHelixView`.
+
+    The Text widget only ever holds the lines on screen; scrolling swaps
+    them for the lines of the new position, so widget memory and redraw
+    cost stay constant however long the strand is.
+    """
+
+    def __init__(self, parent, **text_options):
+        self.frame = ttk.Frame(parent)
+        self.text = tk.Text(self.frame, wrap=tk.NONE, height=1,
+                            state=tk.DISABLED, **text_options)
+        self.vbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL,
+                                  command=self._on_yview)
+        self.hbar = ttk.Scrollbar(self.frame, orient=tk.HORIZONTAL,
+                                  command=self.text.xview)
+        self.text.configure(xscrollcommand=self.hbar.set)
+        self.vbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.hbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.text.pack(fill=tk.BOTH, expand=True)
+
+        self.view = None
+        self.top = 0  # first line of the view shown
+        self._length = 0  # bases in the view when last drawn
+        self._line_height = tkfont.Font(font=self.text.cget("font")).metrics("linespace")
+
+        self.text.bind("<Configure>", lambda e: self._render())
+        self.text.bind("<MouseWheel>",
+                       lambda e: self._scroll_by(-3 if e.delta > 0 else 3))
+        self.text.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.text.bind("<Button-5>", lambda e: self._scroll_by(3))
+        self.text.bind("<Button-1>", lambda e: self.text.focus_set())
+        for key, rows in (("<Up>", -1), ("<Down>", 1)):
+            self.text.bind(key, lambda e, n=rows: self._scroll_by(n))
+        for key, pages in (("<Prior>", -1), ("<Next>", 1)):
+            self.text.bind(key, lambda e, n=pages: self._scroll_by(n * self.rows))
+        self.text.bind("<Home>", lambda e: self.scroll_to(0))
+        self.text.bind("<End>", lambda e: self.scroll_to(self._max_top()))
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def set_view(self, view):
+        """Show *view* (a TextHelixView, or None to clear) from the top."""
+        self.view = view
+        self.top = 0
+        self._length = len(view.strand1) if view else 0
+        self._render()
+
+    def refresh(self, ranges=None):
+        """Redraw after the strands changed in place, keeping the position.
+
+        With *ranges* (``[(start, stop), ...]`` of changed bases) the
+        widget is only touched if one of them is on screen, or if the
+        strand's length (and so the scrollbar) changed.
+        """
+        if self.view is None:
+            return
+        length = len(self.view.strand1)
+        if ranges is not None and length == self._length:
+            n = self.view.bases_per_line
+            first = self.top // self.view.LINES_PER_BLOCK * n
+            last = ((self.top + self.rows) // self.view.LINES_PER_BLOCK + 1) * n
+            if not any(start < last and stop > first for start, stop in ranges):
+                return
+        self._length = length
+        self._render()
+
+    @property
+    def rows(self):
+        """Whole lines that fit in the widget."""
+        return max(1, self.text.winfo_height() // self._line_height)
+
+    def _max_top(self):
+        return max(0, self.view.line_count - self.rows) if self.view else 0
+
+    def scroll_to(self, line):
+        self.top = min(max(0, int(line)), self._max_top())
+        self._render()
+        return "break"
+
+    def _scroll_by(self, lines):
+        return self.scroll_to(self.top + lines)
+
+    def _on_yview(self, action, amount, unit=None):
+        if action == "moveto":
+            total = self.view.line_count if self.view else 0
+            self.scroll_to(float(amount) * total)
+        else:  # "scroll", n, "units" | "pages"
+            step = self.rows if unit == "pages" else 1
+            self._scroll_by(int(amount) * step)
+
+    def _render(self):
+        total = self.view.line_count if self.view else 0
+        self.top = min(self.top, self._max_top())
+        rows = self.rows
+        x = self.text.xview()[0]
+        self.text.configure(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        if total:
+            # One extra line fills the partially visible row at the bottom
+            self.text.insert("1.0", "\n".join(self.view.lines(self.top, self.top + rows + 1)))
+        self.text.configure(state=tk.DISABLED)
+        self.text.yview_moveto(0)
+        self.text.xview_moveto(x)
+        if total:
+            self.vbar.set(self.top / total, min(1.0, (self.top + rows) / total))
+        else:
+            self.vbar.set(0.0, 1.0)
+
+
+class DNASimulationApp:
+    """Full tkinter GUI for the DNA simulation."""
+
+    def __init__(self, root: tk.Tk):
+        self.root = root
+        self.root.title("DNA Simulation – API + OpenGL")
+        self.root.geometry("960x720")
+        self.root.configure(bg="#1e1e2e")
+
+        self.primary_strand = ""
+        self.complement_strand = ""
+        self._source = "Random Generation"
+        self._file_path = None   # sequence file the current strand came from
+        self._seq_file = None    # ... and its open FastaFile / TwoBitFile
+        self._retired_files = []  # earlier ones, closed once no task reads them
+        # Bumped whenever primary_strand changes, new strand or edits; the
+        # caches below are keyed on it, their first item
+        self._generation = 0
+        self._profile = None  # (generation, window, step, starts, gc, skew)
+        self._kmers = None    # (generation, strand, k, counts)
+        self._orfs = None     # (generation, strand, min_codons, orfs, previews)
+        self._index = None    # (generation, KmerIndex), built on the first search
+        self._frozen = None   # (generation, copy of a MutableStrand), see _snapshot
+
+        # Slow work runs on background threads; see dna_tasks.TaskRunner
+        self.tasks = TaskRunner(root)
+        self.viewer = ViewerProcess()
+        self._generate_task = None
+        self._api_task = None
+        self._kmer_task = None
+        self._orf_task = None
+        self._mutation = None      # MutationEngine while the animation runs
+        self._mutation_job = None  # pending root.after() id
+        self._stats = None    # (counts, gc, at, summary) shown on the dashboard
+        self._pending = {}    # debounced redraws: name -> root.after() id
+
+        self._build_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    # ---- UI construction ---------------------------------------------------
+
+    def _build_ui(self):
+        style = ttk.Style()
+        style.theme_use("clam")
+        style.configure("TFrame", background="#1e1e2e")
+        style.configure("TLabel", background="#1e1e2e", foreground="#cdd6f4",
+                         font=("Helvetica", 11))
+        style.configure("Header.TLabel", font=("Helvetica", 16, "bold"),
+                         foreground="#89b4fa")
+        style.configure("TButton", font=("Helvetica", 11, "bold"),
+                         padding=6)
+
+        # Header
+        header = ttk.Label(self.root, text="🧬  DNA Simulation  –  OpenGL + Tkinter",
+                           style="Header.TLabel")
+        header.pack(pady=(12, 4))
+
+        # Controls frame
+        ctrl = ttk.Frame(self.root)
+        ctrl.pack(fill=tk.X, padx=16, pady=6)
+
+        ttk.Label(ctrl, text="Base pairs:").pack(side=tk.LEFT, padx=(0, 4))
+        self.bp_var = tk.IntVar(value=100)
+        bp_spin = ttk.Spinbox(ctrl, from_=10, to=MAX_BASE_PAIRS, width=8,
+                              textvariable=self.bp_var)
+        bp_spin.pack(side=tk.LEFT, padx=(0, 12))
+
+        gen_btn = ttk.Button(ctrl, text="Generate DNA",
+                             command=self._on_generate)
+        gen_btn.pack(side=tk.LEFT, padx=4)
+
+        api_btn = ttk.Button(ctrl, text="Demo API Call",
+                             command=self._on_api_demo)
+        api_btn.pack(side=tk.LEFT, padx=4)
+
+        gl_btn = ttk.Button(ctrl, text="Open 3-D Helix (OpenGL)",
+                            command=self._on_open_gl)
+        gl_btn.pack(side=tk.LEFT, padx=4)
+
+        open_btn = ttk.Button(ctrl, text="Open File…", command=self._on_open_file)
+        open_btn.pack(side=tk.LEFT, padx=4)
+
+        export_btn = ttk.Button(ctrl, text="Export FASTA…", command=self._on_export)
+        export_btn.pack(side=tk.LEFT, padx=4)
+
+        self.mutate_btn = ttk.Button(ctrl, text="Mutate", command=self._on_mutate)
+        self.mutate_btn.pack(side=tk.LEFT, padx=(12, 4))
+        self.mutations_var = tk.IntVar(value=100)
+        ttk.Spinbox(ctrl, from_=1, to=100_000, width=7,
+                    textvariable=self.mutations_var).pack(side=tk.LEFT)
+        ttk.Label(ctrl, text="per generation").pack(side=tk.LEFT, padx=(4, 0))
+
+        # Record picker, shown only for files holding several sequences
+        self.record_var = tk.StringVar()
+        self.record_box = ttk.Combobox(ctrl, textvariable=self.record_var,
+                                       state="readonly", width=16)
+        self.record_box.bind("<<ComboboxSelected>>", lambda e: self._on_pick_record())
+
+        # Notebook (tabs) for stats / text helix / api log
+        self.tabs = ttk.Notebook(self.root)
+        self.tabs.pack(fill=tk.BOTH, expand=True, padx=16, pady=(4, 12))
+
+        # -- Statistics tab --
+        self.stats_tab = ttk.Frame(self.tabs)
+        self.tabs.add(self.stats_tab, text="  Statistics  ")
+        self._build_stats_tab(self.stats_tab)
+
+        # -- k-mers tab --
+        self.kmer_tab = ttk.Frame(self.tabs)
+        self.tabs.add(self.kmer_tab, text="  k-mers  ")
+        self._build_kmer_tab(self.kmer_tab)
+
+        # -- ORFs tab --
+        self.orf_tab = ttk.Frame(self.tabs)
+        self.tabs.add(self.orf_tab, text="  ORFs  ")
+        self._build_orf_tab(self.orf_tab)
+        self.tabs.bind("<<NotebookTabChanged>>", lambda e: self._on_tab_changed())
+
+        # -- Text Helix tab --
+        helix_frame = ttk.Frame(self.tabs)
+        self.tabs.add(helix_frame, text="  Text Helix  ")
+        # Virtual: only the visible lines are ever inserted into the widget
+        self.helix_text = TextHelixScroller(helix_frame, font=("Courier", 11),
+                                            bg="#181825", fg="#cdd6f4",
+                                            insertbackground="#cdd6f4")
+        self.helix_text.pack(fill=tk.BOTH, expand=True, padx=4, pady=4)
+
+        # -- API Log tab --
+        self.api_tab = ttk.Frame(self.tabs)
+        self.tabs.add(self.api_tab, text="  API Log  ")
+        self.api_text = scrolledtext.ScrolledText(self.api_tab, wrap=tk.WORD,
+                                                   font=("Courier", 11),
+                                                   bg="#181825", fg="#a6e3a1",
+                                                   insertbackground="#a6e3a1")
+        self.api_text.pack(fill=tk.BOTH, expand=True, padx=4, pady=4)
+
+        # -- Legend at bottom --
+        legend = ttk.Frame(self.root)
+        legend.pack(fill=tk.X, padx=16, pady=(0, 8))
+        ttk.Label(legend, text="Color key:", font=("Helvetica", 10, "bold")).pack(side=tk.LEFT)
+        for base in BASES:
+            lbl = tk.Label(legend, text=f"  {base}–{COMPLEMENT[base]}  ",
+                           bg=BASE_COLORS_HEX[base], fg="black",
+                           font=("Helvetica", 10, "bold"), padx=6, pady=2,
+                           relief=tk.RIDGE)
+            lbl.pack(side=tk.LEFT, padx=3)
+
+        # -- Status bar: progress of background work --
+        status = ttk.Frame(self.root)
+        status.pack(fill=tk.X, padx=16, pady=(0, 8))
+        self.progress = ttk.Progressbar(status, length=220, maximum=1.0)
+        self.progress.pack(side=tk.LEFT)
+        self.cancel_btn = ttk.Button(status, text="Cancel", state=tk.DISABLED,
+                                     command=self._on_cancel)
+        self.cancel_btn.pack(side=tk.LEFT, padx=8)
+        self.status_var = tk.StringVar(value="Ready")
+        ttk.Label(status, textvariable=self.status_var,
+                  font=("Helvetica", 10)).pack(side=tk.LEFT)
+
+    def _build_stats_tab(self, parent):
+        """Build a visual statistics dashboard inside *parent*."""
+        # Sliding-window GC profile along the bottom of the tab
+        self.profile_canvas = tk.Canvas(parent, bg="#181825", height=180,
+                                        highlightthickness=0)
+        self.profile_canvas.pack(side=tk.BOTTOM, fill=tk.X, padx=4, pady=(0, 4))
+        self.profile_canvas.bind("<Configure>", lambda e: self._debounce(
+            "profile", self._draw_gc_profile))
+
+        self.stats_canvas = tk.Canvas(parent, bg="#181825", highlightthickness=0)
+        self.stats_canvas.pack(fill=tk.BOTH, expand=True, padx=4, pady=4)
+        # Built once; resizing only moves the items, once the drag settles
+        self._build_stats_items()
+        self.stats_canvas.bind("<Configure>", lambda e: self._debounce(
+            "stats", self._layout_stats))
+
+    def _build_kmer_tab(self, parent):
+        """k-mer spectrum and motif search."""
+        bar = ttk.Frame(parent)
+        bar.pack(fill=tk.X, padx=4, pady=4)
+        ttk.Label(bar, text="Motif (IUPAC):").pack(side=tk.LEFT, padx=(0, 4))
+        self.motif_var = tk.StringVar(value="GAATTC")
+        motif_entry = ttk.Entry(bar, textvariable=self.motif_var, width=24)
+        motif_entry.pack(side=tk.LEFT)
+        motif_entry.bind("<Return>", lambda e: self._on_find_motif())
+        ttk.Button(bar, text="Find", command=self._on_find_motif).pack(side=tk.LEFT, padx=4)
+
+        ttk.Label(bar, text="Spectrum k:").pack(side=tk.LEFT, padx=(16, 4))
+        self.kmer_k_var = tk.IntVar(value=6)
+        ttk.Spinbox(bar, from_=1, to=MAX_KMER_K, width=4, textvariable=self.kmer_k_var,
+                    command=self._refresh_kmers).pack(side=tk.LEFT)
+
+        self.motif_text = scrolledtext.ScrolledText(parent, height=9, wrap=tk.NONE,
+                                                    font=("Courier", 10),
+                                                    bg="#181825", fg="#cdd6f4",
+                                                    insertbackground="#cdd6f4")
+        self.motif_text.pack(side=tk.BOTTOM, fill=tk.X, padx=4, pady=(0, 4))
+
+        self.kmer_canvas = tk.Canvas(parent, bg="#181825", highlightthickness=0)
+        self.kmer_canvas.pack(fill=tk.BOTH, expand=True, padx=4, pady=4)
+        self.kmer_canvas.bind("<Configure>", lambda e: self._debounce(
+            "kmers", self._draw_kmers))
+
+    def _build_orf_tab(self, parent):
+        """Open reading frames: a map of the six frames and the longest ORFs."""
+        bar = ttk.Frame(parent)
+        bar.pack(fill=tk.X, padx=4, pady=4)
+        ttk.Label(bar, text="Min. length (aa):").pack(side=tk.LEFT, padx=(0, 4))
+        self.orf_min_var = tk.IntVar(value=ORF_MIN_CODONS)
+        ttk.Spinbox(bar, from_=1, to=100_000, width=7, textvariable=self.orf_min_var,
+                    command=self._refresh_orfs).pack(side=tk.LEFT)
+        ttk.Button(bar, text="Find ORFs", command=self._refresh_orfs).pack(side=tk.LEFT, padx=4)
+
+        self.orf_text = scrolledtext.ScrolledText(parent, height=12, wrap=tk.NONE,
+                                                  font=("Courier", 10),
+                                                  bg="#181825", fg="#cdd6f4",
+                                                  insertbackground="#cdd6f4")
+        self.orf_text.pack(side=tk.BOTTOM, fill=tk.X, padx=4, pady=(0, 4))
+
+        self.orf_canvas = tk.Canvas(parent, bg="#181825", highlightthickness=0)
+        self.orf_canvas.pack(fill=tk.BOTH, expand=True, padx=4, pady=4)
+        self.orf_canvas.bind("<Configure>", lambda e: self._debounce(
+            "orfs", self._draw_orfs))
+
+    # ---- Background work -------------------------------------------------
+
+    def _set_progress(self, fraction=None, message=None):
+        """Show progress (None = indeterminate) and keep Cancel in sync."""
+        if fraction is None:
+            if str(self.progress.cget("mode")) != "indeterminate":
+                self.progress.configure(mode="indeterminate")
+                self.progress.start(15)
+        else:
+            if str(self.progress.cget("mode")) != "determinate":
+                self.progress.stop()
+                self.progress.configure(mode="determinate")
+            self.progress["value"] = fraction
+        if message:
+            self.status_var.set(message)
+        self.cancel_btn.configure(state=tk.NORMAL if self.tasks.busy else tk.DISABLED)
+
+    def _finish_progress(self, message):
+        self.progress.stop()
+        self.progress.configure(mode="determinate")
+        self.progress["value"] = 0
+        self.status_var.set(message)
+        self.cancel_btn.configure(state=tk.NORMAL if self.tasks.busy else tk.DISABLED)
+        self._close_retired_files()
+
+    def _close_retired_files(self):
+        """Close the files of earlier strands once no task may still read them."""
+        if self._retired_files and not self.tasks.busy:
+            for seq_file in self._retired_files:
+                seq_file.close()
+            self._retired_files.clear()
+
+    def _on_task_error(self, exc):
+        self._finish_progress(f"✗ {exc}")
+        print(f"✗ Background task failed: {exc!r}")
+
+    def _on_cancel(self):
+        self.tasks.cancel_all()
+        self._finish_progress("Cancelled")
+
+    def _on_close(self):
+        self._stop_mutation()
+        self.tasks.shutdown()
+        self.viewer.close()
+        for seq_file in self._retired_files + [self._seq_file]:
+            if seq_file is not None:
+                seq_file.close()
+        self.root.destroy()
+
+    # ---- Button handlers ---------------------------------------------------
+
+    def _on_generate(self, then=None):
+        """Generate a new strand in the background; call *then()* once done."""
+        if self._generate_task is not None:
+            self._generate_task.cancel()
+        bp = self.bp_var.get()
+        self._generate_task = self.tasks.submit(
+            _generate_job, bp, name="generate",
+            on_progress=self._set_progress,
+            on_done=lambda result: self._on_strand_ready(result, then),
+            on_error=self._on_task_error)
+        self._set_progress(0, f"Generating {bp:,} bp…")
+
+    def _on_open_file(self):
+        path = filedialog.askopenfilename(
+            title="Open sequence file",
+            filetypes=[("Sequence files", "*.fa *.fasta *.fna *.2bit"),
+                       ("All files", "*")])
+        if path:
+            self._load_record(path, 0)
+
+    def _on_pick_record(self):
+        if self._file_path:
+            self._load_record(self._file_path, self.record_box.current())
+
+    def _load_record(self, path, index):
+        if self._generate_task is not None:
+            self._generate_task.cancel()
+        self._generate_task = self.tasks.submit(
+            _load_job, path, index, name="load",
+            on_progress=self._set_progress,
+            on_done=lambda result: self._on_file_loaded(path, index, result),
+            on_error=self._on_task_error)
+        self._set_progress(None, f"Opening {os.path.basename(path)}…")
+
+    def _on_file_loaded(self, path, index, result):
+        *result, names, seq_file = result
+        self._file_path = path
+        if len(names) > 1:
+            self.record_box.configure(values=names)
+            self.record_box.current(index)
+            self.record_box.pack(side=tk.LEFT, padx=4)
+        else:
+            self.record_box.pack_forget()
+        self._on_strand_ready(result, seq_file=seq_file)
+
+    def _on_strand_ready(self, result, then=None, seq_file=None):
+        self._generate_task = None
+        self._stop_mutation()
+        self.primary_strand, self.complement_strand, profile, self._source = result
+        self._generation += 1
+        if self._seq_file is not None:
+            self._retired_files.append(self._seq_file)
+        self._seq_file = seq_file
+        if self._source == "Random Generation":
+            self._file_path = None
+            self.record_box.pack_forget()
+        if profile is not None:
+            self._profile = (self._generation,) + profile
+
+        # Update text helix tab (built lazily as it is scrolled)
+        self.helix_text.set_view(TextHelixView(self.primary_strand,
+                                               self.complement_strand))
+
+        # Update stats
+        self._draw_stats()
+        self._draw_gc_profile()
+        self._draw_kmers()
+        self._draw_orfs()
+        self.tabs.select(self.stats_tab)
+        self._finish_progress(f"{self._source}: {len(self.primary_strand):,} bp")
+        if then is not None:
+            then()
+
+    def _on_export(self):
+        if not self.primary_strand:
+            self._finish_progress("Nothing to export – generate or open a sequence first")
+            return
+        name = getattr(self.primary_strand, "name", "random_strand")
+        path = filedialog.asksaveasfilename(
+            title="Export strand and complement", defaultextension=".fa",
+            initialfile=f"{name}.fa",
+            filetypes=[("FASTA", "*.fa *.fasta"), ("All files", "*")])
+        if not path:
+            return
+        self.tasks.submit(
+            _export_job, path, self._snapshot(), name, name="export",
+            on_progress=self._set_progress,
+            on_done=lambda p: self._finish_progress(f"Exported to {p}"),
+            on_error=self._on_task_error)
+        self._set_progress(None, "Exporting…")
+
+    def _snapshot(self):
+        """The current strand in a form worker threads may read.
+
+        A MutableStrand is edited on this thread while the mutation runs,
+        so workers get an immutable copy of it, made once per generation.
+        """
+        strand = self.primary_strand
+        if not isinstance(strand, MutableStrand):
+            return strand
+        if self._frozen is None or self._frozen[0] != self._generation:
+            self._frozen = (self._generation, strand[0:len(strand)])
+        return self._frozen[1]
+
+    def _showing(self, tab):
+        return self.tabs.select() == str(tab)
+
+    def _on_tab_changed(self):
+        self._refresh_kmers()
+        self._refresh_orfs()
+
+    def _refresh_kmers(self):
+        """Count k-mers in the background when the k-mers tab shows stale data."""
+        if not self._showing(self.kmer_tab) or not self.primary_strand or not NUMPY_AVAILABLE:
+            return
+        try:
+            k = min(max(1, int(self.kmer_k_var.get())), MAX_KMER_K)
+        except (tk.TclError, ValueError):
+            return
+        if self._kmers is not None and self._kmers[0] == self._generation \
+                and self._kmers[2] == k:
+            return
+        if self._kmer_task is not None:
+            self._kmer_task.cancel()
+        generation = self._generation
+        self._kmer_task = self.tasks.submit(
+            _kmer_job, self._snapshot(), k, name="kmers",
+            on_progress=self._set_progress,
+            on_done=lambda result: self._on_kmers_ready(generation, result),
+            on_error=self._on_task_error)
+        self._set_progress(None, f"Counting {k}-mers…")
+
+    def _on_kmers_ready(self, generation, result):
+        self._kmer_task = None
+        if generation != self._generation:
+            self._finish_progress("The sequence changed while counting k-mers")
+            return
+        self._kmers = (generation,) + result
+        self._draw_kmers()
+        self._finish_progress(f"{result[1]}-mer spectrum of {len(result[0]):,} bp")
+
+    def _refresh_orfs(self):
+        """Find ORFs in the background when the ORFs tab shows stale data."""
+        if not self._showing(self.orf_tab) or not self.primary_strand or not NUMPY_AVAILABLE:
+            return
+        try:
+            min_codons = max(1, int(self.orf_min_var.get()))
+        except (tk.TclError, ValueError):
+            return
+        if self._orfs is not None and self._orfs[0] == self._generation \
+                and self._orfs[2] == min_codons:
+            return
+        if self._orf_task is not None:
+            self._orf_task.cancel()
+        generation = self._generation
+        self._orf_task = self.tasks.submit(
+            _orf_job, self._snapshot(), min_codons, name="orfs",
+            on_progress=self._set_progress,
+            on_done=lambda result: self._on_orfs_ready(generation, result),
+            on_error=self._on_task_error)
+        self._set_progress(0, "Finding ORFs…")
+
+    def _on_orfs_ready(self, generation, result):
+        self._orf_task = None
+        if generation != self._generation:
+            self._finish_progress("The sequence changed while finding ORFs")
+            return
+        strand, min_codons, orfs, previews = result
+        self._orfs = (generation,) + result
+        self._draw_orfs()
+        t = self.orf_text
+        t.delete("1.0", tk.END)
+        t.insert(tk.END, f"{len(orfs):,} ORFs of at least {min_codons:,} amino acids "
+                         f"in {len(strand):,} bp\n")
+        if len(orfs) > len(previews):
+            t.insert(tk.END, f"Longest {len(previews):,}:\n")
+        for orf, protein in previews:
+            more = "…" if orf.codons > len(protein) else ""
+            t.insert(tk.END, f"{orf.frame:+d}  {orf.start + 1:>12,} – {orf.end:<12,} "
+                             f"{orf.codons:>7,} aa  {protein}{more}\n")
+        self._finish_progress(f"{len(orfs):,} ORFs in {len(strand):,} bp")
+
+    def _on_find_motif(self):
+        pattern = self.motif_var.get().strip().upper()
+        message = None
+        if not self.primary_strand:
+            message = "Generate or open a sequence first"
+        elif not NUMPY_AVAILABLE:
+            message = "Motif search needs NumPy (pip install numpy)"
+        elif not pattern or set(pattern) - set(IUPAC_CODES):
+            message = f"Not an IUPAC pattern: {pattern!r}"
+        if message:
+            self._finish_progress(message)
+            return
+        generation = self._generation
+        index = self._index[1] if self._index and self._index[0] == generation else None
+        self.tasks.submit(
+            _search_job, self._snapshot(), index, pattern, name="search",
+            on_progress=self._set_progress,
+            on_done=lambda result: self._on_motif_found(generation, result),
+            on_error=self._on_task_error)
+        self._set_progress(None, f"Searching for {pattern}…")
+
+    def _on_motif_found(self, generation, result):
+        strand, index, pattern, forward, reverse = result
+        if generation != self._generation:
+            self._finish_progress(f"The sequence changed while searching for {pattern}")
+            return
+        self._index = (generation, index)
+        hits = sorted([(int(p), "+") for p in forward[:MAX_MOTIF_HITS]]
+                      + [(int(p), "-") for p in reverse[:MAX_MOTIF_HITS]])[:MAX_MOTIF_HITS]
+        t = self.motif_text
+        t.delete("1.0", tk.END)
+        t.insert(tk.END, f"{pattern}: {len(forward):,} on the + strand, "
+                         f"{len(reverse):,} on the - strand (reverse complement)\n")
+        if len(forward) + len(reverse) > len(hits):
+            t.insert(tk.END, f"First {len(hits):,} by position:\n")
+        for pos, sense in hits:
+            t.insert(tk.END, f"{pos + 1:>12,}  {sense}  {strand[pos:pos + len(pattern)]}\n")
+        self._finish_progress(f"{pattern}: {len(forward) + len(reverse):,} matches")
+
+    def _on_api_demo(self):
+        if self._api_task is not None:
+            self._api_task.cancel()
+        self.api_text.delete("1.0", tk.END)
+        self.api_text.insert(tk.END, "Demonstrating API call with requests.json()\n")
+        self.api_text.insert(tk.END, "=" * 60 + "\n\n")
+        self.api_text.insert(tk.END, "Sending GET requests…\n\n")
+        self.tabs.select(self.api_tab)
+
+        # Both endpoints are requested concurrently over the pooled client
+        self._api_task = self.tasks.submit(
+            _api_job, name="api",
+            on_progress=self._set_progress,
+            on_done=self._on_api_done, on_error=self._on_task_error)
+        self._set_progress(None, "Calling the API…")
+
+    def _on_api_done(self, results):
+        self._api_task = None
+        self._finish_progress("API calls finished")
+        data, data2 = results
+
+        # --- API Call 1: Dog CEO API (breed list) ---
+        self.api_text.insert(tk.END, f"[1] Endpoint: {DEMO_API_URL}\n")
+        if data is not None:
+            self.api_text.insert(tk.END, "✓ Response received (.json() parsed):\n")
+            breeds = list(data.get("message", {}).keys())[:15]
+            self.api_text.insert(tk.END, f"   Status field : {data.get('status')}\n")
+            self.api_text.insert(tk.END, f"   Total breeds : {len(data.get('message', {}))}\n")
+            self.api_text.insert(tk.END, f"   First 15     : {', '.join(breeds)}\n")
+        else:
+            self.api_text.insert(tk.END, "✗ Request failed - check your internet connection.\n")
+
+        # --- API Call 2: Random dog image ---
+        self.api_text.insert(tk.END, f"\n[2] Endpoint: {DEMO_API_URL2}\n")
+        if data2 is not None:
+            self.api_text.insert(tk.END, "✓ Response received (.json() parsed):\n")
+            self.api_text.insert(tk.END, json.dumps(data2, indent=2) + "\n")
+        else:
+            self.api_text.insert(tk.END, "✗ Request failed - check your internet connection.\n")
+
+        self.api_text.insert(tk.END, "\n\n" + "-" * 60 + "\n")
+        self.api_text.insert(tk.END, "AVAILABLE ANIMALS IN DATABASE:\n" + "-" * 60 + "\n")
+        for common, scientific in ANIMALS.items():
+            self.api_text.insert(tk.END, f"  {common:15} → {scientific}\n")
+
+    def _on_open_gl(self):
+        if not opengl_available():
+            self._finish_progress("3-D viewer needs PyOpenGL, pygame and NumPy "
+                                  "(pip install PyOpenGL pygame numpy)")
+            return
+        if not self.primary_strand:
+            self._on_generate(then=self._launch_viewer)
+        else:
+            self._launch_viewer()
+
+    def _launch_viewer(self):
+        strand = self.primary_strand
+        if not isinstance(strand, (str, PackedStrand)):
+            # Records loaded from files are shown up to MAX_BASE_PAIRS
+            strand = strand[:MAX_BASE_PAIRS]
+        # One viewer process is reused: later clicks swap its strand in place
+        self.viewer.show(strand)
+        self.status_var.set(f"Showing {len(strand):,} bp in the 3-D viewer")
+
+    def _on_mutate(self):
+        """Start or stop mutating the strand, one generation per tick."""
+        if self._mutation is not None:
+            generation = self._mutation.generation
+            self._stop_mutation()
+            self._draw_gc_profile()
+            self._refresh_kmers()
+            self._refresh_orfs()
+            self._finish_progress(f"Stopped after {generation:,} generations: "
+                                  f"{len(self.primary_strand):,} bp")
+            return
+        strand = self.primary_strand
+        if not strand:
+            self._finish_progress("Generate or open a sequence first")
+            return
+        if not isinstance(strand, MutableStrand):
+            if len(strand) > MAX_BASE_PAIRS:
+                self._finish_progress(f"Mutation is limited to {MAX_BASE_PAIRS:,} bp")
+                return
+            # Edited in place from now on; the complement is a live view of it
+            strand = MutableStrand(strand)
+            self.primary_strand, self.complement_strand = strand, strand.complement()
+            top = self.helix_text.top
+            self.helix_text.set_view(TextHelixView(strand, self.complement_strand))
+            self.helix_text.scroll_to(top)
+            if self.viewer.alive:
+                self.viewer.show(strand)  # the edits apply to exactly this strand
+        self._mutation = MutationEngine(strand)
+        self.mutate_btn.configure(text="Stop")
+        self._mutation_job = self.root.after(MUTATION_INTERVAL_MS, self._mutate_step)
+
+    def _mutate_step(self):
+        engine = self._mutation
+        try:
+            mutations = max(1, int(self.mutations_var.get()))
+        except (tk.TclError, ValueError):
+            mutations = 1
+        edits = engine.step(mutations)
+        strand = engine.strand
+        # Counts are kept by the strand; everything else is redone on demand
+        self._generation += 1
+        self._index = self._kmers = self._orfs = self._profile = self._frozen = None
+        self._draw_stats()
+        self.helix_text.refresh(dirty_ranges(edits, len(strand)))
+        self.viewer.edit(edits)
+        self.status_var.set(f"Generation {engine.generation:,}: {len(strand):,} bp")
+        self._mutation_job = self.root.after(MUTATION_INTERVAL_MS, self._mutate_step)
+
+    def _stop_mutation(self):
+        if self._mutation_job is not None:
+            self.root.after_cancel(self._mutation_job)
+            self._mutation_job = None
+        self._mutation = None
+        self.mutate_btn.configure(text="Mutate")
+
+    def _build_stats_items(self):
+        """Create the dashboard's canvas items once; layout moves them later."""
+        c = self.stats_canvas
+        title = dict(fill="#89b4fa", font=("Helvetica", 13, "bold"))
+        self._stats_items = items = {
+            "placeholder": c.create_text(0, 0, text="Press 'Generate DNA' to see statistics",
+                                         fill="#585b70", font=("Helvetica", 14)),
+            "bar_title": c.create_text(0, 0, text="Base Composition", **title),
+            "pie_title": c.create_text(0, 0, text="GC / AT Content", **title),
+            "gc_arc": c.create_arc(0, 0, 0, 0, start=90, fill="#FFD93D", outline="black",
+                                   width=2, style=tk.PIESLICE),
+            "at_arc": c.create_arc(0, 0, 0, 0, fill="#6BCB77", outline="black",
+                                   width=2, style=tk.PIESLICE),
+            "pie_text": c.create_text(0, 0, fill="black", font=("Helvetica", 12, "bold")),
+            "summary": c.create_text(0, 0, fill="#a6adc8", font=("Courier", 10),
+                                     anchor=tk.S, justify=tk.CENTER),
+        }
+        for base in BASES:
+            items["bar", base] = c.create_rectangle(0, 0, 0, 0, fill=BASE_COLORS_HEX[base],
+                                                    outline="black", width=2)
+            items["base", base] = c.create_text(0, 0, text=base, fill="#cdd6f4",
+                                                font=("Helvetica", 12, "bold"))
+            items["count", base] = c.create_text(0, 0, fill="#cdd6f4",
+                                                 font=("Helvetica", 11, "bold"))
+
+    def _debounce(self, name, callback):
+        """Run *callback* once events stop arriving for ``RESIZE_DEBOUNCE_MS``."""
+        job = self._pending.pop(name, None)
+        if job is not None:
+            self.root.after_cancel(job)
+
+        def run():
+            del self._pending[name]
+            callback()
+
+        self._pending[name] = self.root.after(RESIZE_DEBOUNCE_MS, run)
+
+    def _draw_stats(self):
+        """Recompute the dashboard's figures (the strand changed) and lay it out."""
+        strand = self.primary_strand
+        if strand:
+            # One memoized pass feeds the chart, the pie and the summary text
+            comp = get_composition(strand)
+            self._stats = ({b: comp.counts[b] for b in BASES}, comp.gc_content,
+                           comp.at_content, get_statistics_text(comp, self._source))
+        else:
+            self._stats = None
+        self._layout_stats()
+
+    def _layout_stats(self):
+        """Move and update the dashboard's items; nothing is created or deleted."""
+        c = self.stats_canvas
+        items = self._stats_items
+        w = c.winfo_width()
+        h = c.winfo_height()
+        if w < 10 or h < 10:
+            return
+
+        # The placeholder and the charts take turns
+        showing = self._stats is not None
+        for key, item in items.items():
+            c.itemconfigure(item, state=tk.NORMAL if (key == "placeholder") != showing
+                            else tk.HIDDEN)
+        if self._stats is None:
+            c.coords(items["placeholder"], w // 2, h // 2)
+            return
+        counts, gc, at, summary = self._stats
+
+        # ---- Left side: bar chart ----
+        max_count = max(counts.values(), default=1)
+        bar_area_w = w * 0.45
+        bar_area_h = h * 0.65
+        bar_x0 = 40
+        bar_y0 = 60
+        bar_w = bar_area_w / (len(BASES) * 1.6)
+        gap = bar_w * 0.6
+
+        c.coords(items["bar_title"], bar_x0 + bar_area_w / 2, 24)
+        for idx, base in enumerate(BASES):
+            x = bar_x0 + idx * (bar_w + gap)
+            bar_h = (counts[base] / max_count) * bar_area_h if max_count else 0
+            y_top = bar_y0 + bar_area_h - bar_h
+            y_bot = bar_y0 + bar_area_h
+            c.coords(items["bar", base], x, y_top, x + bar_w, y_bot)
+            c.coords(items["base", base], x + bar_w / 2, y_bot + 16)
+            c.coords(items["count", base], x + bar_w / 2, y_top - 12)
+            c.itemconfigure(items["count", base], text=str(counts[base]))
+
+        # ---- Right side: GC / AT pie ----
+        cx_pie = w * 0.72
+        cy_pie = h * 0.42
+        r = min(w * 0.18, h * 0.30)
+        box = (cx_pie - r, cy_pie - r, cx_pie + r, cy_pie + r)
+
+        # GC slice (start from top, clockwise)
+        gc_extent = 3.6 * gc  # degrees
+        c.coords(items["gc_arc"], *box)
+        c.itemconfigure(items["gc_arc"], extent=-gc_extent)
+        c.coords(items["at_arc"], *box)
+        c.itemconfigure(items["at_arc"], start=90 - gc_extent, extent=-(360 - gc_extent))
+
+        c.coords(items["pie_title"], cx_pie, cy_pie - r - 18)
+        c.coords(items["pie_text"], cx_pie, cy_pie)
+        c.itemconfigure(items["pie_text"], text=f"GC {gc:.1f}%\nAT {at:.1f}%")
+
+        # ---- Bottom: summary text ----
+        c.coords(items["summary"], w // 2, h - 50)
+        c.itemconfigure(items["summary"], text=summary)
+
+    def _draw_gc_profile(self):
+        c = self.profile_canvas
+        c.delete("all")
+        w = c.winfo_width()
+        h = c.winfo_height()
+        if w < 10 or h < 10:
+            return
+
+        strand = self.primary_strand
+        message = None
+        if not strand:
+            message = "GC profile appears here after generating DNA"
+        elif not NUMPY_AVAILABLE:
+            message = "GC profile needs NumPy (pip install numpy)"
+        if message:
+            c.create_text(w // 2, h // 2, text=message,
+                          fill="#585b70", font=("Helvetica", 12))
+            return
+
+        # Recompute only when the strand changes, not on every resize
+        if self._profile is None or self._profile[0] != self._generation:
+            window, step = _profile_window(len(strand))
+            self._profile = (self._generation, window, step) + gc_profile(strand, window, step)
+        _, window, step, starts, gc, skew = self._profile
+        if len(starts) < 2:
+            c.create_text(w // 2, h // 2, text="Strand too short for a GC profile",
+                          fill="#585b70", font=("Helvetica", 12))
+            return
+
+        x0, x1 = 56, w - 24
+        y0, y1 = 34, h - 24
+        c.create_text(x0, 16, text=f"GC Profile  (window {window} bp, step {step} bp)",
+                      fill="#89b4fa", font=("Helvetica", 12, "bold"), anchor=tk.W)
+        c.create_text(x1, 16, text="GC %", fill="#FFD93D",
+                      font=("Helvetica", 10, "bold"), anchor=tk.E)
+        c.create_text(x1 - 50, 16, text="GC skew", fill="#89b4fa",
+                      font=("Helvetica", 10, "bold"), anchor=tk.E)
+
+        c.create_rectangle(x0, y0, x1, y1, outline="#45475a")
+        y_mid = (y0 + y1) / 2
+        c.create_line(x0, y_mid, x1, y_mid, fill="#45475a", dash=(3, 3))
+        for y, label in ((y0, "100%"), (y_mid, "50% / 0"), (y1, "0%")):
+            c.create_text(x0 - 6, y, text=label, fill="#a6adc8",
+                          font=("Helvetica", 8), anchor=tk.E)
+        c.create_text(x0, y1 + 12, text="0", fill="#a6adc8", font=("Helvetica", 8))
+        c.create_text(x1, y1 + 12, text=str(len(strand)), fill="#a6adc8",
+                      font=("Helvetica", 8))
+
+        # At most one point per pixel column
+        k = max(1, len(starts) // max(int(x1 - x0), 1))
+        centres = (starts[::k] + window / 2).tolist()
+        x_scale = (x1 - x0) / len(strand)
+        xs = [x0 + pos * x_scale for pos in centres]
+        gc_ys = [y1 - v / 100 * (y1 - y0) for v in gc[::k].tolist()]
+        skew_ys = [y_mid - v * (y1 - y0) / 2 for v in skew[::k].tolist()]
+        if len(xs) > 1:
+            c.create_line(*[v for xy in zip(xs, skew_ys) for v in xy],
+                          fill="#89b4fa", width=1)
+            c.create_line(*[v for xy in zip(xs, gc_ys) for v in xy],
+                          fill="#FFD93D", width=2)
+
+    def _draw_kmers(self):
+        c = self.kmer_canvas
+        c.delete("all")
+        w = c.winfo_width()
+        h = c.winfo_height()
+        if w < 10 or h < 10:
+            return
+
+        message = None
+        if not self.primary_strand:
+            message = "k-mer spectrum appears here after generating DNA"
+        elif not NUMPY_AVAILABLE:
+            message = "k-mer spectrum needs NumPy (pip install numpy)"
+        elif self._kmers is None or self._kmers[0] != self._generation:
+            message = "Counting k-mers…"
+        if message:
+            c.create_text(w // 2, h // 2, text=message, fill="#585b70",
+                          font=("Helvetica", 12))
+            return
+        _, strand, k, counts = self._kmers
+        spectrum = kmer_spectrum(counts)
+        seen = int(len(counts) - spectrum[0])
+
+        # ---- Left: most frequent k-mers ----
+        top = StrandStats(k=k, kmer_counts=counts).top_kmers(15)
+        x0, y0 = 90, 50
+        bar_w = w * 0.38 - x0
+        row = max(12, (h - y0 - 20) / max(len(top), 1))
+        c.create_text(20, 20, text=f"Top {k}-mers", fill="#89b4fa",
+                      font=("Helvetica", 12, "bold"), anchor=tk.W)
+        top_count = top[0][1] if top else 1
+        for i, (kmer, n) in enumerate(top):
+            y = y0 + i * row
+            c.create_text(x0 - 6, y + row / 2, text=kmer, fill="#cdd6f4",
+                          font=("Courier", 9), anchor=tk.E)
+            c.create_rectangle(x0, y + 2, x0 + bar_w * n / top_count, y + row - 2,
+                               fill="#cba6f7", outline="")
+            c.create_text(x0 + 4, y + row / 2, text=f"{n:,}", fill="#181825",
+                          font=("Helvetica", 8), anchor=tk.W)
+
+        # ---- Right: spectrum (distinct k-mers per occurrence count) ----
+        sx0, sx1 = w * 0.45, w - 24
+        sy0, sy1 = 50, h - 30
+        c.create_text(sx0, 20, text=f"{k}-mer Spectrum  ({seen:,} of {len(counts):,} "
+                                    f"possible k-mers seen)",
+                      fill="#89b4fa", font=("Helvetica", 12, "bold"), anchor=tk.W)
+        c.create_rectangle(sx0, sy0, sx1, sy1, outline="#45475a")
+        nonzero = np.flatnonzero(spectrum[1:]) + 1
+        if not len(nonzero):
+            return
+        lo, hi = int(nonzero[0]), int(nonzero[-1])
+        # At most one bar per 3 pixels: occurrence counts are binned
+        bins = max(1, min(hi - lo + 1, int((sx1 - sx0) // 3)))
+        edges = np.linspace(lo, hi + 1, bins + 1).astype(int)
+        heights = np.add.reduceat(spectrum[:hi + 1], edges[:-1])
+        peak = max(int(heights.max()), 1)
+        bar = (sx1 - sx0) / bins
+        for i, n in enumerate(heights.tolist()):
+            if n:
+                top_y = sy1 - n / peak * (sy1 - sy0)
+                c.create_rectangle(sx0 + i * bar, top_y, sx0 + (i + 1) * bar, sy1,
+                                   fill="#89b4fa", outline="")
+        c.create_text(sx0, sy1 + 12, text=f"{lo:,}", fill="#a6adc8", font=("Helvetica", 8))
+        c.create_text(sx1, sy1 + 12, text=f"{hi:,}", fill="#a6adc8", font=("Helvetica", 8))
+        c.create_text((sx0 + sx1) / 2, sy1 + 12, text="occurrences per k-mer",
+                      fill="#a6adc8", font=("Helvetica", 8))
+        c.create_text(sx0 + 4, sy0 + 4, text=f"{peak:,} k-mers", fill="#a6adc8",
+                      font=("Helvetica", 8), anchor=tk.NW)
+
+    def _draw_orfs(self):
+        """Six tracks, +1..+3 and -1..-3, with every ORF drawn to scale."""
+        c = self.orf_canvas
+        c.delete("all")
+        w = c.winfo_width()
+        h = c.winfo_height()
+        if w < 10 or h < 10:
+            return
+
+        message = None
+        if not self.primary_strand:
+            message = "Open reading frames appear here after generating DNA"
+        elif not NUMPY_AVAILABLE:
+            message = "ORF search needs NumPy (pip install numpy)"
+        elif self._orfs is None or self._orfs[0] != self._generation:
+            message = "Finding ORFs…"
+        if message:
+            c.create_text(w // 2, h // 2, text=message, fill="#585b70",
+                          font=("Helvetica", 12))
+            return
+        _, strand, min_codons, orfs, _ = self._orfs
+        x0, x1 = 50, w - 20
+        y0, y1 = 40, h - 30
+        track = (y1 - y0) / len(FRAMES)
+        scale = (x1 - x0) / max(len(strand), 1)
+        c.create_text(20, 20, text=f"ORF Map  ({len(orfs):,} ORFs ≥ {min_codons:,} aa)",
+                      fill="#89b4fa", font=("Helvetica", 12, "bold"), anchor=tk.W)
+
+        # ORFs closer than a pixel are merged, so a track holds at most w items
+        spans = {frame: [] for frame in FRAMES}
+        for orf in orfs:
+            left, right = x0 + orf.start * scale, x0 + orf.end * scale
+            merged = spans[orf.frame]
+            if merged and left <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], right)
+            else:
+                merged.append([left, right])
+        for i, frame in enumerate(FRAMES):
+            top = y0 + i * track
+            mid = top + track / 2
+            c.create_text(x0 - 10, mid, text=f"{frame:+d}", fill="#cdd6f4",
+                          font=("Courier", 10), anchor=tk.E)
+            c.create_line(x0, mid, x1, mid, fill="#45475a")
+            colour = "#a6e3a1" if frame > 0 else "#fab387"
+            for left, right in spans[frame]:
+                c.create_rectangle(left, top + track * 0.2, max(right, left + 1),
+                                   top + track * 0.8, fill=colour, outline="")
+        c.create_text(x0, y1 + 12, text="1", fill="#a6adc8", font=("Helvetica", 8))
+        c.create_text(x1, y1 + 12, text=f"{len(strand):,}", fill="#a6adc8",
+                      font=("Helvetica", 8))
+        c.create_text((x0 + x1) / 2, y1 + 12, text="position (bp)",
+                      fill="#a6adc8", font=("Helvetica", 8))
+
+
+def _profile_window(length):
+    """Pick a (window, step) for the GC profile plot of a strand of *length* bp."""
+    window = min(max(10, length // 50), length)
+    return window, max(1, window // 5)
+
+
+def main():
+    """Launch the tkinter GUI."""
+    root = tk.Tk()
+    DNASimulationApp(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
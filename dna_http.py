@@ -0,0 +1,268 @@
+"""HTTP client for the API calls: pooled connections, retries, batch fetches
+and a persistent response cache."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Where the shared client keeps its response cache, and its defaults
+CACHE_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "dna_simulation", "http_cache.sqlite3")
+DEFAULT_TTL = 3600               # seconds a cached response is served as fresh
+DEFAULT_CACHE_BYTES = 64 << 20   # total body size kept on disk
+
+
+class CachedResponse:
+    """One cache entry: the raw body plus the validators needed to revalidate it."""
+
+    __slots__ = ("body", "etag", "last_modified", "expires_at")
+
+    def __init__(self, body, etag, last_modified, expires_at):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self):
+        return time.time() < self.expires_at
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class ResponseCache:
+    """SQLite-backed response cache with per-entry TTL and LRU size bound.
+
+    Entries are keyed by the full request URL (query string included).
+    Once the stored bodies exceed *max_bytes*, the least recently used
+    entries are evicted.  Safe to share between threads.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=DEFAULT_CACHE_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, body BLOB, etag TEXT, last_modified TEXT,"
+            " expires_at REAL, last_used REAL, size INTEGER)")
+        self._db.commit()
+
+    def get(self, key):
+        """Return the CachedResponse for *key* (fresh or stale), or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified, expires_at FROM responses"
+                " WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?",
+                             (time.time(), key))
+            self._db.commit()
+        return CachedResponse(*row)
+
+    def put(self, key, body, ttl, etag=None, last_modified=None):
+        """Store *body* under *key* for *ttl* seconds, then enforce the size bound."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, body, etag, last_modified, now + ttl, now, len(body)))
+            self._evict()
+            self._db.commit()
+
+    def refresh(self, key, ttl):
+        """Mark *key* as fresh for another *ttl* seconds (after a 304)."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE responses SET expires_at = ?, last_used = ? WHERE key = ?",
+                (now + ttl, now, key))
+            self._db.commit()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in self._db.execute(
+                "SELECT key, size FROM responses ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class DNAApiClient:
+    """Fetch JSON from HTTP APIs over a persistent, pooled ``requests.Session``.
+
+    Failed connections, timeouts and the statuses in ``RETRY_STATUSES`` are
+    retried up to *retries* times with exponential backoff (*backoff*,
+    2 x *backoff*, 4 x *backoff*, ... seconds), honouring ``Retry-After``.
+    :meth:`fetch_many` runs up to *max_workers* requests at once.
+
+    With a *cache* (a ResponseCache), fresh entries are served without any
+    request, stale ones are revalidated with ``If-None-Match`` /
+    ``If-Modified-Since``, and a failed request falls back to the stale
+    copy.  ``offline=True`` never touches the network and serves whatever
+    the cache holds.
+    """
+
+    def __init__(self, max_workers=8, retries=3, backoff=0.5, timeout=10,
+                 session=None, cache=None, ttl=DEFAULT_TTL, offline=False):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache = cache
+        self.ttl = ttl
+        self.offline = offline
+        self.session = session or requests.Session()
+        retry = Retry(total=retries, connect=retries, read=retries,
+                      status=retries, backoff_factor=backoff,
+                      status_forcelist=RETRY_STATUSES,
+                      allowed_methods=frozenset({"GET", "HEAD"}),
+                      respect_retry_after_header=True, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers,
+                              max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def get(self, url, params=None, headers=None):
+        """GET *url* (with retries) and return the ``requests.Response``."""
+        return self.session.get(url, params=params, headers=headers,
+                                timeout=self.timeout)
+
+    def fetch(self, url, params=None, ttl=None):
+        """Return the parsed JSON body of *url*, or None if the request failed.
+
+        *ttl* overrides the client's cache lifetime for this response; 0
+        stores it but always revalidates.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        key = requests.Request("GET", url, params=params).prepare().url
+        cached = self._cache_call("get", key)
+        if cached is not None and (cached.fresh or self.offline):
+            print(f"✓ Served from cache: {key}")
+            return cached.json()
+        if self.offline:
+            print(f"✗ Offline and not cached: {key}")
+            return None
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        try:
+            print(f"Fetching data from API: {url}")
+            response = self.get(url, params=params, headers=headers)
+
+            if response.status_code == 304 and cached is not None:
+                self._cache_call("refresh", key, ttl)
+                print("✓ Not modified - using cached response")
+                return cached.json()
+            elif response.status_code == 200:
+                data = response.json()
+                self._cache_call("put", key, response.content, ttl,
+                                 response.headers.get("ETag"),
+                                 response.headers.get("Last-Modified"))
+                print("✓ API request successful!")
+                return data
+            else:
+                print(f"✗ API request failed with status code: {response.status_code}")
+                return self._stale(cached)
+
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"✗ Error fetching from API: {e}")
+            return self._stale(cached)
+
+    def _cache_call(self, method, *args):
+        """Call a ResponseCache method; a database error (e.g. another process
+        holding the lock) only costs the cache, never the request."""
+        if self.cache is None:
+            return None
+        try:
+            return getattr(self.cache, method)(*args)
+        except sqlite3.Error as e:
+            print(f"Warning: response cache {method} failed ({e})")
+            return None
+
+    @staticmethod
+    def _stale(cached):
+        if cached is None:
+            return None
+        print("  Falling back to the stale cached response")
+        return cached.json()
+
+    def fetch_many(self, urls, params=None):
+        """Fetch many URLs concurrently; results come back in input order.
+
+        Each item is a URL or a ``(url, params)`` / ``(url, params, ttl)``
+        tuple; *params* applies to bare URLs.  Failed requests give None in
+        their slot.
+        """
+        jobs = [item if isinstance(item, tuple) else (item, params) for item in urls]
+        if len(jobs) <= 1 or self.max_workers <= 1:
+            return [self.fetch(*job) for job in jobs]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as pool:
+            return list(pool.map(lambda job: self.fetch(*job), jobs))
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """The shared client behind ``fetch_dna_from_api``, created on first use."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            try:
+                cache = ResponseCache()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Warning: response cache disabled ({e})")
+                cache = None
+            _default_client = DNAApiClient(cache=cache)
+        return _default_client
+
+
+def fetch_many(urls, params=None):
+    """Fetch many URLs concurrently with the shared client (see DNAApiClient)."""
+    return get_default_client().fetch_many(urls, params)
@@ -0,0 +1,406 @@
+"""Sequence file import and export: FASTA and UCSC .2bit.
+
+Files are memory-mapped and their records exposed lazily: opening a file
+reads only its headers (or, for .2bit, its index), and bases are decoded
+from the mapping when a record is sliced.  Records behave like read-only
+strands (``len``, slicing to ``str``, ``complement()``), so the statistics,
+text helix and viewer code accept them directly.
+"""
+
+import bisect
+import mmap
+import os
+import struct
+import sys
+
+from dna_sequence import DEFAULT_CHUNK_SIZE, PackedStrand, get_complement_strand
+
+# Recognised file extensions (anything else is sniffed from its first bytes)
+FASTA_EXTENSIONS = (".fa", ".fasta", ".fna", ".ffn", ".faa", ".frn", ".seq")
+TWOBIT_EXTENSIONS = (".2bit",)
+
+# Bases per line written by write_fasta
+FASTA_LINE_WIDTH = 60
+
+# Bytes scanned at a time when measuring a FASTA record
+_SCAN_BLOCK = 1 << 24
+
+TWOBIT_SIGNATURE = 0x1A412743
+
+# .2bit packs T=0, C=1, A=2, G=3 (first base in the high bits, as we do);
+# translating each byte through this table gives our A=0, C=1, G=2, T=3
+_TWOBIT_CODE = (3, 1, 0, 2)
+_TWOBIT_TABLE = bytes(
+    sum(_TWOBIT_CODE[(b >> shift) & 3] << shift for shift in (6, 4, 2, 0))
+    for b in range(256)
+)
+
+
+class SequenceRecord:
+    """A named, lazily read sequence.
+
+    Subclasses implement ``__len__`` and ``_read(start, stop)``, which
+    returns bases ``start:stop`` as an upper-case ``str``.
+    """
+
+    def __init__(self, name, description=""):
+        self.name = name
+        self.description = description
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def _read(self, start, stop):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r}, length={len(self)})"
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return self._read(start, stop)[::step] if stop > start else ""
+            return self._read(start, stop) if stop > start else ""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("record index out of range")
+        return self._read(index, index + 1)
+
+    def __str__(self):
+        """The whole sequence; prefer slicing or :meth:`iter_chunks` for long records."""
+        return self[0:len(self)]
+
+    def iter_chunks(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Yield the sequence as ``str`` pieces of at most *chunk_size* bases."""
+        for start in range(0, len(self), chunk_size):
+            yield self._read(start, min(start + chunk_size, len(self)))
+
+    def complement(self):
+        """A lazy view of the complementary strand."""
+        return ComplementRecord(self)
+
+    def packed(self):
+        """Read the whole record into a PackedStrand (A/C/G/T only)."""
+        return PackedStrand.from_str(str(self))
+
+
+class ComplementRecord(SequenceRecord):
+    """The complement of another record, computed slice by slice."""
+
+    def __init__(self, record):
+        super().__init__(record.name + "_complement", record.description)
+        self.record = record
+
+    def __len__(self):
+        return len(self.record)
+
+    def _read(self, start, stop):
+        return get_complement_strand(self.record._read(start, stop))
+
+    def complement(self):
+        return self.record
+
+
+class _MappedFile:
+    """An open, memory-mapped file shared by the records read from it."""
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self._file = open(self.path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map an empty file
+        self.mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def __len__(self):
+        return len(self.mm)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if isinstance(self.mm, mmap.mmap):
+            self.mm.close()
+        self._file.close()
+
+
+# ---- FASTA ------------------------------------------------------------------
+
+class FastaRecord(SequenceRecord):
+    """One FASTA record, addressed through its file's memory map.
+
+    The first call to ``len`` measures the record in one pass.  With the
+    usual fixed line width a base's file offset is then simple arithmetic;
+    records with ragged lines are read into memory once instead.
+    """
+
+    def __init__(self, source, index, name, description, start, stop):
+        super().__init__(name, description)
+        self._source = source
+        self._index = index
+        self._start = start   # first byte of the sequence lines
+        self._stop = stop     # end of the record in the file
+        self._layout = None   # (length, bases per line, bytes per line)
+        self._loaded = None   # sequence bytes, for records with ragged lines
+
+    def __reduce__(self):
+        # The memory map cannot be pickled; reopen the file by path instead
+        return _open_fasta_record, (self._source.path, self._index)
+
+    def __len__(self):
+        return self._measure()[0]
+
+    def _measure(self):
+        if self._layout is None:
+            self._layout = self._scan()
+        return self._layout
+
+    def _scan(self):
+        mm = self._source.mm
+        start, stop = self._start, self._stop
+        while stop > start and mm[stop - 1:stop] in (b"\n", b"\r", b" ", b"\t"):
+            stop -= 1
+        if stop <= start:
+            return 0, 0, 1
+        eol = mm.find(b"\n", start, stop)
+        if eol < 0:  # a single line without a newline
+            return stop - start, stop - start, stop - start + 1
+        line_bytes = eol + 1 - start
+        line_bases = line_bytes - 1 - (mm[eol - 1:eol] == b"\r")
+
+        # Check that every full line has the same width, a block at a time
+        full_lines = (stop - start) // line_bytes
+        block = max(1, _SCAN_BLOCK // line_bytes) * line_bytes
+        end = start + full_lines * line_bytes
+        for pos in range(start, end, block):
+            chunk = mm[pos:min(pos + block, end)]
+            if (chunk.count(b"\n") != len(chunk) // line_bytes
+                    or chunk[line_bytes - 1::line_bytes].strip(b"\n")):
+                return self._load(start, stop)
+        tail = mm[end:stop]
+        if b"\n" in tail or len(tail) > line_bases:
+            return self._load(start, stop)
+        return full_lines * line_bases + len(tail), line_bases, line_bytes
+
+    def _load(self, start, stop):
+        # stderr, so batch output on stdout stays clean
+        print(f"Note: FASTA record {self.name!r} has ragged lines; reading it into memory",
+              file=sys.stderr)
+        mm = self._source.mm
+        parts = [mm[pos:min(pos + _SCAN_BLOCK, stop)].translate(None, b"\r\n \t")
+                 for pos in range(start, stop, _SCAN_BLOCK)]
+        self._loaded = b"".join(parts).upper()
+        return len(self._loaded), 0, 1
+
+    def _read(self, start, stop):
+        _, line_bases, line_bytes = self._measure()
+        if self._loaded is not None:
+            return self._loaded[start:stop].decode("ascii", errors="replace")
+        first = self._start + (start // line_bases) * line_bytes + start % line_bases
+        last = self._start + ((stop - 1) // line_bases) * line_bytes + (stop - 1) % line_bases
+        raw = self._source.mm[first:last + 1].translate(None, b"\r\n")
+        return raw.upper().decode("ascii", errors="replace")
+
+
+class FastaFile(_MappedFile):
+    """A memory-mapped FASTA file; iterate it (or use :attr:`records`) for records.
+
+    Records are found by jumping from one ``>`` header to the next, so
+    only the headers are ever parsed up front.
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._records = None
+
+    def __iter__(self):
+        if self._records is not None:
+            yield from self._records
+            return
+        mm = self.mm
+        found = []
+        pos = mm.find(b">") if len(mm) else -1
+        while pos >= 0:
+            header_end = mm.find(b"\n", pos)
+            if header_end < 0:
+                header_end = len(mm)
+            header = mm[pos + 1:header_end].decode("ascii", errors="replace").strip()
+            name, _, description = header.partition(" ")
+            nxt = mm.find(b"\n>", header_end)
+            stop = len(mm) if nxt < 0 else nxt + 1
+            record = FastaRecord(self, len(found), name, description.strip(),
+                                 min(header_end + 1, stop), stop)
+            found.append(record)
+            yield record
+            pos = nxt + 1 if nxt >= 0 else -1
+        self._records = found
+
+    @property
+    def records(self):
+        """All records, in file order."""
+        if self._records is None:
+            for _ in self:
+                pass
+        return self._records
+
+
+def _open_fasta_record(path, index):
+    return FastaFile(path).records[index]
+
+
+# ---- UCSC .2bit -------------------------------------------------------------
+
+class TwoBitRecord(SequenceRecord):
+    """One sequence of a .2bit file.
+
+    Bases are stored 2 bits each, so a slice is one byte translation into
+    PackedStrand form; N blocks are overlaid afterwards.  Soft-masking
+    (lower case) is not applied.
+    """
+
+    def __init__(self, source, index, name, offset):
+        super().__init__(name)
+        self._source = source
+        self._index = index
+        self._offset = offset
+        self._header = None   # (length, n_starts, n_ends, dna_offset)
+
+    def __reduce__(self):
+        return _open_twobit_record, (self._source.path, self._index)
+
+    def _read_header(self):
+        if self._header is None:
+            src = self._source
+            pos = self._offset
+            length, n_count = src.unpack_from("II", pos)
+            pos += 8
+            n_starts = src.unpack_from(f"{n_count}I", pos)
+            n_sizes = src.unpack_from(f"{n_count}I", pos + 4 * n_count)
+            pos += 8 * n_count
+            (mask_count,) = src.unpack_from("I", pos)
+            pos += 4 + 8 * mask_count + 4  # mask blocks, then a reserved word
+            n_ends = [s + n for s, n in zip(n_starts, n_sizes)]
+            self._header = (length, list(n_starts), n_ends, pos)
+        return self._header
+
+    def __len__(self):
+        return self._read_header()[0]
+
+    @property
+    def has_unknown(self):
+        """True if the record contains N blocks."""
+        return bool(self._read_header()[1])
+
+    def _packed_slice(self, start, stop):
+        dna = self._read_header()[3]
+        first, last = start // 4, (stop + 3) // 4
+        data = self._source.mm[dna + first:dna + last].translate(_TWOBIT_TABLE)
+        return PackedStrand(data, (last - first) * 4)[start - 4 * first:stop - 4 * first]
+
+    def _read(self, start, stop):
+        _, n_starts, n_ends, _ = self._read_header()
+        bases = str(self._packed_slice(start, stop))
+        # N blocks are sorted; overlay the ones overlapping start:stop
+        i = bisect.bisect_right(n_ends, start)
+        if i == len(n_starts) or n_starts[i] >= stop:
+            return bases
+        out = bytearray(bases, "ascii")
+        while i < len(n_starts) and n_starts[i] < stop:
+            lo, hi = max(n_starts[i], start) - start, min(n_ends[i], stop) - start
+            out[lo:hi] = b"N" * (hi - lo)
+            i += 1
+        return out.decode("ascii")
+
+    def packed(self):
+        if not self.has_unknown:
+            return self._packed_slice(0, len(self))
+        return super().packed()
+
+
+class TwoBitFile(_MappedFile):
+    """A memory-mapped UCSC .2bit file (version 0 or 1, either byte order)."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        if len(self.mm) < 16:
+            raise ValueError(f"{self.path}: too short for a .2bit file")
+        for order in "<>":
+            if struct.unpack_from(order + "I", self.mm, 0)[0] == TWOBIT_SIGNATURE:
+                self._order = order
+                break
+        else:
+            raise ValueError(f"{self.path}: not a .2bit file (bad signature)")
+        version, count = self.unpack_from("II", 4)
+        if version not in (0, 1):
+            raise ValueError(f"{self.path}: unsupported .2bit version {version}")
+
+        offset_format = "Q" if version == 1 else "I"
+        offset_size = struct.calcsize(offset_format)
+        self.records = []
+        pos = 16
+        for index in range(count):
+            name_len = self.mm[pos]
+            name = self.mm[pos + 1:pos + 1 + name_len].decode("ascii", errors="replace")
+            pos += 1 + name_len
+            (offset,) = self.unpack_from(offset_format, pos)
+            pos += offset_size
+            self.records.append(TwoBitRecord(self, index, name, offset))
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def unpack_from(self, fmt, offset):
+        return struct.unpack_from(self._order + fmt, self.mm, offset)
+
+
+def _open_twobit_record(path, index):
+    return TwoBitFile(path).records[index]
+
+
+# ---- Opening and writing files ----------------------------------------------
+
+def open_sequence_file(path):
+    """Open a FASTA or .2bit file, chosen by extension or by its first bytes."""
+    ext = os.path.splitext(os.fspath(path))[1].lower()
+    if ext in TWOBIT_EXTENSIONS:
+        return TwoBitFile(path)
+    if ext in FASTA_EXTENSIONS:
+        return FastaFile(path)
+    with open(path, "rb") as f:
+        head = f.read(4)
+    if len(head) == 4 and TWOBIT_SIGNATURE in (struct.unpack("<I", head)[0],
+                                              struct.unpack(">I", head)[0]):
+        return TwoBitFile(path)
+    return FastaFile(path)
+
+
+def write_fasta(path, records, line_width=FASTA_LINE_WIDTH,
+                chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write ``(name, strand)`` pairs to *path* as FASTA, streaming each strand.
+
+    *strand* may be a str, PackedStrand or SequenceRecord; it is converted
+    *chunk_size* bases at a time, so nothing close to its full text is
+    ever held in memory.
+    """
+    chunk_size = max(line_width, chunk_size // line_width * line_width)
+    with open(path, "w", encoding="ascii", newline="\n") as out:
+        for name, strand in records:
+            out.write(f">{name}\n")
+            for start in range(0, len(strand), chunk_size):
+                chunk = str(strand[start:start + chunk_size])
+                out.write("\n".join(chunk[i:i + line_width]
+                                    for i in range(0, len(chunk), line_width)))
+                out.write("\n")
+
+
+def export_strand(path, strand, name="strand", complement=True,
+                  line_width=FASTA_LINE_WIDTH):
+    """Write *strand* (and, by default, its complement) to a FASTA file."""
+    records = [(name, strand)]
+    if complement:
+        records.append((f"{name}_complement", get_complement_strand(strand)))
+    write_fasta(path, records, line_width)
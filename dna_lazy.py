@@ -0,0 +1,33 @@
+"""Deferred imports, so the core modules load in milliseconds.
+
+Heavy optional dependencies (NumPy, requests, tkinter, PyOpenGL, pygame)
+are only imported when a feature that needs them is first used.
+"""
+
+import importlib
+import importlib.util
+
+
+def module_available(name):
+    """True if *name* can be imported, found without actually importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access."""
+
+    def __init__(self, name):
+        self.__name = name
+        self.__module = None
+
+    def __getattr__(self, attr):
+        if self.__module is None:
+            self.__module = importlib.import_module(self.__name)
+        return getattr(self.__module, attr)
+
+    def __repr__(self):
+        state = "loaded" if self.__module is not None else "not loaded"
+        return f"<lazy module {self.__name!r} ({state})>"
@@ -0,0 +1,269 @@
+"""Point mutations, insertions and deletions applied to a strand in place.
+
+A :class:`MutableStrand` is a rope of small byte blocks, so an edit
+touches one block instead of copying the whole strand.  The complement
+(a live view) and the base counts are kept up to date as edits are
+applied.  Every edit is journalled as ``(start, removed, inserted)``.
+Views replay the journal, or turn it into :func:`dirty_ranges`, to redo
+only what changed.
+"""
+
+import random
+from bisect import bisect_right
+
+from dna_sequence import BASES
+from dna_stats import COMPOSITION_BASES
+
+# Bases per block of a MutableStrand; a block is split at twice this size
+BLOCK_SIZE = 4096
+
+_COMPLEMENT_BYTES = bytes.maketrans(b"ACGT", b"TGCA")
+
+
+def dirty_ranges(edits, length):
+    """Merge journalled *edits* into ``[(start, stop), ...]`` of changed bases.
+
+    Ranges are in the coordinates after all edits (*length* bases).  From
+    the first insertion or deletion on, every base may have moved, so that
+    position through the end counts as changed.
+    """
+    shift = None
+    spans = []
+    for start, removed, inserted in edits:
+        if removed != len(inserted):
+            shift = start if shift is None else min(shift, start)
+        elif removed:
+            spans.append((start, start + removed))
+    if shift is not None:
+        spans = [(a, min(b, shift)) for a, b in spans if a < shift]
+        spans.append((shift, length))
+    merged = []
+    for a, b in sorted(spans):
+        if merged and a <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], b)
+        elif a < b or not merged:
+            merged.append([a, b])
+    return [(a, b) for a, b in merged if a < b]
+
+
+class MutableStrand:
+    """A strand that can be edited in place, with its complement and counts.
+
+    Reads like a ``str`` of upper-case bases for ``len``, indexing and
+    slicing (slices are plain ``str``), ``str()``, ``bytes()`` and
+    ``iter_chunks``.
+    It is unhashable, so memoized statistics are never served stale.
+    """
+
+    __hash__ = None
+
+    def __init__(self, strand=""):
+        text = str(strand[0:len(strand)]).upper().encode("ascii")
+        self._blocks = [bytearray(text[i:i + BLOCK_SIZE])
+                        for i in range(0, len(text), BLOCK_SIZE)] or [bytearray()]
+        self._complements = [block.translate(_COMPLEMENT_BYTES) for block in self._blocks]
+        self._ends = []  # cumulative block lengths
+        self._reindex(0)
+        self._counts = dict.fromkeys(COMPOSITION_BASES, 0)
+        for base in COMPOSITION_BASES:
+            self._counts[base] = text.count(base.encode())
+        self._edits = []
+
+    def _reindex(self, first):
+        del self._ends[first:]
+        total = self._ends[-1] if self._ends else 0
+        for block in self._blocks[first:]:
+            total += len(block)
+            self._ends.append(total)
+
+    def __len__(self):
+        return self._ends[-1]
+
+    def __str__(self):
+        return bytes(self).decode("ascii")
+
+    def __bytes__(self):
+        return b"".join(self._blocks)
+
+    def __repr__(self):
+        return f"MutableStrand(length={len(self)})"
+
+    def _locate(self, pos):
+        """``(block, offset)`` of base *pos* (the end maps into the last block)."""
+        block = min(bisect_right(self._ends, pos), len(self._blocks) - 1)
+        return block, pos - (self._ends[block - 1] if block else 0)
+
+    def _read(self, blocks, start, stop):
+        if start >= stop:
+            return ""
+        first, offset = self._locate(start)
+        out = []
+        remaining = stop - start
+        for block in blocks[first:]:
+            piece = block[offset:offset + remaining]
+            out.append(piece)
+            remaining -= len(piece)
+            offset = 0
+            if not remaining:
+                break
+        return b"".join(out).decode("ascii")
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            text = self._read(self._blocks, start, max(start, stop))
+            return text if step == 1 else str(self)[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("strand index out of range")
+        return self._read(self._blocks, index, index + 1)
+
+    def iter_chunks(self, chunk_size=1 << 22):
+        for start in range(0, len(self), chunk_size):
+            yield self[start:start + chunk_size]
+
+    def base_counts(self):
+        """``{base: count}`` for A/T/G/C/N, maintained as edits are applied."""
+        return dict(self._counts)
+
+    def complement(self):
+        """The complementary strand, a live view that follows later edits."""
+        return ComplementView(self)
+
+    # ---- Editing ----------------------------------------------------------
+
+    def replace(self, start, removed, inserted=""):
+        """Replace *removed* bases from *start* with *inserted*; the one edit primitive."""
+        length = len(self)
+        if not 0 <= start <= length or removed < 0 or start + removed > length:
+            raise IndexError(f"edit {start}:{start + removed} outside a strand of {length} bp")
+        inserted = inserted.upper()
+        data = inserted.encode("ascii")
+        for base in self._read(self._blocks, start, start + removed):
+            if base in self._counts:
+                self._counts[base] -= 1
+        for base in inserted:
+            if base in self._counts:
+                self._counts[base] += 1
+
+        block, offset = self._locate(start)
+        if removed == len(data) and offset + removed <= len(self._blocks[block]):
+            # Substitution inside one block: nothing moves
+            self._blocks[block][offset:offset + removed] = data
+            self._complements[block][offset:offset + removed] = data.translate(_COMPLEMENT_BYTES)
+        else:
+            self._splice(block, offset, removed, data)
+        self._edits.append((start, removed, inserted))
+
+    def _splice(self, first, offset, removed, data):
+        blocks, complements = self._blocks, self._complements
+        block, cut_at = first, offset
+        while removed:
+            cut = min(removed, len(blocks[block]) - cut_at)
+            del blocks[block][cut_at:cut_at + cut]
+            del complements[block][cut_at:cut_at + cut]
+            removed -= cut
+            block, cut_at = block + 1, 0
+        blocks[first][offset:offset] = data
+        complements[first][offset:offset] = data.translate(_COMPLEMENT_BYTES)
+
+        # Drop the blocks that were emptied and split the ones grown too large
+        i, end = first, max(block, first + 1)
+        while i < end:
+            if not blocks[i] and len(blocks) > 1:
+                del blocks[i], complements[i]
+                end -= 1
+            elif len(blocks[i]) > 2 * BLOCK_SIZE:
+                for parts in (blocks, complements):
+                    parts[i:i + 1] = [parts[i][:BLOCK_SIZE], parts[i][BLOCK_SIZE:]]
+                end += 1
+                i += 1
+            else:
+                i += 1
+        self._reindex(first)
+
+    def substitute(self, pos, base):
+        self.replace(pos, 1, base)
+
+    def insert(self, pos, bases):
+        self.replace(pos, 0, bases)
+
+    def delete(self, start, count=1):
+        self.replace(start, count)
+
+    def apply(self, edits):
+        """Replay journalled ``(start, removed, inserted)`` edits, in order."""
+        for start, removed, inserted in edits:
+            self.replace(start, removed, inserted)
+
+    def take_edits(self):
+        """Return the edits since the last call and clear the journal."""
+        edits, self._edits = self._edits, []
+        return edits
+
+
+class ComplementView:
+    """Read-only complement of a :class:`MutableStrand`, always current."""
+
+    __hash__ = None
+
+    def __init__(self, strand):
+        self.strand = strand
+
+    def __len__(self):
+        return len(self.strand)
+
+    def __str__(self):
+        return bytes(self).decode("ascii")
+
+    def __bytes__(self):
+        return b"".join(self.strand._complements)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            text = self.strand._read(self.strand._complements, start, max(start, stop))
+            return text if step == 1 else str(self)[index]
+        return self.strand[index].translate(str.maketrans("ACGT", "TGCA"))
+
+    def iter_chunks(self, chunk_size=1 << 22):
+        for start in range(0, len(self), chunk_size):
+            yield self[start:start + chunk_size]
+
+    def complement(self):
+        return self.strand
+
+
+class MutationEngine:
+    """Random point mutations and short indels, one generation at a time.
+
+    *weights* are the relative odds of a substitution, an insertion and a
+    deletion; indels are 1 to *max_indel* bases long.
+    """
+
+    def __init__(self, strand, seed=None, weights=(0.8, 0.1, 0.1), max_indel=3):
+        self.strand = strand if isinstance(strand, MutableStrand) else MutableStrand(strand)
+        self.rng = random.Random(seed)
+        self.weights = weights
+        self.max_indel = max_indel
+        self.generation = 0
+
+    def step(self, mutations):
+        """Apply *mutations* random edits; return them as journalled edits."""
+        strand, rng = self.strand, self.rng
+        kinds = rng.choices(("sub", "ins", "del"), self.weights, k=mutations)
+        for kind in kinds:
+            length = len(strand)
+            if kind == "ins" or not length:
+                size = rng.randint(1, self.max_indel)
+                strand.insert(rng.randint(0, length), "".join(rng.choices(BASES, k=size)))
+            elif kind == "sub":
+                pos = rng.randrange(length)
+                old = strand[pos]
+                strand.substitute(pos, rng.choice([b for b in BASES if b != old]))
+            else:
+                pos = rng.randrange(length)
+                strand.delete(pos, min(rng.randint(1, self.max_indel), length - pos))
+        self.generation += 1
+        return strand.take_edits()
@@ -0,0 +1,188 @@
+"""Motif search and k-mer spectra over strands.
+
+A :class:`KmerIndex` buckets every position of a strand by the 8-mer
+starting there (a counting sort over the 2-bit codes), built once per
+strand.  A query then reads only the buckets its pattern can fall in, so
+exact and IUPAC-degenerate patterns are found without scanning the
+strand.  Both strands are searched: a hit on the complement strand is a
+match of the pattern's reverse complement.
+"""
+
+from dna_sequence import COMPLEMENT, UNKNOWN_CODE, PackedStrand, codes_array, np
+from dna_stats import _require_numpy, kmer_keys
+
+# IUPAC nucleotide codes -> the bases they stand for (U is read as T)
+IUPAC_CODES = {
+    'A': 'A', 'C': 'C', 'G': 'G', 'T': 'T', 'U': 'T',
+    'R': 'AG', 'Y': 'CT', 'S': 'CG', 'W': 'AT', 'K': 'GT', 'M': 'AC',
+    'B': 'CGT', 'D': 'AGT', 'H': 'ACT', 'V': 'ACG', 'N': 'ACGT',
+}
+
+# Symbol standing for the complements of a symbol's bases (R <-> Y, B <-> V, ...)
+IUPAC_COMPLEMENT = {
+    symbol: next(other for other, bases2 in IUPAC_CODES.items()
+                 if set(bases2) == {COMPLEMENT[b] for b in bases})
+    for symbol, bases in IUPAC_CODES.items()
+}
+
+# k of the index: 4**8 buckets, and keys small enough for NumPy's radix sort
+INDEX_K = 8
+
+# Window starts handled per pass while building an index
+_BUILD_CHUNK = 1 << 22
+
+# Queries expanding to more seed k-mers than this are answered by a scan
+MAX_SEED_KEYS = 1024
+
+
+def _pattern_masks(pattern):
+    """Per-position bit mask of the codes each pattern symbol accepts (bit 0 = A)."""
+    if not pattern:
+        raise ValueError("empty pattern")
+    masks = []
+    for symbol in pattern.upper():
+        if symbol not in IUPAC_CODES:
+            raise ValueError(f"invalid IUPAC symbol: {symbol!r}")
+        masks.append(sum(1 << "ACGT".index(b) for b in IUPAC_CODES[symbol]))
+    return masks
+
+
+def reverse_complement(pattern):
+    """Reverse complement of an (IUPAC) pattern."""
+    return "".join(IUPAC_COMPLEMENT[s] for s in reversed(pattern.upper()))
+
+
+def _expand(masks):
+    """Table keys of every exact k-mer matching *masks*, as an int64 array."""
+    keys = np.zeros(1, dtype=np.int64)
+    for mask in masks:
+        codes = np.array([c for c in range(4) if mask >> c & 1], dtype=np.int64)
+        keys = ((keys[:, None] << 2) | codes).ravel()
+    return keys
+
+
+def _degeneracy(mask):
+    return bin(mask).count("1")
+
+
+def _key_count(masks):
+    """Number of exact k-mers matching *masks*."""
+    count = 1
+    for mask in masks:
+        count *= _degeneracy(mask)
+    return count
+
+
+class KmerIndex:
+    """Positions of a strand bucketed by the k-mer starting there.
+
+    ``positions[offsets[key]:offsets[key + 1]]`` are the ascending starts
+    of k-mer *key*.  Memory is one position (4 bytes below 4 Gbp) plus one
+    code byte per base.
+    """
+
+    def __init__(self, strand, k=INDEX_K):
+        _require_numpy("KmerIndex")
+        if not isinstance(strand, (str, bytes, PackedStrand)):
+            strand = strand[0:len(strand)]  # a dna_io record: read it once
+        self.k = k
+        self.length = len(strand)
+        self.codes = codes_array(strand)
+        dtype = np.uint32 if self.length < 1 << 32 else np.int64
+
+        # Pass 1: bucket sizes; pass 2: scatter positions into their buckets
+        counts = np.zeros(4 ** k, dtype=np.int64)
+        for _, keys, _ in self._chunks():
+            counts += np.bincount(keys, minlength=4 ** k)
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+        self.positions = np.empty(int(self.offsets[-1]), dtype=dtype)
+        fill = self.offsets[:-1].copy()
+        for start, keys, starts in self._chunks():
+            order = np.argsort(keys.astype(np.uint16 if k <= 8 else np.uint32), kind="stable")
+            keys, starts = keys[order], starts[order]
+            chunk_counts = np.bincount(keys, minlength=4 ** k)
+            first = np.cumsum(chunk_counts) - chunk_counts
+            rank = np.arange(len(keys)) - first[keys]
+            self.positions[fill[keys] + rank] = starts
+            fill += chunk_counts
+
+        # Starts with no complete k-mer (near an unknown base or the end),
+        # which patterns shorter than k can still match
+        valid = np.zeros(self.length, dtype=bool)
+        valid[self.positions] = True
+        self.partial = np.flatnonzero(~valid & (self.codes != UNKNOWN_CODE))
+
+    def _chunks(self):
+        """Yield ``(first start, keys, starts)`` of the valid k-mers, chunk by chunk."""
+        n = self.length - self.k + 1
+        for start in range(0, max(n, 0), _BUILD_CHUNK):
+            stop = min(start + _BUILD_CHUNK, n)
+            keys, valid = kmer_keys(self.codes[start:stop + self.k - 1], self.k)
+            yield start, keys[valid], np.flatnonzero(valid) + start
+
+    @property
+    def counts(self):
+        """Occurrences of every k-mer (as ``dna_stats`` tallies them)."""
+        return np.diff(self.offsets)
+
+    def _verify(self, starts, masks):
+        """Keep the *starts* where every pattern position accepts the base."""
+        columns = sorted(range(len(masks)), key=lambda j: _degeneracy(masks[j]))
+        for j in columns:
+            # Indexed by code; UNKNOWN_CODE (bit 4) is never accepted
+            accept = np.array([masks[j] >> c & 1 for c in range(5)], dtype=bool)
+            starts = starts[accept[self.codes[starts + j]]]
+        return starts
+
+    def find(self, pattern):
+        """Ascending start positions of *pattern* (IUPAC) on this strand.
+
+        Unknown bases in the strand match nothing, not even ``N``.
+        """
+        masks = _pattern_masks(pattern)
+        m, k = len(masks), self.k
+        if m > self.length:
+            return np.zeros(0, dtype=np.int64)
+
+        if m >= k:
+            # Seed with the least degenerate k-mer of the pattern
+            seed = min(range(m - k + 1), key=lambda s: _key_count(masks[s:s + k]))
+            if _key_count(masks[seed:seed + k]) > MAX_SEED_KEYS:
+                return self._scan(masks)
+            keys = _expand(masks[seed:seed + k]).tolist()
+            starts = np.concatenate([self.positions[self.offsets[key]:self.offsets[key + 1]]
+                                     for key in keys]).astype(np.int64) - seed
+            starts = starts[(starts >= 0) & (starts <= self.length - m)]
+            hits = self._verify(starts, masks)
+        else:
+            # Every k-mer beginning with an expansion of the pattern is a hit
+            if _key_count(masks) > MAX_SEED_KEYS:
+                return self._scan(masks)
+            shift = 2 * (k - m)
+            parts = [self.positions[self.offsets[key << shift]:self.offsets[(key + 1) << shift]]
+                     for key in _expand(masks).tolist()]
+            partial = self.partial[self.partial <= self.length - m]
+            parts.append(self._verify(partial, masks))
+            hits = np.concatenate(parts).astype(np.int64)
+        return np.sort(hits)
+
+    def _scan(self, masks):
+        """Fallback for highly degenerate patterns: check every start."""
+        return self._verify(np.arange(self.length - len(masks) + 1, dtype=np.int64), masks)
+
+    def search(self, pattern):
+        """Find *pattern* on both strands.
+
+        Returns ``(forward, reverse)`` arrays of start positions.  Reverse
+        hits are matches on the complement strand (read 5' to 3'), given by
+        the leftmost forward-strand position they cover.
+        """
+        forward = self.find(pattern)
+        rc = reverse_complement(pattern)
+        reverse = forward if rc == pattern.upper().replace("U", "T") else self.find(rc)
+        return forward, reverse
+
+
+def kmer_spectrum(counts):
+    """Number of distinct k-mers seen 0, 1, 2, ... times, from a k-mer tally."""
+    return np.bincount(np.asarray(counts, dtype=np.int64))
@@ -0,0 +1,370 @@
+"""Core DNA sequence types and functions.
+
+Strands are stored as :class:`PackedStrand` objects: 2-bit codes, four bases
+per byte, first base in the high bits of the first byte.  The codes are
+chosen so that the complement of a base is the bitwise NOT of its code::
+
+    A = 00    C = 01    G = 10    T = 11
+"""
+
+import functools
+import random
+
+from dna_lazy import LazyModule, module_available
+
+# NumPy speeds things up when installed; it is imported on first use
+NUMPY_AVAILABLE = module_available("numpy")
+np = LazyModule("numpy")
+
+# DNA bases
+BASES = ['A', 'T', 'G', 'C']
+
+# Complementary base pairing rules
+COMPLEMENT = {
+    'A': 'T',
+    'T': 'A',
+    'G': 'C',
+    'C': 'G'
+}
+
+# 2-bit code of every base (complement == bitwise NOT)
+BASE_CODES = {'A': 0, 'C': 1, 'G': 2, 'T': 3}
+CODE_BASES = "ACGT"
+
+# ASCII byte -> 2-bit code, 0xFF for anything that is not a base
+_ENCODE_TABLE = bytes(
+    BASE_CODES.get(chr(b).upper(), 0xFF) for b in range(256)
+)
+
+# Code used for 'N' and any other non-ACGT character in unpacked code arrays
+UNKNOWN_CODE = 4
+
+# ASCII byte -> 2-bit code, UNKNOWN_CODE for anything that is not a base
+_CODE_TABLE = _ENCODE_TABLE.replace(b"\xff", bytes((UNKNOWN_CODE,)))
+
+# 2-bit code -> ASCII byte of its base
+_DECODE_TABLE = bytes(ord(CODE_BASES[b]) if b < 4 else 0 for b in range(256))
+
+# Packed byte -> its bitwise NOT (complements all four bases at once)
+_NOT_TABLE = bytes(~b & 0xFF for b in range(256))
+
+# Packed byte -> how many times each code occurs in it (0..4)
+_COUNT_TABLES = tuple(
+    bytes(sum(((b >> shift) & 3) == code for shift in (6, 4, 2, 0))
+          for b in range(256))
+    for code in range(4)
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _count_matrix():
+    """The count tables as a 256x4 matrix, so a byte histogram yields all four at once."""
+    return np.array([list(t) for t in _COUNT_TABLES], dtype=np.int64).T
+
+
+@functools.lru_cache(maxsize=None)
+def _unpack_shifts():
+    """Shifts that pull the four 2-bit codes out of a packed byte, in order."""
+    return np.array([6, 4, 2, 0], dtype=np.uint8)
+
+
+# str.translate table for complementing unpacked strings
+_COMPLEMENT_TRANS = str.maketrans(COMPLEMENT)
+
+# Default number of bases per chunk yielded by iter_dna_chunks (a multiple of 4)
+DEFAULT_CHUNK_SIZE = 1 << 22
+
+# Bases decoded per step when iterating over a packed strand
+_ITER_BLOCK = 1 << 16
+
+
+def _packed_size(length):
+    """Number of bytes needed to hold *length* bases."""
+    return (length + 3) // 4
+
+
+def _pack_codes(codes):
+    """Pack a bytes object of 2-bit codes (one per byte) four to a byte."""
+    pad = -len(codes) % 4
+    if pad:
+        codes = bytes(codes) + bytes(pad)
+    # Each code only uses the low two bits of its byte, so the four lanes can
+    # be shifted into place as big integers without bits crossing bytes.
+    lanes = [int.from_bytes(codes[k::4], "big") for k in range(4)]
+    value = (lanes[0] << 6) | (lanes[1] << 4) | (lanes[2] << 2) | lanes[3]
+    return value.to_bytes(len(codes) // 4, "big")
+
+
+def _unpack_codes(data, length):
+    """Inverse of :func:`_pack_codes`: one 2-bit code per byte, *length* bytes."""
+    value = int.from_bytes(data, "big")
+    mask = int.from_bytes(b"\x03" * len(data), "big")
+    codes = bytearray(len(data) * 4)
+    for k, shift in enumerate((6, 4, 2, 0)):
+        codes[k::4] = ((value >> shift) & mask).to_bytes(len(data), "big")
+    del codes[length:]
+    return codes
+
+
+def _clear_tail(data, length):
+    """Zero the padding bits after the last base so equal strands compare equal."""
+    used = length % 4
+    if not used or not data:
+        return bytes(data)
+    keep = (0xFF << (8 - 2 * used)) & 0xFF
+    return bytes(data[:-1]) + bytes((data[-1] & keep,))
+
+
+class PackedStrand:
+    """An immutable DNA strand stored at 2 bits per base.
+
+    Behaves like a read-only ``str`` of bases for the operations the rest
+    of the program uses: ``len``, indexing, slicing, iteration, ``count``
+    and ``str()``.
+    """
+
+    __slots__ = ("_data", "_length", "__weakref__")
+
+    def __init__(self, data=b"", length=None):
+        """Wrap already-packed *data* holding *length* bases."""
+        if length is None:
+            length = len(data) * 4
+        if _packed_size(length) != len(data):
+            raise ValueError(
+                f"{len(data)} packed bytes cannot hold exactly {length} bases"
+            )
+        self._data = _clear_tail(data, length)
+        self._length = length
+
+    @classmethod
+    def from_str(cls, seq):
+        """Pack a string of A/C/G/T characters (case-insensitive)."""
+        codes = seq.encode("ascii").translate(_ENCODE_TABLE)
+        if b"\xff" in codes:
+            bad = next(ch for ch in seq if ch.upper() not in BASE_CODES)
+            raise ValueError(f"invalid DNA base: {bad!r}")
+        return cls(_pack_codes(codes), len(seq))
+
+    @property
+    def data(self):
+        """The packed bytes (padding bits after the last base are zero)."""
+        return self._data
+
+    @property
+    def nbytes(self):
+        """Memory used by the packed bases, in bytes."""
+        return len(self._data)
+
+    def __len__(self):
+        return self._length
+
+    def __str__(self):
+        codes = _unpack_codes(self._data, self._length)
+        return codes.translate(_DECODE_TABLE).decode("ascii")
+
+    def __repr__(self):
+        preview = str(self[:20])
+        if self._length > 20:
+            preview += "..."
+        return f"PackedStrand({preview!r}, length={self._length})"
+
+    def __eq__(self, other):
+        if not isinstance(other, PackedStrand):
+            return NotImplemented
+        return self._length == other._length and self._data == other._data
+
+    def __hash__(self):
+        return hash((self._length, self._data))
+
+    def __iter__(self):
+        for start in range(0, self._length, _ITER_BLOCK):
+            yield from str(self[start:start + _ITER_BLOCK])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return PackedStrand.from_str(str(self)[index])
+            return self._slice(start, stop)
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("strand index out of range")
+        byte = self._data[index >> 2]
+        return CODE_BASES[(byte >> (6 - 2 * (index & 3))) & 3]
+
+    def _slice(self, start, stop):
+        length = stop - start
+        if length <= 0:
+            return PackedStrand()
+        first, offset = divmod(start, 4)
+        chunk = self._data[first:_packed_size(stop)]
+        if offset:
+            # Shift the whole chunk left so *start* lands on a byte boundary
+            nbits = len(chunk) * 8
+            value = (int.from_bytes(chunk, "big") << (2 * offset)) & ((1 << nbits) - 1)
+            chunk = value.to_bytes(len(chunk), "big")
+        return PackedStrand(chunk[:_packed_size(length)], length)
+
+    def count(self, base):
+        """Count occurrences of a base (substrings fall back to ``str.count``)."""
+        code = BASE_CODES.get(base) if len(base) == 1 else None
+        if code is None:
+            return str(self).count(base)
+        per_byte = self._data.translate(_COUNT_TABLES[code])
+        total = sum(n * per_byte.count(n) for n in range(1, 5))
+        if code == 0:
+            # The zero padding after the last base decodes as 'A'
+            total -= -self._length % 4
+        return total
+
+    def codes(self):
+        """Return the bases as a bytearray of 2-bit codes, one byte per base."""
+        return _unpack_codes(self._data, self._length)
+
+    def base_counts(self):
+        """Return ``{base: count}`` for all four bases in a single pass."""
+        if NUMPY_AVAILABLE:
+            hist = np.bincount(np.frombuffer(self._data, dtype=np.uint8),
+                               minlength=256)
+            totals = [int(n) for n in hist @ _count_matrix()]
+        else:
+            totals = [sum(n * self._data.translate(table).count(n) for n in range(1, 5))
+                      for table in _COUNT_TABLES]
+        totals[0] -= -self._length % 4
+        return dict(zip(CODE_BASES, totals))
+
+    def complement(self):
+        """Return the complementary strand (bitwise NOT of the packed bytes)."""
+        return PackedStrand(self._data.translate(_NOT_TABLE), self._length)
+
+
+def as_packed(strand):
+    """Return *strand* as a :class:`PackedStrand`, packing it if it is a ``str``."""
+    if isinstance(strand, PackedStrand):
+        return strand
+    return PackedStrand.from_str(strand)
+
+
+def join_strands(parts):
+    """Concatenate PackedStrand *parts* (e.g. from :func:`iter_dna_chunks`)."""
+    parts = list(parts)
+    length = sum(len(p) for p in parts)
+    if all(len(p) % 4 == 0 for p in parts[:-1]):
+        # Byte-aligned parts: the packed bytes simply follow each other
+        return PackedStrand(b"".join(p.data for p in parts), length)
+    return PackedStrand(_pack_codes(b"".join(p.codes() for p in parts)), length)
+
+
+def to_codes(strand):
+    """Return *strand* as one code byte per base (A=0, C=1, G=2, T=3, other=4)."""
+    if isinstance(strand, PackedStrand):
+        return strand.codes()
+    if isinstance(strand, str):
+        strand = strand.encode("ascii", errors="replace")
+    return bytes(strand).translate(_CODE_TABLE)
+
+
+def codes_array(strand):
+    """Return *strand* as a NumPy ``uint8`` array of codes (see :func:`to_codes`)."""
+    if isinstance(strand, PackedStrand):
+        packed = np.frombuffer(strand.data, dtype=np.uint8)
+        codes = (packed[:, None] >> _unpack_shifts()) & 3
+        return codes.ravel()[:len(strand)]
+    return np.frombuffer(to_codes(strand), dtype=np.uint8)
+
+
+def _base_probabilities(gc_content=None, probabilities=None):
+    """Return per-code probabilities (A, C, G, T order), or None for uniform."""
+    if gc_content is not None and probabilities is not None:
+        raise ValueError("pass either gc_content or probabilities, not both")
+    if gc_content is not None:
+        if not 0 <= gc_content <= 100:
+            raise ValueError("gc_content must be a percentage between 0 and 100")
+        gc = gc_content / 200
+        at = (100 - gc_content) / 200
+        return [at, gc, gc, at]
+    if probabilities is not None:
+        unknown = set(probabilities) - set(BASE_CODES)
+        if unknown:
+            raise ValueError(f"unknown bases in probabilities: {sorted(unknown)}")
+        weights = [float(probabilities.get(b, 0.0)) for b in CODE_BASES]
+        total = sum(weights)
+        if total <= 0 or min(weights) < 0:
+            raise ValueError("probabilities must be non-negative and not all zero")
+        return [w / total for w in weights]
+    return None
+
+
+def _make_rng(seed):
+    """Return a NumPy Generator (or ``random.Random`` without NumPy) for *seed*."""
+    if NUMPY_AVAILABLE:
+        if isinstance(seed, np.random.Generator):
+            return seed
+        return np.random.default_rng(seed)
+    if isinstance(seed, random.Random):
+        return seed
+    return random.Random(seed)
+
+
+def _random_packed(rng, length, probs):
+    """Draw *length* random bases from *rng* as packed bytes."""
+    nbytes = _packed_size(length)
+    if probs is None:
+        # Every 2-bit pattern is a valid base, so random bits are a random strand
+        if NUMPY_AVAILABLE:
+            return rng.bytes(nbytes)
+        pad = -length % 4
+        value = rng.getrandbits(2 * length) << (2 * pad) if length else 0
+        return value.to_bytes(nbytes, "big")
+
+    cumulative = [sum(probs[:i + 1]) for i in range(4)]
+    if not NUMPY_AVAILABLE:
+        codes = bytes(rng.choices(range(4), cum_weights=cumulative, k=length))
+        return _pack_codes(codes)
+
+    codes = np.zeros(nbytes * 4, dtype=np.uint8)
+    draws = np.searchsorted(cumulative[:3], rng.random(length), side="right")
+    codes[:length] = draws
+    codes = codes.reshape(-1, 4)
+    packed = (codes[:, 0] << 6) | (codes[:, 1] << 4) | (codes[:, 2] << 2) | codes[:, 3]
+    return packed.tobytes()
+
+
+def generate_dna_strand(length, seed=None, gc_content=None, probabilities=None):
+    """Generate a random DNA strand of specified length
+
+    *seed* makes the result reproducible.  *gc_content* (a percentage) biases
+    the draw towards G/C; *probabilities* maps bases to arbitrary weights.
+    """
+    probs = _base_probabilities(gc_content, probabilities)
+    rng = _make_rng(seed)
+    return PackedStrand(_random_packed(rng, length, probs), length)
+
+
+def iter_dna_chunks(length, chunk_size=DEFAULT_CHUNK_SIZE, seed=None,
+                    gc_content=None, probabilities=None):
+    """Yield a random strand of *length* bases as PackedStrand chunks.
+
+    Only one chunk exists at a time, so arbitrarily long strands can be
+    streamed.  The output is reproducible for a given *seed* and *chunk_size*.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    probs = _base_probabilities(gc_content, probabilities)
+    rng = _make_rng(seed)
+    for start in range(0, length, chunk_size):
+        size = min(chunk_size, length - start)
+        yield PackedStrand(_random_packed(rng, size, probs), size)
+
+
+def get_complement_strand(strand):
+    """Get the complementary DNA strand
+
+    Strings are translated; anything else (a PackedStrand, or a record
+    loaded by ``dna_io``) supplies its own ``complement()``.
+    """
+    if isinstance(strand, str):
+        return strand.translate(_COMPLEMENT_TRANS)
+    return strand.complement()
@@ -0,0 +1,428 @@
+"""Sequence statistics: base composition, GC content and text summaries."""
+
+import functools
+import math
+import os
+import weakref
+from collections import deque
+
+from dna_sequence import (BASE_CODES, BASES, COMPLEMENT, NUMPY_AVAILABLE,
+                          UNKNOWN_CODE, PackedStrand, codes_array, np)
+
+# Bases tallied by a Composition ('N' = unknown base)
+COMPOSITION_BASES = ('A', 'T', 'G', 'C', 'N')
+
+# Largest k for k-mer tallies (a dense table of 4**k counts)
+MAX_KMER_K = 12
+
+# Bases handed to one worker task by the parallel statistics functions
+PARALLEL_CHUNK_SIZE = 1 << 22
+
+
+class Composition:
+    """Base counts of a strand, computed in a single pass."""
+
+    __slots__ = ("counts", "length")
+
+    def __init__(self, counts, length):
+        self.counts = {b: counts.get(b, 0) for b in COMPOSITION_BASES}
+        self.length = length
+
+    @classmethod
+    def from_strand(cls, strand):
+        """Count A/T/G/C/N in *strand* (a str, PackedStrand, MutableStrand or loaded record)."""
+        if hasattr(strand, "base_counts"):
+            # PackedStrands count packed bytes; MutableStrands keep running counts
+            return cls(strand.base_counts(), len(strand))
+        if hasattr(strand, "iter_chunks"):
+            # Records loaded by dna_io are counted a chunk at a time
+            return sum((cls.from_strand(chunk) for chunk in strand.iter_chunks()),
+                       cls({}, 0))
+        if not isinstance(strand, (str, bytes)):
+            strand = "".join(strand)
+        if isinstance(strand, str):
+            strand = strand.encode("ascii", errors="replace")
+
+        counts = {}
+        if NUMPY_AVAILABLE:
+            hist = np.bincount(np.frombuffer(strand, dtype=np.uint8), minlength=256)
+            for b in COMPOSITION_BASES:
+                counts[b] = int(hist[ord(b)] + hist[ord(b.lower())])
+        else:
+            for b in COMPOSITION_BASES:
+                counts[b] = strand.count(b.encode()) + strand.count(b.lower().encode())
+        return cls(counts, len(strand))
+
+    def __repr__(self):
+        return f"Composition({self.counts!r}, length={self.length})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Composition):
+            return NotImplemented
+        return self.counts == other.counts and self.length == other.length
+
+    def __add__(self, other):
+        """Combine the counts of two strands (or two pieces of one strand)."""
+        if not isinstance(other, Composition):
+            return NotImplemented
+        counts = {b: self.counts[b] + other.counts[b] for b in COMPOSITION_BASES}
+        return Composition(counts, self.length + other.length)
+
+    @property
+    def gc_count(self):
+        return self.counts['G'] + self.counts['C']
+
+    @property
+    def gc_content(self):
+        """GC percentage over the known (A/C/G/T) bases."""
+        known = self.gc_count + self.counts['A'] + self.counts['T']
+        return self.gc_count / known * 100 if known else 0.0
+
+    @property
+    def at_content(self):
+        """AT percentage over the known (A/C/G/T) bases."""
+        known = self.gc_count + self.counts['A'] + self.counts['T']
+        return 100 - self.gc_content if known else 0.0
+
+    def percent(self, base):
+        """Share of *base* in the whole strand, as a percentage."""
+        return self.counts[base] / self.length * 100 if self.length else 0.0
+
+
+# Compositions of live strands; an entry goes with its strand, so the memo
+# never keeps a (possibly huge) strand or memory-mapped record alive
+_compositions = weakref.WeakKeyDictionary()
+
+
+def get_composition(strand):
+    """Return the (memoized) Composition of *strand*.
+
+    PackedStrands and loaded records are remembered for as long as they
+    live, so asking again is a dictionary lookup rather than a rescan.
+    Anything else (str and bytes, which cannot be weakly referenced, or a
+    MutableStrand, which keeps running counts anyway) is counted each time.
+    """
+    try:
+        comp = _compositions.get(strand)
+    except TypeError:  # no weak references, or unhashable
+        return Composition.from_strand(strand)
+    if comp is None:
+        comp = _compositions[strand] = Composition.from_strand(strand)
+    return comp
+
+
+def calculate_gc_content(strand):
+    """Calculate GC content percentage"""
+    return get_composition(strand).gc_content
+
+
+def get_statistics(strand, source="Random Generation", top_kmers=10):
+    """Return the figures of :func:`get_statistics_text` as a plain dict.
+
+    *strand* may also be a Composition or StrandStats; for StrandStats with
+    k-mer tallies the *top_kmers* most frequent k-mers are included.
+    """
+    kmers = None
+    if isinstance(strand, StrandStats):
+        if strand.k:
+            kmers = dict(strand.top_kmers(top_kmers))
+        strand = strand.composition
+    comp = strand if isinstance(strand, Composition) else get_composition(strand)
+    stats = {
+        "source": source,
+        "length": comp.length,
+        "gc_content": round(comp.gc_content, 4),
+        "at_content": round(comp.at_content, 4),
+        "counts": dict(comp.counts),
+    }
+    if kmers is not None:
+        stats["top_kmers"] = kmers
+    return stats
+
+
+def get_statistics_text(strand, source="Random Generation"):
+    """Return a formatted statistics string
+
+    *strand* may also be a precomputed Composition (or StrandStats).
+    """
+    if isinstance(strand, StrandStats):
+        strand = strand.composition
+    comp = strand if isinstance(strand, Composition) else get_composition(strand)
+    gc = comp.gc_content
+    lines = [
+        f"Source: {source}",
+        f"Total length: {comp.length} base pairs",
+        f"GC Content: {gc:.2f}%",
+        f"AT Content: {comp.at_content:.2f}%",
+        "",
+        "Base counts:",
+    ]
+    for base in BASES:
+        count = comp.counts[base]
+        comp_base = COMPLEMENT[base]
+        lines.append(f"  {base}–{comp_base}: {count} pairs ({comp.percent(base):.1f}%)")
+    if comp.counts['N']:
+        lines.append(f"  N (unknown): {comp.counts['N']} ({comp.percent('N'):.1f}%)")
+    return "\n".join(lines)
+
+
+# ---- Mergeable statistics and parallel reduction -----------------------------
+
+def kmer_keys(codes, k):
+    """Table index of the k-mer starting at every position of a code array.
+
+    Returns ``(keys, valid)``; *valid* is False where the k-mer runs over
+    an unknown base.  Keys are 2-bit codes, first base most significant.
+    """
+    n = max(len(codes) - k + 1, 0)
+    index = np.zeros(n, dtype=np.int64)
+    valid = np.ones(n, dtype=bool)
+    for j in range(k):
+        window = codes[j:j + n]
+        index = (index << 2) | (window & 3)
+        valid &= window != UNKNOWN_CODE
+    return index, valid
+
+
+def _kmer_counts(strand, k):
+    """Dense array of counts for every k-mer (index = 2-bit codes, A=0 first)."""
+    index, valid = kmer_keys(codes_array(strand), k)
+    return np.bincount(index[valid], minlength=4 ** k).astype(np.int64)
+
+
+def kmer_string(index, k):
+    """Decode a k-mer table index back into its bases."""
+    return "".join("ACGT"[(index >> (2 * (k - 1 - j))) & 3] for j in range(k))
+
+
+class StrandStats:
+    """Mergeable statistics: base composition plus optional k-mer tallies.
+
+    Merging is associative and commutative, so pieces of a strand (or many
+    strands) can be reduced in any order, e.g. by a process pool.
+    """
+
+    __slots__ = ("composition", "k", "kmer_counts")
+
+    def __init__(self, composition=None, k=0, kmer_counts=None):
+        self.composition = composition or Composition({}, 0)
+        self.k = k
+        if k and kmer_counts is None:
+            kmer_counts = np.zeros(4 ** k, dtype=np.int64)
+        self.kmer_counts = kmer_counts
+
+    @classmethod
+    def from_strand(cls, strand, k=0, count_len=None):
+        """Statistics of *strand*.
+
+        With *count_len*, only the first *count_len* bases are counted and
+        the rest of *strand* is overlap that completes k-mers starting in
+        that range; this is how a split strand is tallied piece by piece.
+        """
+        if k:
+            if not 0 < k <= MAX_KMER_K:
+                raise ValueError(f"k must be between 1 and {MAX_KMER_K}")
+            _require_numpy("k-mer tallies")
+        if count_len is None:
+            count_len = len(strand)
+        comp = Composition.from_strand(strand[:count_len])
+        kmers = _kmer_counts(strand[:count_len + k - 1], k) if k else None
+        return cls(comp, k, kmers)
+
+    def __repr__(self):
+        return f"StrandStats({self.composition!r}, k={self.k})"
+
+    def __eq__(self, other):
+        if not isinstance(other, StrandStats):
+            return NotImplemented
+        if self.composition != other.composition or self.k != other.k:
+            return False
+        return not self.k or bool((self.kmer_counts == other.kmer_counts).all())
+
+    def merge(self, other):
+        """Return the statistics of both inputs combined."""
+        if self.k != other.k:
+            raise ValueError("cannot merge statistics with different k")
+        kmers = self.kmer_counts + other.kmer_counts if self.k else None
+        return StrandStats(self.composition + other.composition, self.k, kmers)
+
+    __add__ = merge
+
+    @property
+    def gc_content(self):
+        return self.composition.gc_content
+
+    def top_kmers(self, n=10):
+        """Return the *n* most frequent k-mers as ``[(kmer, count), ...]``."""
+        if not self.k:
+            return []
+        order = np.argsort(self.kmer_counts, kind="stable")[::-1][:n]
+        return [(kmer_string(int(i), self.k), int(self.kmer_counts[i]))
+                for i in order if self.kmer_counts[i]]
+
+
+def _stats_task(task):
+    """Worker entry point: *task* is ``(index, piece, count_len, k)``."""
+    index, piece, count_len, k = task
+    return index, StrandStats.from_strand(piece, k, count_len)
+
+
+def _split_tasks(strands, k, chunk_size):
+    """Cut every strand into pieces of *chunk_size* bases plus k-1 overlap."""
+    for index, strand in enumerate(strands):
+        length = len(strand)
+        if not length:
+            yield index, strand[0:0], 0, k  # a slice: records do not pickle
+        for start in range(0, length, chunk_size):
+            count_len = min(chunk_size, length - start)
+            yield index, strand[start:start + count_len + max(k - 1, 0)], count_len, k
+
+
+def _bounded_map(pool, fn, tasks, window):
+    """``pool.map(fn, tasks)`` with at most *window* tasks submitted at a time.
+
+    ``Executor.map`` reads all of *tasks* up front; this reads it only as
+    fast as the workers finish, so lazily sliced pieces stay lazy.
+    """
+    pending = deque()
+    for task in tasks:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(pool.submit(fn, task))
+    while pending:
+        yield pending.popleft().result()
+
+
+def map_statistics(strands, k=0, workers=None, chunk_size=None):
+    """Return one StrandStats per strand, computed across a process pool.
+
+    Long strands are split into pieces that are reduced in parallel and
+    merged back, so the result equals ``StrandStats.from_strand`` for each
+    strand.  Only a few pieces per worker are read ahead of the workers.
+    ``workers=1`` runs everything in the calling process.
+    """
+    strands = list(strands)
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        # Enough pieces to keep every worker busy, aligned to whole packed bytes
+        longest = max(map(len, strands), default=0)
+        chunk_size = min(PARALLEL_CHUNK_SIZE, -(-longest // workers))
+        chunk_size = max(4, chunk_size + (-chunk_size % 4))
+
+    # Every strand yields at least one piece; its first piece's stats start
+    # the slot (no 4**k tally is allocated per strand up front)
+    results = [None] * len(strands)
+    if k:
+        _require_numpy("k-mer tallies")
+    tasks = _split_tasks(strands, k, chunk_size)
+    if workers == 1:
+        done = map(_stats_task, tasks)
+        for index, stats in done:
+            results[index] = stats if results[index] is None else results[index].merge(stats)
+        return results
+
+    from concurrent.futures import ProcessPoolExecutor  # deferred: imports multiprocessing
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for index, stats in _bounded_map(pool, _stats_task, tasks, 2 * workers):
+            results[index] = stats if results[index] is None else results[index].merge(stats)
+    return results
+
+
+def parallel_statistics(strands, k=0, workers=None, chunk_size=None):
+    """Combined StrandStats of one strand or a list of strands, using all cores.
+
+    A single strand may be a str, bytes, PackedStrand, ``dna_io`` record or
+    ``dna_mutation.MutableStrand`` (anything with ``iter_chunks``).
+    """
+    if isinstance(strands, (str, bytes, PackedStrand)) or hasattr(strands, "iter_chunks"):
+        strands = [strands]
+    return functools.reduce(StrandStats.merge,
+                            map_statistics(strands, k, workers, chunk_size),
+                            StrandStats(k=k))
+
+
+# ---- Sliding-window GC profile ----------------------------------------------
+
+def _require_numpy(feature):
+    if not NUMPY_AVAILABLE:
+        raise ImportError(f"{feature} needs NumPy. Install with: pip install numpy")
+
+
+def iter_gc_profile(chunks, window, step=None):
+    """Stream per-window GC% and GC skew over an iterable of strand chunks.
+
+    Yields ``(starts, gc_percent, gc_skew)`` NumPy arrays, one batch per
+    input chunk.  Bases are counted in blocks of ``gcd(window, step)`` and
+    window sums come from differences of the running block totals, so the
+    cost is O(n) whatever the window size.  At most one window of bases is
+    carried from one chunk to the next.  GC% is taken over the known bases
+    of a window; skew is ``(G - C) / (G + C)``.
+    """
+    _require_numpy("iter_gc_profile")
+    step = step or window
+    if window <= 0 or step <= 0:
+        raise ValueError("window and step must be positive")
+
+    block = math.gcd(window, step)
+    carry = np.zeros(0, dtype=np.uint8)  # codes from the next window start on
+    carry_start = 0                       # strand position of carry[0]
+    skip = 0                              # bases to drop when step > window
+
+    for chunk in chunks:
+        codes = codes_array(chunk)
+        if skip:
+            dropped = min(skip, len(codes))
+            codes = codes[dropped:]
+            skip -= dropped
+        buf = np.concatenate((carry, codes)) if len(carry) else codes
+        n_windows = (len(buf) - window) // step + 1 if len(buf) >= window else 0
+        if n_windows:
+            used = (n_windows - 1) * step + window
+            blocks = buf[:used].reshape(-1, block)
+
+            def running(code):
+                matches = blocks == code
+                per_block = matches[:, 0] if block == 1 else np.count_nonzero(matches, axis=1)
+                return np.concatenate(([0], np.cumsum(per_block, dtype=np.int64)))
+
+            lo = np.arange(n_windows, dtype=np.int64) * (step // block)
+            hi = lo + window // block
+            cum_g = running(BASE_CODES['G'])
+            cum_c = running(BASE_CODES['C'])
+            cum_n = running(UNKNOWN_CODE)
+            g = cum_g[hi] - cum_g[lo]
+            c = cum_c[hi] - cum_c[lo]
+            known = window - (cum_n[hi] - cum_n[lo])
+            gc = g + c
+            with np.errstate(divide="ignore", invalid="ignore"):
+                gc_percent = np.where(known > 0, gc * 100.0 / known, 0.0)
+                gc_skew = np.where(gc > 0, (g - c) / gc, 0.0)
+            yield carry_start + lo * block, gc_percent, gc_skew
+
+        consumed = n_windows * step
+        carry = buf[consumed:].copy()
+        skip += max(consumed - len(buf), 0)
+        carry_start += consumed
+
+
+def gc_profile(strand, window, step=None, chunk_size=1 << 22):
+    """Return ``(starts, gc_percent, gc_skew)`` arrays over sliding windows.
+
+    *strand* may be a single strand, a record loaded by ``dna_io`` or an
+    iterable of chunks (for example from ``iter_dna_chunks``); a strand or
+    record is fed through in slices of *chunk_size* bases.  Only complete
+    windows are reported.
+    """
+    if isinstance(strand, (str, bytes, PackedStrand)):
+        chunks = (strand[i:i + chunk_size] for i in range(0, len(strand), chunk_size))
+    elif hasattr(strand, "iter_chunks"):
+        chunks = strand.iter_chunks(chunk_size)
+    else:
+        chunks = strand
+    batches = list(iter_gc_profile(chunks, window, step))
+    if not batches:
+        empty = np.zeros(0)
+        return np.zeros(0, dtype=np.int64), empty, empty
+    starts, gc_percent, gc_skew = zip(*batches)
+    return np.concatenate(starts), np.concatenate(gc_percent), np.concatenate(gc_skew)
@@ -0,0 +1,132 @@
+"""Background tasks for the Tk GUI.
+
+Work runs on a thread pool; progress and completion are queued and
+delivered on the Tk thread by polling with ``root.after``, so callbacks
+may touch widgets freely.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task function once its task has been cancelled."""
+
+
+class Task:
+    """Handle passed to a task function and returned by ``TaskRunner.submit``.
+
+    The function calls :meth:`report` to publish progress (a 0..1 fraction)
+    and a status message; both :meth:`report` and :meth:`check` raise
+    TaskCancelled after :meth:`cancel`.
+    """
+
+    def __init__(self, runner, name, on_done, on_progress, on_error):
+        self.name = name
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.on_error = on_error
+        self._runner = runner
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise TaskCancelled(self.name)
+
+    def report(self, fraction=None, message=None):
+        self.check()
+        self._runner._post(self, "progress", (fraction, message))
+
+
+class TaskRunner:
+    """Run callables off the Tk thread and deliver their results back to it.
+
+    ``submit(fn, *args)`` calls ``fn(task, *args)`` on a worker thread.
+    ``on_done(result)``, ``on_progress(fraction, message)`` and
+    ``on_error(exc)`` are then called on the Tk thread; nothing is delivered
+    for a task after it has been cancelled.
+    """
+
+    POLL_MS = 40            # how often the Tk thread drains the result queue
+    POLL_BUDGET_S = 0.02    # max time spent delivering messages per poll
+
+    def __init__(self, root, max_workers=2):
+        self.root = root
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,
+                                        thread_name_prefix="dna-task")
+        self._queue = queue.Queue()
+        self._tasks = set()
+        self._closed = False
+        self._after_id = self.root.after(self.POLL_MS, self._poll)
+
+    def submit(self, fn, *args, name="", on_done=None, on_progress=None,
+               on_error=None):
+        task = Task(self, name or getattr(fn, "__name__", "task"),
+                    on_done, on_progress, on_error)
+        self._tasks.add(task)
+        self._pool.submit(self._run, task, fn, args)
+        return task
+
+    def _run(self, task, fn, args):
+        try:
+            result = fn(task, *args)
+        except TaskCancelled:
+            self._post(task, "cancelled", None)
+        except Exception as e:  # handed to on_error on the Tk thread
+            self._post(task, "error", e)
+        else:
+            self._post(task, "done", result)
+
+    def _post(self, task, kind, payload):
+        self._queue.put((task, kind, payload))
+
+    def _poll(self):
+        deadline = time.perf_counter() + self.POLL_BUDGET_S
+        try:
+            while time.perf_counter() < deadline:
+                try:
+                    task, kind, payload = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._deliver(task, kind, payload)
+        finally:
+            if not self._closed:
+                self._after_id = self.root.after(self.POLL_MS, self._poll)
+
+    def _deliver(self, task, kind, payload):
+        if kind != "progress":
+            self._tasks.discard(task)
+        if task.cancelled or kind == "cancelled":
+            return
+        if kind == "progress" and task.on_progress:
+            task.on_progress(*payload)
+        elif kind == "done" and task.on_done:
+            task.on_done(payload)
+        elif kind == "error":
+            if task.on_error:
+                task.on_error(payload)
+            else:
+                print(f"✗ Background task {task.name!r} failed: {payload!r}")
+
+    @property
+    def busy(self):
+        return any(not t.cancelled for t in self._tasks)
+
+    def cancel_all(self):
+        for task in list(self._tasks):
+            task.cancel()
+
+    def shutdown(self):
+        self._closed = True
+        self.cancel_all()
+        self.root.after_cancel(self._after_id)
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,239 @@
+"""Six-frame translation and open reading frames (ORFs).
+
+Codons are looked up in a 64-entry table indexed by their 6-bit code
+(2 bits per base, first base most significant), a whole chunk of the
+strand at a time; a seventh bit marks codons over an unknown base, which
+translate to ``X``.  :func:`iter_orfs` finds the ORFs of both strands in
+one forward pass over the chunks: a reverse-strand codon is the reverse
+complement of a forward one, so the same lookup tells its start and stop
+codons too.  Only the ORFs that are kept are ever translated.
+"""
+
+import functools
+
+from dna_sequence import PackedStrand, codes_array, np
+from dna_stats import _require_numpy
+
+# Amino acid of every codon, codons in A/C/G/T order (AAA, AAC, AAG, AAT, ACA, ...)
+GENETIC_CODE = "KNKNTTTTRSRSIIMIQHQHPPPPRRRRLLLLEDEDAAAAGGGGVVVV*Y*YSSSS*CWCLFLF"
+
+START_CODONS = ("ATG",)
+STOP_CODONS = ("TAA", "TAG", "TGA")
+
+# Shortest ORF reported, in amino acids (the stop codon not counted)
+ORF_MIN_CODONS = 100
+
+# Bases translated per pass
+TRANSLATE_CHUNK = 1 << 20
+
+# Reading frames: +1..+3 on the strand, -1..-3 on its reverse complement
+FRAMES = (1, 2, 3, -1, -2, -3)
+
+_UNKNOWN_KEY = 64  # added to the key of a codon over an unknown base
+
+# Codon kinds: start/stop on the strand, start/stop read on the other strand
+_START, _STOP, _RC_START, _RC_STOP = 1, 2, 3, 4
+
+
+def _codon_key(codon):
+    return sum("ACGT".index(base) << (4 - 2 * j) for j, base in enumerate(codon))
+
+
+@functools.lru_cache(maxsize=None)
+def _tables():
+    """``(amino acids, kinds)``: uint8 tables indexed by codon key (128 entries).
+
+    No codon is of two kinds (no start or stop codon is the reverse
+    complement of another), so one kind per codon is enough.
+    """
+    amino = np.frombuffer((GENETIC_CODE + "X" * _UNKNOWN_KEY).encode("ascii"),
+                          dtype=np.uint8)
+    kinds = np.zeros(2 * _UNKNOWN_KEY, dtype=np.uint8)
+    rc = {"A": "T", "C": "G", "G": "C", "T": "A"}
+    for codons, forward, reverse in ((START_CODONS, _START, _RC_START),
+                                     (STOP_CODONS, _STOP, _RC_STOP)):
+        for codon in codons:
+            kinds[_codon_key(codon)] = forward
+            # Read on the other strand, this codon appears reverse complemented
+            kinds[_codon_key("".join(rc[b] for b in reversed(codon)))] = reverse
+    return amino, kinds
+
+
+def codon_keys(codes):
+    """Key of the codon starting at every position of a code array.
+
+    Keys are the 6-bit codon code, plus 64 where the codon runs over an
+    unknown base; all arithmetic stays in ``uint8``.
+    """
+    c0, c1, c2 = codes[:-2], codes[1:-1], codes[2:]
+    if len(codes) and codes.max() < 4:  # no unknown bases: no masking needed
+        keys = c0 << 4
+        keys |= c1 << 2
+        keys |= c2
+        return keys
+    keys = (c0 & 3) << 4
+    keys |= (c1 & 3) << 2
+    keys |= c2 & 3
+    keys |= ((c0 | c1 | c2) & 4) << 4
+    return keys
+
+
+def _strand_codes(strand):
+    if not isinstance(strand, (str, bytes, PackedStrand)):
+        strand = strand[0:len(strand)]  # a dna_io record or MutableStrand: read it once
+    return codes_array(strand)
+
+
+def _reverse_complement_codes(codes):
+    rc = codes[::-1].copy()
+    known = rc < 4
+    rc[known] = 3 - rc[known]
+    return rc
+
+
+def translate(strand, frame=1):
+    """Protein of *strand* in one of ``FRAMES``, one letter per codon (``*`` = stop)."""
+    _require_numpy("translate")
+    if frame not in FRAMES:
+        raise ValueError(f"frame must be one of {FRAMES}, not {frame!r}")
+    codes = _strand_codes(strand)
+    if frame < 0:
+        codes = _reverse_complement_codes(codes)
+    keys = codon_keys(codes)[abs(frame) - 1::3]
+    return np.take(_tables()[0], keys).tobytes().decode("ascii")
+
+
+def six_frame_translation(strand):
+    """``{frame: protein}`` for all six reading frames."""
+    return {frame: translate(strand, frame) for frame in FRAMES}
+
+
+class Orf:
+    """An open reading frame, start codon to stop codon inclusive.
+
+    *start* and *end* are forward-strand coordinates (``end`` exclusive)
+    whatever the strand; *frame* is one of ``FRAMES``.
+    """
+
+    __slots__ = ("frame", "start", "end")
+
+    def __init__(self, frame, start, end):
+        self.frame = frame
+        self.start = start
+        self.end = end
+
+    @property
+    def strand(self):
+        return "+" if self.frame > 0 else "-"
+
+    @property
+    def codons(self):
+        """Length of the protein, in amino acids."""
+        return (self.end - self.start) // 3 - 1
+
+    def protein(self, strand, limit=None):
+        """Translate this ORF of *strand* without the stop codon, or its first *limit* codons."""
+        codons = self.codons if limit is None else min(limit, self.codons)
+        if self.frame > 0:
+            return translate(strand[self.start:self.start + 3 * codons])
+        return translate(strand[self.end - 3 * codons:self.end], -1)
+
+    def __repr__(self):
+        return f"Orf(frame={self.frame:+d}, start={self.start}, end={self.end})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Orf):
+            return NotImplemented
+        return (self.frame, self.start, self.end) == (other.frame, other.start, other.end)
+
+
+def iter_orfs(strand, min_codons=ORF_MIN_CODONS, chunk_size=TRANSLATE_CHUNK):
+    """Yield ``(bases done, [Orf, ...])`` chunk by chunk, over all six frames.
+
+    A forward ORF runs from the first ATG after a stop to the next stop in
+    the same frame; a reverse one from the last reverse-strand ATG before
+    a stop, reading backwards, to the stop before it.  ORFs without a stop
+    codon before the strand ends are not reported.  Codons over unknown
+    bases neither start nor stop an ORF.  Only codon positions and
+    per-frame state are kept between chunks, not the translation.
+    """
+    _require_numpy("iter_orfs")
+    _, kinds_table = _tables()
+    length = len(strand)
+    # Per frame (codon position mod 3): last stop and the start codon pending
+    last_stop = [-1, -1, -1]          # forward; -1: the strand start
+    open_start = [None, None, None]   # first ATG after last_stop
+    rc_stop = [None, None, None]      # reverse; None: no stop seen yet
+    rc_start = [None, None, None]     # last reverse ATG after rc_stop
+
+    def found(frame, starts, ends):
+        keep = (ends - starts) // 3 - 1 >= min_codons
+        if frame > 0:
+            return [Orf(frame, s, e) for s, e in zip(starts[keep].tolist(), ends[keep].tolist())]
+        return [Orf(-((length - e) % 3 + 1), s, e)
+                for s, e in zip(starts[keep].tolist(), ends[keep].tolist())]
+
+    carry = np.zeros(0, dtype=np.uint8)
+    for offset in range(0, length, chunk_size):
+        chunk = strand[offset:offset + chunk_size]
+        codes = np.concatenate((carry, _strand_codes(chunk)))
+        carry = codes[-2:]
+        kinds = np.take(kinds_table, codon_keys(codes))
+        events = np.flatnonzero(kinds != 0)
+        positions = events + (offset - (len(codes) - len(chunk)))
+        # Group the start and stop codons by frame and kind, each group in order
+        group = (positions % 3).astype(np.uint8) * 4 + (kinds[events] - 1)
+        order = np.argsort(group, kind="stable")
+        groups = np.split(positions[order], np.cumsum(np.bincount(group, minlength=12))[:-1])
+
+        orfs = []
+        for f in range(3):
+            # Forward strand: ATG ... stop
+            starts, stops = groups[4 * f + _START - 1], groups[4 * f + _STOP - 1]
+            if open_start[f] is not None:
+                starts = np.concatenate(([open_start[f]], starts))
+            if len(stops):
+                previous = np.concatenate(([last_stop[f]], stops[:-1]))
+                first = np.searchsorted(starts, previous, side="right")
+                ok = first < len(starts)
+                begin = starts[np.minimum(first, len(starts) - 1)] if len(starts) else first
+                ok &= begin < stops
+                orfs += found(f + 1, begin[ok], stops[ok] + 3)
+                last_stop[f] = int(stops[-1])
+                after = np.searchsorted(starts, last_stop[f], side="right")
+                open_start[f] = int(starts[after]) if after < len(starts) else None
+            elif len(starts):
+                open_start[f] = int(starts[0])
+
+            # Reverse strand, scanned backwards: stop ... (reverse) ATG
+            starts, stops = groups[4 * f + _RC_START - 1], groups[4 * f + _RC_STOP - 1]
+            if rc_start[f] is not None:
+                starts = np.concatenate(([rc_start[f]], starts))
+            if len(stops):
+                below = -1 if rc_stop[f] is None else rc_stop[f]
+                previous = np.concatenate(([below], stops[:-1]))
+                last = np.searchsorted(starts, stops, side="left") - 1
+                ok = last >= 0
+                begin = starts[np.maximum(last, 0)] if len(starts) else last
+                ok &= begin > previous
+                ok[0] &= rc_stop[f] is not None
+                orfs += found(-1, previous[ok], begin[ok] + 3)
+                rc_stop[f] = int(stops[-1])
+                rc_start[f] = int(starts[-1]) if len(starts) and starts[-1] > rc_stop[f] else None
+            elif len(starts):
+                rc_start[f] = int(starts[-1])
+        yield min(offset + chunk_size, length), orfs
+
+    # Reverse ORFs whose start codon came after the strand's last stop
+    orfs = []
+    for f in range(3):
+        if rc_stop[f] is not None and rc_start[f] is not None:
+            orfs += found(-1, np.array([rc_stop[f]]), np.array([rc_start[f] + 3]))
+    if orfs:
+        yield length, orfs
+
+
+def find_orfs(strand, min_codons=ORF_MIN_CODONS, chunk_size=TRANSLATE_CHUNK):
+    """All ORFs of at least *min_codons* amino acids, sorted by position."""
+    orfs = [orf for _, found in iter_orfs(strand, min_codons, chunk_size) for orf in found]
+    return sorted(orfs, key=lambda orf: (orf.start, orf.frame))
@@ -0,0 +1,558 @@
+"""The pygame + OpenGL 3-D helix viewer.
+
+Importing this module loads PyOpenGL, pygame and NumPy, so the GUI only
+imports it (through ``dna_api_simulation.launch_opengl_helix``) in the
+process that opens the viewer window.
+"""
+
+import cProfile
+import json
+import os
+import time
+from array import array
+from collections import OrderedDict, deque
+
+from OpenGL.GL import *
+from OpenGL.GLU import *
+import pygame
+from pygame.locals import *
+import numpy as np
+
+from dna_geometry import (LOD_BLOCK_SIZE, LOD_COARSE, LOD_FULL_PIXELS, LOD_FULL,
+                          block_bounds, build_helix_impostors, build_helix_mesh,
+                          helix_geometry, helix_height, impostor_colors, plan_frame)
+from dna_mutation import MutableStrand, dirty_ranges
+
+# Set to a file path to record a session profile: ``*.json`` gets frame-time
+# percentiles per stage, anything else a cProfile dump (``*.prof``)
+PROFILE_ENV = "DNA_VIEWER_PROFILE"
+
+
+def _percentile(ordered, q):
+    """Nearest-rank percentile *q* (0-100) of an already sorted sequence."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+class FrameTimer:
+    """Per-stage frame times: a rolling window for the HUD, all frames for the dump.
+
+    Stages are timed with :meth:`add`; :meth:`end_frame` closes the frame,
+    whose total is the wall time since the previous one (what FPS measures,
+    including the frame-rate limiter's sleep).
+    """
+
+    STAGES = ("events", "geometry", "draw", "flip")
+    WINDOW = 240  # frames in the rolling percentiles (4 s at 60 FPS)
+
+    def __init__(self):
+        names = self.STAGES + ("frame",)
+        self.recent = {name: deque(maxlen=self.WINDOW) for name in names}
+        self.session = {name: array("d") for name in names}
+        self.current = dict.fromkeys(self.STAGES, 0.0)
+        self.started = self._frame_start = time.perf_counter()
+
+    def add(self, stage, seconds):
+        self.current[stage] += seconds
+
+    def end_frame(self):
+        now = time.perf_counter()
+        self.current["frame"] = now - self._frame_start
+        self._frame_start = now
+        for name, seconds in self.current.items():
+            self.recent[name].append(seconds)
+            self.session[name].append(seconds)
+        self.current = dict.fromkeys(self.STAGES, 0.0)
+
+    @property
+    def frames(self):
+        return len(self.session["frame"])
+
+    def percentiles(self, stage, session=False):
+        """``(p50, p95, p99)`` of *stage* in milliseconds."""
+        ordered = sorted(self.session[stage] if session else self.recent[stage])
+        return tuple(_percentile(ordered, q) * 1e3 for q in (50, 95, 99))
+
+    def fps(self):
+        recent = self.recent["frame"]
+        total = sum(recent)
+        return len(recent) / total if total else 0.0
+
+    def hud_lines(self):
+        lines = [f"{self.fps():.1f} FPS",
+                 f"{'ms':9} {'p50':>6} {'p95':>6} {'p99':>6}"]
+        for stage in ("frame",) + self.STAGES:
+            p50, p95, p99 = self.percentiles(stage)
+            lines.append(f"{stage:9} {p50:6.2f} {p95:6.2f} {p99:6.2f}")
+        return lines
+
+    def summary(self):
+        """Session statistics, as written to a ``.json`` profile."""
+        elapsed = time.perf_counter() - self.started
+        stages = {}
+        for name, samples in self.session.items():
+            p50, p95, p99 = self.percentiles(name, session=True)
+            stages[name] = {
+                "mean_ms": sum(samples) / len(samples) * 1e3 if samples else 0.0,
+                "p50_ms": p50, "p95_ms": p95, "p99_ms": p99,
+                "max_ms": max(samples, default=0.0) * 1e3,
+            }
+        return {"frames": self.frames, "seconds": elapsed,
+                "fps": self.frames / elapsed if elapsed else 0.0, "stages": stages}
+
+
+class _Hud:
+    """Frame-time overlay drawn in window coordinates with glDrawPixels."""
+
+    REFRESH_S = 0.25  # re-render the text at most this often
+
+    def __init__(self):
+        pygame.font.init()
+        self.font = pygame.font.SysFont("monospace", 14)
+        self.pixels = None
+        self.size = (0, 0)
+        self.updated = 0.0
+
+    def _render_text(self, lines):
+        rendered = [self.font.render(line, True, (230, 230, 230)) for line in lines]
+        width = max(r.get_width() for r in rendered) + 12
+        height = sum(r.get_height() for r in rendered) + 8
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 170))
+        y = 4
+        for r in rendered:
+            surface.blit(r, (6, y))
+            y += r.get_height()
+        self.pixels = pygame.image.tostring(surface, "RGBA", True)
+        self.size = (width, height)
+
+    def draw(self, lines, screen_h):
+        """Draw the overlay; *lines* is called for the text when it is due a refresh."""
+        now = time.perf_counter()
+        if self.pixels is None or now - self.updated >= self.REFRESH_S:
+            self._render_text(lines())
+            self.updated = now
+        width, height = self.size
+        glPushAttrib(GL_ENABLE_BIT)
+        glDisable(GL_LIGHTING)
+        glDisable(GL_DEPTH_TEST)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glWindowPos2i(8, max(0, screen_h - height - 8))
+        glDrawPixels(width, height, GL_RGBA, GL_UNSIGNED_BYTE, self.pixels)
+        glPopAttrib()
+
+
+class _GLBuffers:
+    """Static vertex arrays uploaded once to GPU buffers.
+
+    *arrays* maps ``positions`` and ``colors`` (and optionally ``normals``
+    and ``indices``) to NumPy arrays from ``dna_geometry``.
+    """
+
+    def __init__(self, arrays):
+        self.index_count = len(arrays["indices"]) if "indices" in arrays else 0
+        self.buffers = {}
+        for name, data in arrays.items():
+            target = GL_ELEMENT_ARRAY_BUFFER if name == "indices" else GL_ARRAY_BUFFER
+            buf = glGenBuffers(1)
+            glBindBuffer(target, buf)
+            glBufferData(target, data.nbytes, data, GL_STATIC_DRAW)
+            glBindBuffer(target, 0)
+            self.buffers[name] = buf
+
+    def bind(self, positions="positions", colors="colors"):
+        """Point the vertex, colour (and normal/index) arrays at these buffers."""
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffers[positions])
+        glVertexPointer(3, GL_FLOAT, 0, None)
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffers[colors])
+        glColorPointer(3, GL_FLOAT, 0, None)
+        if "normals" in self.buffers:
+            glEnableClientState(GL_NORMAL_ARRAY)
+            glBindBuffer(GL_ARRAY_BUFFER, self.buffers["normals"])
+            glNormalPointer(GL_FLOAT, 0, None)
+        else:
+            glDisableClientState(GL_NORMAL_ARRAY)
+        if "indices" in self.buffers:
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.buffers["indices"])
+
+    def delete(self):
+        glDeleteBuffers(len(self.buffers), list(self.buffers.values()))
+        self.buffers = {}
+
+
+def _block_runs(blocks, sizes):
+    """Group sorted block numbers into ``(first, count, size)`` runs."""
+    runs = []
+    for block, size in zip(blocks, sizes):
+        if runs and runs[-1][0] + runs[-1][1] == block and runs[-1][2] == size:
+            runs[-1][1] += 1
+        else:
+            runs.append([block, 1, size])
+    return runs
+
+
+class _HelixScene:
+    """The helix drawn block by block with frustum culling and level of detail.
+
+    Blocks of ``LOD_BLOCK_SIZE`` base pairs outside the view are skipped.
+    Near blocks get full or coarse meshes, built on demand and kept in a
+    small LRU of GPU buffers.  Far blocks are drawn as points and lines from
+    one buffer uploaded up front, so a long strand never needs every
+    sphere in memory at once.
+
+    The impostor buffers may hold *capacity* pairs, more than the strand,
+    so that edits (:meth:`apply_edits`) can grow it without a rebuild.
+    """
+
+    MAX_MESH_BLOCKS = 96         # mesh blocks drawn per frame, nearest first
+    MESH_CACHE_SIZE = 128        # block meshes kept on the GPU
+    MAX_BUILDS_PER_FRAME = 6     # new block meshes baked per frame
+    GROWTH_HEADROOM = 8          # edited strands get room for length / 8 more pairs
+
+    def __init__(self, strand1, strand2, capacity=None):
+        self.strand1 = strand1
+        self.strand2 = strand2
+        self.length = len(strand1)
+        self.capacity = max(capacity or 0, self.length)
+        self.height = helix_height(self.length)
+        self.far = _far_plane(self.height)
+        self.geometry = helix_geometry(self.capacity)
+        self.centres, self.radii = block_bounds(self.length, LOD_BLOCK_SIZE)
+        self.impostors = _GLBuffers(build_helix_impostors(strand1, strand2, self.geometry))
+        self.meshes = OrderedDict()  # (block, level) -> _GLBuffers
+        self.built = 0               # block meshes baked so far
+
+    def _block_mesh(self, block, level, may_build):
+        """Cached mesh for *block*, preferring *level*; None if not available."""
+        for key in ((block, level), (block, LOD_COARSE), (block, LOD_FULL)):
+            if key in self.meshes:
+                if key[1] == level or not may_build:
+                    self.meshes.move_to_end(key)
+                    return self.meshes[key]
+        if not may_build:
+            return None
+
+        self.built += 1
+        start = block * LOD_BLOCK_SIZE
+        arrays = build_helix_mesh(self.strand1, self.strand2, self.geometry,
+                                  start, min(start + LOD_BLOCK_SIZE, self.length), level)
+        self.meshes[(block, level)] = mesh = _GLBuffers(arrays)
+        while len(self.meshes) > self.MESH_CACHE_SIZE:
+            self.meshes.popitem(last=False)[1].delete()
+        return mesh
+
+    def draw(self, timer=None):
+        """Draw the visible blocks; with *timer*, split the time into geometry and draw."""
+        started = time.perf_counter()
+        if not self.length:
+            return
+        modelview = np.asarray(glGetFloatv(GL_MODELVIEW_MATRIX), dtype=np.float64).T
+        projection = np.asarray(glGetFloatv(GL_PROJECTION_MATRIX), dtype=np.float64).T
+        viewport_h = glGetIntegerv(GL_VIEWPORT)[3]
+        # Nearest mesh blocks first; the rest fall back to impostors
+        planned = time.perf_counter()
+        mesh_blocks, impostor, levels, pixels = plan_frame(
+            self.centres, self.radii, modelview, projection, viewport_h,
+            self.MAX_MESH_BLOCKS)
+        geometry = time.perf_counter() - planned
+
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+
+        builds = 0
+        for block in mesh_blocks.tolist():
+            built = self.built
+            building = time.perf_counter()
+            mesh = self._block_mesh(block, int(levels[block]),
+                                    builds < self.MAX_BUILDS_PER_FRAME)
+            if self.built > built:  # (the cache may have evicted one meanwhile)
+                builds += 1
+                geometry += time.perf_counter() - building
+            if mesh is None:  # not built yet; draw it cheaply this frame
+                impostor[block] = True
+                continue
+            mesh.bind()
+            glDrawElements(GL_TRIANGLES, mesh.index_count, GL_UNSIGNED_INT, None)
+
+        far = np.flatnonzero(impostor)
+        if len(far):
+            glDisable(GL_LIGHTING)
+            sizes = np.clip(np.rint(pixels[far]), 1, LOD_FULL_PIXELS).astype(int)
+            runs = _block_runs(far.tolist(), sizes.tolist())
+            self.impostors.bind("point_positions", "point_colors")
+            for first, count, size in runs:
+                first_bp = first * LOD_BLOCK_SIZE
+                n_bp = min(count * LOD_BLOCK_SIZE, self.length - first_bp)
+                glPointSize(size)
+                glDrawArrays(GL_POINTS, 2 * first_bp, 2 * n_bp)
+            self.impostors.bind("line_positions", "line_colors")
+            for first, count, _ in runs:
+                first_bp = first * LOD_BLOCK_SIZE
+                n_bp = min(count * LOD_BLOCK_SIZE, self.length - first_bp)
+                # The last pair has no backbone link to a next pair
+                last = first_bp + n_bp == self.length
+                glDrawArrays(GL_LINES, 6 * first_bp, 6 * n_bp - 4 * last)
+            glEnable(GL_LIGHTING)
+
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+        if timer is not None:
+            timer.add("geometry", geometry)
+            timer.add("draw", time.perf_counter() - started - geometry)
+
+    def apply_edits(self, edits):
+        """Replay ``dna_mutation`` edits, redoing only what they touched.
+
+        Point colours of the changed ranges are re-uploaded and the meshes
+        of their blocks dropped; a change of length also moves the far clip
+        plane.  Returns the scene to draw from now on: a new one when the
+        strand outgrows the buffers (or on the first edit of a strand that
+        was not mutable yet).
+        """
+        strand = self.strand1
+        if not isinstance(strand, MutableStrand) or \
+                len(strand) + sum(len(i) - r for _, r, i in edits) > self.capacity:
+            if not isinstance(strand, MutableStrand):
+                strand = MutableStrand(strand)
+            strand.apply(edits)
+            strand.take_edits()
+            self.delete()
+            length = len(strand)
+            scene = _HelixScene(strand, strand.complement(),
+                                length + max(length // self.GROWTH_HEADROOM, LOD_BLOCK_SIZE))
+            _set_projection(scene.far)
+            return scene
+
+        old_length = self.length
+        strand.apply(edits)
+        strand.take_edits()
+        self.length = len(strand)
+        stale = set()
+        if self.length != old_length:
+            self.height = helix_height(self.length)
+            self.far = _far_plane(self.height)
+            _set_projection(self.far)
+            self.centres, self.radii = block_bounds(self.length, LOD_BLOCK_SIZE)
+            # The last block lost or gained its final backbone link
+            stale.update({max(old_length - 1, 0) // LOD_BLOCK_SIZE,
+                          max(self.length - 1, 0) // LOD_BLOCK_SIZE})
+        glBindBuffer(GL_ARRAY_BUFFER, self.impostors.buffers["point_colors"])
+        for start, stop in dirty_ranges(edits, self.length):
+            colors = impostor_colors(self.strand1, self.strand2, start, stop)
+            glBufferSubData(GL_ARRAY_BUFFER, start * 2 * 3 * 4, colors.nbytes, colors)
+            stale.update(range(start // LOD_BLOCK_SIZE, (stop - 1) // LOD_BLOCK_SIZE + 1))
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        for key in [key for key in self.meshes if key[0] in stale]:
+            self.meshes.pop(key).delete()
+        return self
+
+    def delete(self):
+        for mesh in self.meshes.values():
+            mesh.delete()
+        self.meshes.clear()
+        self.impostors.delete()
+
+
+def _render_helix(st, timer=None):
+    """Render the 3-D DNA helix (called each frame).
+
+    The geometry lives in ``st["scene"]``; a frame only sets the model-view
+    rotation and lets the scene pick which blocks to draw and how finely.
+    """
+    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+    glLoadIdentity()
+    glTranslatef(0.0, 0.0, st["zoom"])
+    glRotatef(st["rotation_x"], 1, 0, 0)
+    glRotatef(st["rotation_y"], 0, 1, 0)
+
+    # Centre the helix vertically
+    scene = st["scene"]
+    glTranslatef(0, -scene.height * 0.5, 0)
+    scene.draw(timer)
+
+
+def _zoom_step(zoom):
+    """Zoom increment that stays usable from close-ups to very long helices."""
+    return max(2.0, abs(zoom) * 0.05)
+
+
+def _far_plane(height):
+    """Far clip plane deep enough to zoom out over a helix of *height*."""
+    return 200.0 + 3 * height
+
+
+def _set_projection(far):
+    """Rebuild the perspective projection for the current viewport."""
+    _, _, w, h = glGetIntegerv(GL_VIEWPORT)
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    gluPerspective(45, w / max(h, 1), 0.5, far)
+    glMatrixMode(GL_MODELVIEW)
+
+
+def _setup_viewport(w, h, far=200.0):
+    """Configure the OpenGL viewport and projection."""
+    glViewport(0, 0, w, max(h, 1))
+    _set_projection(far)
+
+
+def _scene_line(scene):
+    return f"{scene.length:,} bp   {len(scene.meshes)} meshes cached   {scene.built} built"
+
+
+def _write_profile(path, timer, profiler):
+    if profiler is not None:
+        profiler.dump_stats(path)
+    else:
+        with open(path, "w") as f:
+            json.dump(timer.summary(), f, indent=2)
+    p50, p95, p99 = timer.percentiles("frame", session=True)
+    print(f"Viewer profile written to {path}: {timer.frames} frames, "
+          f"frame time p50 {p50:.1f} / p95 {p95:.1f} / p99 {p99:.1f} ms")
+
+
+def launch_opengl_helix(strand1, strand2, poll=None, profile=None):
+    """Open a pygame + OpenGL window showing a 3-D rotating DNA helix.
+
+    *poll*, if given, is called once per frame and returns a list of
+    commands: ``("show", strand1, strand2)`` swaps the strands in place,
+    ``("edit", edits)`` applies ``dna_mutation`` edits and ``("close",)``
+    closes the window (see ``dna_viewer_process``).  F3 toggles a frame-time
+    overlay.  *profile* (default: ``$DNA_VIEWER_PROFILE``) is a file the
+    session profile is written to on exit, see ``PROFILE_ENV``.
+    """
+    st = {
+        "strand1": strand1,
+        "strand2": strand2,
+        "rotation_y": 0.0,
+        "rotation_x": 15.0,
+        "zoom": -60.0,
+        "auto_rotate": True,
+        "dragging": False,
+        "mouse_last": None,
+        "hud": False,
+    }
+
+    pygame.init()
+    screen_w, screen_h = 900, 700
+    pygame.display.set_mode((screen_w, screen_h), DOUBLEBUF | OPENGL | RESIZABLE)
+    pygame.display.set_caption("DNA Double Helix - OpenGL")
+
+    glClearColor(0.08, 0.08, 0.12, 1.0)
+    glEnable(GL_DEPTH_TEST)
+
+    # Basic lighting
+    glEnable(GL_LIGHTING)
+    glEnable(GL_LIGHT0)
+    glEnable(GL_COLOR_MATERIAL)
+    glColorMaterial(GL_FRONT_AND_BACK, GL_AMBIENT_AND_DIFFUSE)
+    glLightfv(GL_LIGHT0, GL_POSITION, [5.0, 10.0, 15.0, 1.0])
+    glLightfv(GL_LIGHT0, GL_DIFFUSE, [1.0, 1.0, 1.0, 1.0])
+    glLightfv(GL_LIGHT0, GL_AMBIENT, [0.3, 0.3, 0.3, 1.0])
+
+    # Upload the far-field geometry once; frames only change the rotation
+    st["scene"] = _HelixScene(strand1, strand2)
+    _setup_viewport(screen_w, screen_h, st["scene"].far)
+
+    profile = profile or os.environ.get(PROFILE_ENV)
+    profiler = None
+    if profile and not profile.endswith(".json"):
+        profiler = cProfile.Profile()
+        profiler.enable()
+    timer = FrameTimer()
+    hud = None
+
+    clock = pygame.time.Clock()
+    running = True
+
+    while running:
+        frame_start = time.perf_counter()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+            elif event.type == VIDEORESIZE:
+                screen_w, screen_h = event.w, event.h
+                pygame.display.set_mode((screen_w, screen_h), DOUBLEBUF | OPENGL | RESIZABLE)
+                _setup_viewport(screen_w, screen_h, st["scene"].far)
+
+            elif event.type == KEYDOWN:
+                if event.key == K_ESCAPE:
+                    running = False
+                elif event.key == K_SPACE:
+                    st["auto_rotate"] = not st["auto_rotate"]
+                elif event.key == K_F3:
+                    st["hud"] = not st["hud"]
+                elif event.key in (K_PLUS, K_EQUALS):
+                    st["zoom"] += _zoom_step(st["zoom"])
+                elif event.key == K_MINUS:
+                    st["zoom"] -= _zoom_step(st["zoom"])
+
+            elif event.type == MOUSEBUTTONDOWN:
+                if event.button == 1:  # left click
+                    st["dragging"] = True
+                    st["mouse_last"] = event.pos
+                elif event.button == 4:  # scroll up
+                    st["zoom"] += _zoom_step(st["zoom"])
+                elif event.button == 5:  # scroll down
+                    st["zoom"] -= _zoom_step(st["zoom"])
+
+            elif event.type == MOUSEBUTTONUP:
+                if event.button == 1:
+                    st["dragging"] = False
+
+            elif event.type == MOUSEMOTION:
+                if st["dragging"] and st["mouse_last"]:
+                    lx, ly = st["mouse_last"]
+                    mx, my = event.pos
+                    st["rotation_y"] += (mx - lx) * 0.5
+                    st["rotation_x"] += (my - ly) * 0.5
+                    st["mouse_last"] = event.pos
+                    st["auto_rotate"] = False
+
+        commands = poll() if poll is not None else []
+        timer.add("events", time.perf_counter() - frame_start)
+        for command in commands:
+            rebuilding = time.perf_counter()
+            if command[0] == "close":
+                running = False
+            elif command[0] == "show":
+                # New strands: rebuild the scene, keep the window and the camera
+                st["scene"].delete()
+                st["strand1"], st["strand2"] = command[1:]
+                st["scene"] = _HelixScene(st["strand1"], st["strand2"])
+                _setup_viewport(screen_w, screen_h, st["scene"].far)
+            elif command[0] == "edit":
+                st["scene"] = st["scene"].apply_edits(command[1])
+                st["strand1"], st["strand2"] = st["scene"].strand1, st["scene"].strand2
+            timer.add("geometry", time.perf_counter() - rebuilding)
+
+        if st["auto_rotate"]:
+            st["rotation_y"] += 0.4
+
+        _render_helix(st, timer)
+        if st["hud"]:
+            drawing = time.perf_counter()
+            hud = hud or _Hud()
+            hud.draw(lambda: timer.hud_lines() + [_scene_line(st["scene"])], screen_h)
+            timer.add("draw", time.perf_counter() - drawing)
+
+        flipping = time.perf_counter()
+        pygame.display.flip()
+        timer.add("flip", time.perf_counter() - flipping)
+        clock.tick(60)
+        timer.end_frame()
+
+    if profiler is not None:
+        profiler.disable()
+    st["scene"].delete()
+    if profile:
+        _write_profile(profile, timer, profiler)
+    pygame.quit()
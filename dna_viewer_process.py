@@ -0,0 +1,174 @@
+"""One long-lived 3-D viewer process, fed strands through shared memory.
+
+The GUI keeps a single :class:`ViewerProcess`.  Showing a strand copies
+its packed bytes (2 bits per base) into a fresh
+``multiprocessing.shared_memory`` segment and sends the segment's name
+over a control pipe; the viewer attaches, rebuilds its scene in place and
+keeps its pygame window and GL context.  Only the primary strand is
+published; the viewer derives the complement itself.  Later mutations
+(``dna_mutation``) are sent as edits, not as a new strand.
+
+Commands on the pipe::
+
+    ("show", segment name, length, "packed" | "text")
+    ("edit", [(start, removed, inserted), ...])
+    ("close",)
+"""
+
+import multiprocessing
+from multiprocessing import shared_memory
+
+from dna_sequence import PackedStrand, as_packed, get_complement_strand
+
+
+def _encode(strand):
+    """Return ``(payload, kind)``: packed bytes, or ASCII text if it holds N etc."""
+    if not isinstance(strand, PackedStrand):
+        try:
+            strand = as_packed(str(strand))
+        except ValueError:
+            return str(strand).encode("ascii"), "text"
+    return strand.data, "packed"
+
+
+def _decode(name, length, kind):
+    """Viewer side: read a published strand; return ``(strand, complement)``."""
+    segment = shared_memory.SharedMemory(name=name)
+    try:
+        size = (length + 3) // 4 if kind == "packed" else length
+        with segment.buf[:size] as view:
+            data = bytes(view)
+    finally:
+        segment.close()
+    if kind == "packed":
+        strand = PackedStrand(data, length)
+        return strand, strand.complement()
+    strand = data.decode("ascii")
+    return strand, get_complement_strand(strand)
+
+
+def _next_commands(conn):
+    """Viewer side: drain the pipe into the list of commands to act on.
+
+    A close (or the GUI going away) wins.  Otherwise only the newest strand
+    is loaded, followed by the edits sent after it, merged into one batch.
+    The strand's segment may already be gone if an even newer one was
+    published meanwhile, in which case that one arrives on the next poll.
+    """
+    commands = []
+    try:
+        while conn.poll():
+            message = conn.recv()
+            if message[0] == "close":
+                return [("close",)]
+            if message[0] == "show":
+                commands = [message]
+            elif commands and commands[-1][0] == "edit":
+                commands[-1] = ("edit", commands[-1][1] + message[1])
+            else:
+                commands.append(message)
+    except (EOFError, OSError):
+        return [("close",)]
+    if commands and commands[0][0] == "show":
+        try:
+            commands[0] = ("show",) + _decode(*commands[0][1:])
+        except FileNotFoundError:
+            return []  # superseded; its edits do not apply to the next strand
+    return commands
+
+
+def _viewer_main(conn, gui_end):
+    """Entry point of the viewer process."""
+    gui_end.close()  # so a vanished GUI shows up as EOF on the pipe
+    import dna_viewer
+    commands = []
+    while not commands or commands[0][0] != "show":
+        if not conn.poll(None):
+            return
+        commands = _next_commands(conn)
+        if commands and commands[0][0] == "close":
+            return
+    backlog = commands[1:]  # edits that arrived with the first strand
+
+    def poll():
+        nonlocal backlog
+        commands, backlog = backlog + _next_commands(conn), []
+        return commands
+
+    dna_viewer.launch_opengl_helix(*commands[0][1:], poll=poll)
+
+
+class ViewerProcess:
+    """GUI side handle on the (single) viewer process, started on demand."""
+
+    def __init__(self):
+        self._process = None
+        self._conn = None
+        self._segment = None
+
+    @property
+    def alive(self):
+        return self._process is not None and self._process.is_alive()
+
+    def _start(self):
+        viewer_end, gui_end = multiprocessing.Pipe(duplex=False)
+        # The child imports only the viewer, never tkinter
+        self._process = multiprocessing.Process(target=_viewer_main,
+                                                args=(viewer_end, gui_end),
+                                                name="dna-viewer", daemon=True)
+        self._process.start()
+        viewer_end.close()
+        self._conn = gui_end
+
+    def show(self, strand):
+        """Display *strand* (str, PackedStrand or record), starting the viewer if needed."""
+        payload, kind = _encode(strand)
+        segment = shared_memory.SharedMemory(create=True, size=max(len(payload), 1))
+        segment.buf[:len(payload)] = payload
+        message = ("show", segment.name, len(strand), kind)
+        if not self.alive:
+            self._stop()
+            self._start()
+        try:
+            self._conn.send(message)
+        except OSError:  # the window was closed between the check and the send
+            self._stop()
+            self._start()
+            self._conn.send(message)
+        # The viewer copies a segment as soon as it reads it; the previous
+        # one is no longer needed (or was superseded before it was read)
+        self._release()
+        self._segment = segment
+
+    def edit(self, edits):
+        """Send ``dna_mutation`` edits of the strand on show; a no-op without a viewer."""
+        if edits and self.alive:
+            try:
+                self._conn.send(("edit", edits))
+            except OSError:
+                pass
+
+    def _release(self):
+        if self._segment is not None:
+            self._segment.close()
+            self._segment.unlink()
+            self._segment = None
+
+    def _stop(self, timeout=2.0):
+        if self._conn is not None:
+            try:
+                self._conn.send(("close",))
+            except OSError:
+                pass
+            self._conn.close()
+            self._conn = None
+        if self._process is not None:
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+
+    def close(self):
+        """Close the viewer window and free the shared memory."""
+        self._stop()
+        self._release()
@@ -0,0 +1,44 @@
+import pytest
+
+from dna_api_simulation import TextHelixView, get_text_helix, iter_text_helix
+from dna_sequence import PackedStrand, generate_dna_strand, get_complement_strand
+
+
+def _reference_text_helix(strand1, strand2, bases_per_line):
+    lines = []
+    for i in range(0, len(strand1), bases_per_line):
+        c1 = strand1[i:i + bases_per_line]
+        c2 = strand2[i:i + bases_per_line]
+        lines.append(f"Position {i:3d}–{min(i + bases_per_line - 1, len(strand1) - 1):3d}:")
+        lines.append(f"5' {c1} 3'")
+        lines.append(f"   {'|' * len(c1)}")
+        lines.append(f"3' {c2} 5'")
+        lines.append("")
+    return "\n".join(lines)
+
+
+@pytest.mark.parametrize("length", [0, 1, 49, 50, 51, 237])
+@pytest.mark.parametrize("bases_per_line", [1, 7, 50])
+def test_text_helix_matches_reference(length, bases_per_line):
+    strand1 = str(generate_dna_strand(length, seed=length))
+    strand2 = get_complement_strand(strand1)
+    expected = _reference_text_helix(strand1, strand2, bases_per_line)
+    assert get_text_helix(strand1, strand2, bases_per_line) == expected
+    packed = PackedStrand.from_str(strand1)
+    view = TextHelixView(packed, get_complement_strand(packed), bases_per_line)
+    assert str(view) == expected
+    assert "\n".join(iter_text_helix(strand1, strand2, bases_per_line)) == expected
+
+    lines = expected.split("\n")[:-1]
+    assert view.line_count == len(lines)
+    for start in range(0, len(lines) + 2, 3):
+        for stop in (start, start + 1, start + 4, start + 11, len(lines) + 5):
+            assert view.lines(start, stop) == lines[start:stop]
+
+
+def test_text_helix_blocks_index_like_a_sequence():
+    view = TextHelixView("ACGTACGTAC", "TGCATGCATG", 4)
+    assert len(view) == 3
+    assert view[-1] == view[2] == "Position   8–  9:\n5' AC 3'\n   ||\n3' TG 5'\n"
+    with pytest.raises(IndexError):
+        view[3]
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+import dna_cli
+from dna_cli import main
+
+
+@pytest.mark.parametrize("argv, message", [
+    (["generate", "-k", "99"], "argument -k: must be between 0 and"),
+    (["generate", "--top", "-1"], "argument --top: must be at least 0"),
+    (["generate", "--gc-content", "150"], "argument --gc-content: must be between 0 and 100"),
+    (["generate", "--gc-content", "-1"], "argument --gc-content: must be between 0 and 100"),
+    (["generate", "--length", "-5"], "argument --length: must be at least 0"),
+    (["generate", "--count", "-1"], "argument --count: must be at least 0"),
+    (["generate", "--count", "x"], "argument --count: invalid int value: 'x'"),
+    (["generate", "-j", "0"], "argument -j/--jobs: must be at least 1"),
+    (["compare", "--length", "-5"], "argument --length: must be at least 0"),
+    (["compare", "--divergence", "2"], "argument --divergence: must be between 0 and 1"),
+    (["compare", "--band", "-1"], "argument --band: must be at least 0"),
+    (["orfs", "--length", "-5"], "argument --length: must be at least 0"),
+    (["orfs", "--min-codons", "0"], "argument --min-codons: must be at least 1"),
+])
+def test_bad_arguments_are_usage_errors(argv, message, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(argv)
+    assert exit_info.value.code == 2
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err.startswith("usage: dna_cli " + argv[0])
+    assert message in captured.err
+
+
+def test_generate_writes_one_row_per_strand(capsys):
+    argv = ["generate", "--count", "2", "--length", "50", "--seed", "1",
+            "--gc-content", "60", "-j", "1"]
+    assert main(argv) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [row["name"] for row in rows] == ["strand_0", "strand_1"]
+    assert all(row["length"] == 50 for row in rows)
+
+
+def test_orfs_closes_the_files_it_reads(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "orf.fa"
+    path.write_text(">r1\nNNNNATGAAAAAAAAAAAATAGNNN\n")
+    opened = []
+    real_open = dna_cli.open_sequence_file
+
+    def spy(p):
+        opened.append(real_open(p))
+        return opened[-1]
+
+    monkeypatch.setattr(dna_cli, "open_sequence_file", spy)
+    assert main(["orfs", str(path), "--min-codons", "2", "--proteins"]) == 0
+    row = json.loads(capsys.readouterr().out)
+    assert (row["frame"], row["start"], row["end"], row["protein"]) == (2, 4, 22, "MKKKK")
+    assert opened and all(f._file.closed for f in opened)
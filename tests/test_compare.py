@@ -0,0 +1,118 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from dna_compare import (GAP_SCORE, MATCH_SCORE, MISMATCH_SCORE, align_batch, compare_all,
+                         hamming)
+from dna_sequence import codes_array
+
+
+def _same(x, y):
+    return x == y and x != "N"  # unknown bases never match
+
+
+def _levenshtein(a, b):
+    row = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        prev, row[0] = row[0], i
+        for j in range(1, len(b) + 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1,
+                                       prev + (0 if _same(a[i - 1], b[j - 1]) else 1))
+    return row[-1]
+
+
+def _smith_waterman(a, b):
+    best = 0
+    row = [0] * (len(b) + 1)
+    for i in range(1, len(a) + 1):
+        prev, row[0] = row[0], 0
+        for j in range(1, len(b) + 1):
+            diagonal = prev + (MATCH_SCORE if _same(a[i - 1], b[j - 1]) else MISMATCH_SCORE)
+            prev, row[j] = row[j], max(0, diagonal, row[j] + GAP_SCORE, row[j - 1] + GAP_SCORE)
+            best = max(best, row[j])
+    return best
+
+
+def _mutate(seq, rng, edits, alphabet="ACGT"):
+    seq = list(seq)
+    for _ in range(edits):
+        pos = rng.randrange(len(seq) + 1)
+        kind = rng.choice("sid")
+        if kind == "s" and pos < len(seq):
+            seq[pos] = rng.choice(alphabet)
+        elif kind == "i":
+            seq.insert(pos, rng.choice(alphabet))
+        elif seq:
+            del seq[min(pos, len(seq) - 1)]
+    return "".join(seq)
+
+
+def _random_pairs(rng, count, max_length, edits, alphabet="ACGT"):
+    pairs = []
+    for _ in range(count):
+        a = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+        pairs.append((a, _mutate(a, rng, rng.randint(0, edits), alphabet)))
+    pairs.append(("", ""))
+    pairs.append(("ACGT", ""))
+    pairs.append(("", "GG"))
+    return pairs
+
+
+def _align(pairs, band):
+    return align_batch([(codes_array(a).astype(np.int8), codes_array(b).astype(np.int8))
+                        for a, b in pairs], band)
+
+
+@pytest.mark.parametrize("alphabet", ["ACGT", "ACGTN"])
+def test_full_band_matches_reference_dp(alphabet):
+    rng = random.Random(len(alphabet))
+    pairs = _random_pairs(rng, 40, 40, 15, alphabet)
+    pairs.append(("NNNN", "NNNN"))
+    edit, score = _align(pairs, band=80)
+    assert edit.tolist() == [_levenshtein(a, b) for a, b in pairs]
+    assert score.tolist() == [_smith_waterman(a, b) for a, b in pairs]
+
+
+@pytest.mark.parametrize("band", [0, 1, 3, 8])
+def test_narrow_band_is_exact_for_close_pairs_and_bounded_otherwise(band):
+    rng = random.Random(band)
+    # Unrelated pairs may need alignments outside the band
+    far = [tuple("".join(rng.choice("ACGT") for _ in range(rng.randint(0, 30)))
+                 for _ in range(2)) for _ in range(20)]
+    edit, score = _align(far, band)
+    for (a, b), e, s in zip(far, edit.tolist(), score.tolist()):
+        assert e >= _levenshtein(a, b)
+        assert s <= _smith_waterman(a, b)
+        assert e <= max(len(a), len(b))
+
+    # Substitutions only: the optimal alignment is the main diagonal
+    close = [(a, "".join(rng.choice("ACGT") if rng.random() < 0.1 else x for x in a))
+             for a, _ in _random_pairs(rng, 20, 60, 0)]
+    edit, _ = _align(close, band)
+    assert edit.tolist() == [_levenshtein(a, b) for a, b in close]
+
+
+def test_hamming_counts_unknown_bases_and_length_difference():
+    a, b = codes_array("ACGTNA"), codes_array("ACCTNAGG")
+    assert hamming(a, b) == 2 + 2
+    assert hamming(a, a) == 1
+
+
+def test_compare_all_fills_symmetric_matrices():
+    rng = random.Random(3)
+    base = "".join(rng.choice("ACGT") for _ in range(120))
+    sequences = {f"s{i}": _mutate(base, rng, i * 3) for i in range(5)}
+    result = compare_all(sequences, band=40, workers=1, batch=3)
+    names = list(sequences)
+    for i, a in enumerate(names):
+        for j, b in enumerate(names):
+            if i == j:
+                continue
+            assert result.edit[i, j] == result.edit[j, i] == _levenshtein(sequences[a],
+                                                                          sequences[b])
+            assert result.score[i, j] == _smith_waterman(sequences[a], sequences[b])
+    distances = result.distances("edit")
+    assert (np.diag(distances) == 0).all() and (distances == distances.T).all()
+    assert len(list(result.pairs())) == 10
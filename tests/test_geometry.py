@@ -0,0 +1,74 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from dna_geometry import (BACKBONE_RADIUS, BASE_COLORS_GL, BOND_RADIUS, CYLINDER_SLICES,
+                          NUCLEOTIDE_RADIUS, SPHERE_SLICES, SPHERE_STACKS, UNKNOWN_BASE_COLOR,
+                          bake_cylinders, build_helix_mesh, cylinder_mesh, helix_geometry,
+                          sphere_mesh)
+from dna_sequence import get_complement_strand
+
+SPHERE_VERTS = (SPHERE_SLICES + 1) * (SPHERE_STACKS + 1)
+CYLINDER_VERTS = 2 * (CYLINDER_SLICES + 1)
+
+
+def _distance_to_segment(points, start, end):
+    axis = end - start
+    t = np.clip((points - start) @ axis / (axis @ axis), 0.0, 1.0)
+    return np.linalg.norm(points - (start + t[:, None] * axis), axis=1)
+
+
+def test_helix_mesh_places_every_part():
+    strand1 = "ACGTNACG"
+    strand2 = get_complement_strand(strand1)
+    n = len(strand1)
+    geom = helix_geometry(n)
+    mesh = build_helix_mesh(strand1, strand2)
+    positions, normals, colors = mesh["positions"], mesh["normals"], mesh["colors"]
+    assert positions.dtype == np.float32 and mesh["indices"].dtype == np.uint32
+    assert len(positions) == 2 * n * SPHERE_VERTS + (n + 2 * (n - 1)) * CYLINDER_VERTS
+    assert normals.shape == colors.shape == positions.shape
+    assert len(mesh["indices"]) % 3 == 0
+    assert mesh["indices"].max() == len(positions) - 1
+
+    # Spheres: strand 1, then strand 2, each on its base's position and in its colour
+    spheres = positions[:2 * n * SPHERE_VERTS].reshape(2, n, SPHERE_VERTS, 3)
+    sphere_colors = colors[:2 * n * SPHERE_VERTS].reshape(2, n, SPHERE_VERTS, 3)
+    for side, (strand, centres) in enumerate([(strand1, geom.positions1),
+                                              (strand2, geom.positions2)]):
+        for i, base in enumerate(strand):
+            radii = np.linalg.norm(spheres[side, i] - centres[i], axis=1)
+            assert radii == pytest.approx(NUCLEOTIDE_RADIUS, abs=1e-5)
+            expected = BASE_COLORS_GL.get(base, UNKNOWN_BASE_COLOR)
+            assert sphere_colors[side, i] == pytest.approx(np.tile(expected, (SPHERE_VERTS, 1)))
+
+    # Cylinders: bonds across each pair, then the two backbones
+    cylinders = positions[2 * n * SPHERE_VERTS:].reshape(-1, CYLINDER_VERTS, 3)
+    segments = np.concatenate((geom.bonds, geom.backbone1, geom.backbone2))
+    radii = [BOND_RADIUS] * n + [BACKBONE_RADIUS] * (2 * (n - 1))
+    for verts, (start, end), radius in zip(cylinders, segments, radii):
+        assert _distance_to_segment(verts, start, end) == pytest.approx(radius, abs=1e-5)
+    assert np.linalg.norm(normals, axis=1) == pytest.approx(1.0, abs=1e-5)
+
+
+def test_helix_mesh_range_matches_full_mesh():
+    strand1 = "GATTACAGATTACA"
+    strand2 = get_complement_strand(strand1)
+    full = build_helix_mesh(strand1, strand2)
+    part = build_helix_mesh(strand1, strand2, start=4, stop=9)
+    assert len(part["positions"]) == 2 * 5 * SPHERE_VERTS + (5 + 2 * 5) * CYLINDER_VERTS
+    first_sphere = full["positions"][4 * SPHERE_VERTS:5 * SPHERE_VERTS]
+    assert part["positions"][:SPHERE_VERTS] == pytest.approx(first_sphere)
+    tail = build_helix_mesh(strand1, strand2, start=10)
+    assert len(tail["positions"]) == 2 * 4 * SPHERE_VERTS + (4 + 2 * 3) * CYLINDER_VERTS
+
+
+def test_unit_meshes_and_degenerate_cylinders():
+    verts, indices = sphere_mesh(8, 6)
+    assert np.linalg.norm(verts, axis=1) == pytest.approx(1.0)
+    assert len(indices) == 8 * 6 * 6
+    verts, indices = cylinder_mesh(5)
+    assert sorted(set(verts[:, 2])) == [0.0, 1.0]
+    segments = np.array([[[0.0, 0, 0], [0, 0, 0]], [[0, 0, 0], [0, 0, 2]]])
+    positions, _, _, _ = bake_cylinders(segments, 0.5, (1, 1, 1), (verts, indices))
+    assert len(positions) == 1
@@ -0,0 +1,122 @@
+import itertools
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+from dna_gui import RESIZE_DEBOUNCE_MS, DNASimulationApp
+from dna_sequence import BASES, generate_dna_strand
+
+
+class _Root:
+    """Just enough of Tk's after()/after_cancel() to drive the debounce by hand."""
+
+    def __init__(self):
+        self.jobs = {}
+        self._ids = itertools.count()
+
+    def after(self, ms, callback):
+        job = f"after#{next(self._ids)}"
+        self.jobs[job] = (ms, callback)
+        return job
+
+    def after_cancel(self, job):
+        del self.jobs[job]
+
+    def run_pending(self):
+        jobs, self.jobs = self.jobs, {}
+        for _, callback in jobs.values():
+            callback()
+
+
+class _Canvas:
+    """Records canvas items, their coordinates and options; no display needed."""
+
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+        self.items = {}
+        self.created = 0
+        self.deleted = 0
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def _create(self, kind, *coords, **options):
+        self.created += 1
+        self.items[self.created] = {"kind": kind, "coords": coords, **options}
+        return self.created
+
+    def __getattr__(self, name):
+        if name.startswith("create_"):
+            return lambda *coords, **options: self._create(name[7:], *coords, **options)
+        raise AttributeError(name)
+
+    def coords(self, item, *coords):
+        self.items[item]["coords"] = coords
+
+    def itemconfigure(self, item, **options):
+        self.items[item].update(options)
+
+    def delete(self, *items):
+        self.deleted += 1
+
+
+@pytest.fixture
+def app():
+    app = DNASimulationApp.__new__(DNASimulationApp)
+    app.root = _Root()
+    app.stats_canvas = _Canvas(800, 500)
+    app.primary_strand = ""
+    app._source = "Random Generation"
+    app._stats = None
+    app._pending = {}
+    app._build_stats_items()
+    return app
+
+
+def _item(app, *key):
+    return app.stats_canvas.items[app._stats_items[key if len(key) > 1 else key[0]]]
+
+
+def test_dashboard_items_are_built_once_and_only_moved(app):
+    canvas = app.stats_canvas
+    built = canvas.created
+    app._draw_stats()
+    assert _item(app, "placeholder")["state"] == "normal"
+    assert _item(app, "gc_arc")["state"] == "hidden"
+
+    strand = str(generate_dna_strand(1000, seed=1, gc_content=60))
+    app.primary_strand = strand
+    app._draw_stats()
+    for width, height in ((800, 500), (300, 200), (1600, 900), (5, 5)):
+        canvas.width, canvas.height = width, height
+        app._layout_stats()
+    assert canvas.created == built and canvas.deleted == 0
+
+    assert _item(app, "placeholder")["state"] == "hidden"
+    assert _item(app, "summary")["state"] == "normal"
+    gc = (strand.count("G") + strand.count("C")) / len(strand) * 100
+    assert _item(app, "gc_arc")["extent"] == pytest.approx(-3.6 * gc)
+    assert _item(app, "gc_arc")["extent"] + _item(app, "at_arc")["extent"] == pytest.approx(-360)
+    assert _item(app, "pie_text")["text"] == f"GC {gc:.1f}%\nAT {100 - gc:.1f}%"
+    tallest = max(strand.count(b) for b in BASES)
+    for base in BASES:
+        assert _item(app, "count", base)["text"] == str(strand.count(base))
+        x0, y0, x1, y1 = _item(app, "bar", base)["coords"]
+        assert (y1 - y0) == pytest.approx(strand.count(base) / tallest * 900 * 0.65)
+    assert "1000" in _item(app, "summary")["text"].replace(",", "")
+
+
+def test_resize_events_are_coalesced(app):
+    calls = []
+    for _ in range(10):
+        app._debounce("stats", lambda: calls.append("stats"))
+    app._debounce("profile", lambda: calls.append("profile"))
+    assert len(app.root.jobs) == 2
+    assert {ms for ms, _ in app.root.jobs.values()} == {RESIZE_DEBOUNCE_MS}
+    app.root.run_pending()
+    assert sorted(calls) == ["profile", "stats"]
+    assert app._pending == {}
@@ -0,0 +1,185 @@
+import json
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from dna_http import DNAApiClient, ResponseCache
+
+
+class StubServer(HTTPServer):
+    """Answers GETs from ``script(handler)`` -> (status, headers, body) and logs them."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.requests = []
+        self.script = lambda handler: (200, {}, {"path": handler.path})
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def hits(self, path):
+        return sum(1 for p, _ in self.requests if p == path)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        status, headers, payload = self.server.script(self)
+        body = b"" if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = StubServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_fetch_many_accepts_every_item_form(server, max_workers):
+    url = server.url
+    items = [f"{url}/a", (f"{url}/b", {"x": "1"}), (f"{url}/c", None, 0)]
+    with DNAApiClient(max_workers=max_workers, retries=0) as client:
+        results = client.fetch_many(items)
+    assert [r["path"] for r in results] == ["/a", "/b?x=1", "/c"]
+
+
+def test_fetch_many_single_item_with_ttl(server):
+    with DNAApiClient(retries=0) as client:
+        assert client.fetch_many([(f"{server.url}/d", None, 0)]) == [{"path": "/d"}]
+
+
+# ---- Retries ----------------------------------------------------------------
+
+def _fail_first(n, status=503):
+    def script(handler):
+        if handler.server.hits(handler.path) <= n:
+            return status, {}, {"error": status}
+        return 200, {}, {"ok": True}
+    return script
+
+
+def test_retries_until_success(server):
+    server.script = _fail_first(2)
+    with DNAApiClient(retries=3, backoff=0) as client:
+        assert client.fetch(f"{server.url}/flaky") == {"ok": True}
+    assert server.hits("/flaky") == 3
+
+
+def test_exhausted_retries_give_none(server):
+    server.script = _fail_first(100)
+    with DNAApiClient(retries=2, backoff=0) as client:
+        assert client.fetch(f"{server.url}/down") is None
+    assert server.hits("/down") == 3  # the first try and two retries
+
+
+def test_exhausted_retries_fall_back_to_stale_copy(server):
+    url = f"{server.url}/stale"
+    with DNAApiClient(retries=1, backoff=0, cache=ResponseCache(":memory:"), ttl=0) as client:
+        assert client.fetch(url) == {"path": "/stale"}
+        server.script = _fail_first(100)
+        assert client.fetch(url) == {"path": "/stale"}
+    assert server.hits("/stale") == 3
+
+
+# ---- Response cache ---------------------------------------------------------
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    import dna_http
+    clock = _Clock()
+    monkeypatch.setattr(dna_http, "time", clock)
+    return clock
+
+
+def test_fresh_entries_skip_the_network_until_the_ttl_expires(server, clock):
+    url = f"{server.url}/ttl"
+    with DNAApiClient(retries=0, cache=ResponseCache(":memory:"), ttl=60) as client:
+        assert client.fetch(url) == {"path": "/ttl"}
+        clock.now += 59
+        assert client.fetch(url) == {"path": "/ttl"}
+        assert server.hits("/ttl") == 1
+        clock.now += 2
+        assert client.fetch(url) == {"path": "/ttl"}
+    assert server.hits("/ttl") == 2
+
+
+def test_stale_entries_are_revalidated_with_the_etag(server):
+    def script(handler):
+        if handler.headers.get("If-None-Match") == '"v1"':
+            return 304, {"ETag": '"v1"'}, None
+        return 200, {"ETag": '"v1"'}, {"version": 1}
+    server.script = script
+    url = f"{server.url}/etag"
+    with DNAApiClient(retries=0, cache=ResponseCache(":memory:"), ttl=0) as client:
+        assert client.fetch(url) == {"version": 1}
+        assert client.fetch(url) == {"version": 1}
+    (_, first), (_, second) = server.requests
+    assert "If-None-Match" not in first
+    assert second["If-None-Match"] == '"v1"'
+
+
+def test_cache_evicts_least_recently_used_entries_over_budget(clock):
+    cache = ResponseCache(":memory:", max_bytes=100)
+    for key in "abc":
+        clock.now += 1
+        cache.put(key, b"x" * 40, ttl=60)
+        if key == "b":
+            clock.now += 1
+            cache.get("a")  # "a" is now used more recently than "b"
+    assert cache.get("b") is None
+    assert cache.get("a").body == b"x" * 40
+    assert cache.get("c").body == b"x" * 40
+
+
+def test_offline_serves_any_cached_copy_and_nothing_else(server):
+    cache = ResponseCache(":memory:")
+    url = f"{server.url}/offline"
+    with DNAApiClient(retries=0, cache=cache, ttl=0) as client:
+        client.fetch(url)
+        client.offline = True
+        assert client.fetch(url) == {"path": "/offline"}  # stale, but offline
+        assert client.fetch(f"{server.url}/never") is None
+    assert server.hits("/offline") == 1
+    assert server.hits("/never") == 0
+
+
+class _LockedCache(ResponseCache):
+    """A cache whose database another process keeps locked."""
+
+    def get(self, key):
+        raise sqlite3.OperationalError("database is locked")
+
+    def put(self, *args):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_cache_errors_fall_back_to_the_network(server):
+    with DNAApiClient(retries=0, cache=_LockedCache(":memory:")) as client:
+        assert client.fetch(f"{server.url}/locked") == {"path": "/locked"}
+        assert client.fetch(f"{server.url}/locked") == {"path": "/locked"}
+    assert server.hits("/locked") == 2
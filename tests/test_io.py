@@ -0,0 +1,146 @@
+import pickle
+import random
+import re
+import struct
+
+import pytest
+
+from dna_io import TWOBIT_SIGNATURE, FastaFile, TwoBitFile, export_strand, open_sequence_file
+
+_TWOBIT_CODES = {"T": 0, "C": 1, "A": 2, "G": 3, "N": 0}
+_N_RUNS = re.compile("N+")
+
+
+@pytest.fixture
+def fasta(tmp_path):
+    path = tmp_path / "records.fa"
+    path.write_text(">empty\n>one\nACGT\nAC\n>last\n")
+    return str(path)
+
+
+def test_empty_records_read_as_empty(fasta):
+    empty, one, last = open_sequence_file(fasta).records
+    for record in (empty, last):
+        assert len(record) == 0
+        assert str(record) == ""
+        assert len(record.packed()) == 0
+        assert str(record.complement()) == ""
+        assert list(record.iter_chunks()) == []
+    assert str(one) == "ACGTAC"
+    assert str(one.packed()) == "ACGTAC"
+
+
+def _random_bases(n, seed, alphabet="ACGT"):
+    rng = random.Random(seed)
+    return "".join(rng.choice(alphabet) for _ in range(n))
+
+
+def _assert_reads_like(record, expected):
+    assert len(record) == len(expected)
+    assert str(record) == expected
+    rng = random.Random(len(expected))
+    for _ in range(200):
+        start, stop = sorted(rng.randint(-5, len(expected) + 5) for _ in range(2))
+        assert record[start:stop] == expected[start:stop]
+    if expected:
+        assert record[-1] == expected[-1]
+    assert "".join(record.iter_chunks(7)) == expected
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+@pytest.mark.parametrize("width", [1, 10, 61])
+def test_fasta_layouts(tmp_path, newline, width):
+    seqs = [_random_bases(n, n) for n in (0, 1, 59, 60, 61, 250)]
+    lines = []
+    for i, seq in enumerate(seqs):
+        lines.append(f">seq{i} description of {i}")
+        lines.extend(seq[j:j + width].lower() if i % 2 else seq[j:j + width]
+                     for j in range(0, len(seq), width))
+    path = tmp_path / "layout.fasta"
+    path.write_bytes(newline.join(lines).encode() + b"\n")
+    with open_sequence_file(str(path)) as seq_file:
+        assert isinstance(seq_file, FastaFile)
+        records = seq_file.records
+        assert [r.name for r in records] == [f"seq{i}" for i in range(len(seqs))]
+        assert records[2].description == "description of 2"
+        for record, seq in zip(records, seqs):
+            _assert_reads_like(record, seq)
+            _assert_reads_like(record.complement(), str(record.packed().complement()))
+
+
+def test_fasta_ragged_lines(tmp_path, capsys):
+    seq = _random_bases(300, 7, "ACGTN")
+    widths = [60, 13, 80, 1, 146]
+    lines, pos = [">ragged"], 0
+    for w in widths:
+        lines.append(seq[pos:pos + w].lower())
+        pos += w
+    path = tmp_path / "ragged.fa"
+    path.write_text("\r\n".join(lines) + "\r\n\r\n")
+    with open_sequence_file(str(path)) as seq_file:
+        (record,) = seq_file.records
+        _assert_reads_like(record, seq)
+    assert "ragged lines" in capsys.readouterr().err
+    with open_sequence_file(str(path)) as seq_file:
+        assert str(pickle.loads(pickle.dumps(seq_file.records[0]))) == seq
+
+
+def _write_twobit(path, seqs, order="<", version=0):
+    offset_format = "Q" if version else "I"
+    index_size = sum(1 + len(name) + struct.calcsize(offset_format) for name in seqs)
+    offset = 16 + index_size
+    header = struct.pack(order + "IIII", TWOBIT_SIGNATURE, version, len(seqs), 0)
+    index, body = b"", b""
+    for name, seq in seqs.items():
+        index += bytes([len(name)]) + name.encode() + struct.pack(order + offset_format,
+                                                                 offset + len(body))
+        blocks = [(m.start(), m.end() - m.start()) for m in _N_RUNS.finditer(seq)]
+        entry = struct.pack(order + "II", len(seq), len(blocks))
+        entry += struct.pack(order + f"{len(blocks)}I", *(s for s, _ in blocks))
+        entry += struct.pack(order + f"{len(blocks)}I", *(n for _, n in blocks))
+        entry += struct.pack(order + "IIII", 1, 0, 5, 0)  # one mask block, then reserved
+        padded = seq + "T" * (-len(seq) % 4)
+        entry += bytes(sum(_TWOBIT_CODES[b] << (6 - 2 * k) for k, b in enumerate(padded[i:i + 4]))
+                       for i in range(0, len(padded), 4))
+        body += entry
+    path.write_bytes(header + index + body)
+
+
+@pytest.mark.parametrize("order,version", [("<", 0), (">", 0), ("<", 1)])
+def test_twobit_matches_written_sequences(tmp_path, order, version):
+    seqs = {
+        "plain": _random_bases(203, 1),
+        "gaps": "NN" + _random_bases(50, 2) + "N" * 9 + _random_bases(33, 3) + "N",
+        "tiny": "G",
+        "empty": "",
+    }
+    path = tmp_path / "genome.bin"  # no extension: sniffed from the signature
+    _write_twobit(path, seqs, order, version)
+    with open_sequence_file(str(path)) as seq_file:
+        assert isinstance(seq_file, TwoBitFile)
+        records = seq_file.records
+        assert [r.name for r in records] == list(seqs)
+        for record, seq in zip(records, seqs.values()):
+            _assert_reads_like(record, seq)
+            assert record.has_unknown == ("N" in seq)
+        assert str(records[0].packed()) == seqs["plain"]
+        assert str(pickle.loads(pickle.dumps(records[1]))) == seqs["gaps"]
+
+
+def test_twobit_rejects_other_files(tmp_path):
+    path = tmp_path / "bad.2bit"
+    path.write_bytes(b"\0" * 32)
+    with pytest.raises(ValueError, match="bad signature"):
+        TwoBitFile(str(path))
+
+
+def test_export_round_trip(tmp_path):
+    seq = _random_bases(1000, 9)
+    path = tmp_path / "out.fa"
+    export_strand(str(path), seq, name="roundtrip", line_width=70)
+    with open_sequence_file(str(path)) as seq_file:
+        forward, reverse = seq_file.records
+        assert forward.name == "roundtrip" and reverse.name == "roundtrip_complement"
+        _assert_reads_like(forward, seq)
+        assert str(reverse) == str(forward.complement())
+    assert max(len(line) for line in path.read_text().splitlines()) == 70
@@ -0,0 +1,112 @@
+import random
+
+import pytest
+
+import dna_mutation
+from dna_mutation import MutableStrand, MutationEngine, dirty_ranges
+from dna_sequence import get_complement_strand
+
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    # Small blocks so edits cross, empty and split them
+    monkeypatch.setattr(dna_mutation, "BLOCK_SIZE", 8)
+
+
+def _random_bases(n, rng):
+    return "".join(rng.choice("ACGTN") for _ in range(n))
+
+
+def _assert_same(strand, text):
+    assert len(strand) == len(text)
+    assert str(strand) == text and bytes(strand) == text.encode()
+    assert strand.base_counts() == {b: text.count(b) for b in "ATGCN"}
+    assert str(strand.complement()) == get_complement_strand(text)
+    rng = random.Random(len(text))
+    for _ in range(20):
+        start, stop = rng.randint(-3, len(text) + 3), rng.randint(-3, len(text) + 3)
+        assert strand[start:stop] == text[start:stop]
+        assert strand.complement()[start:stop] == get_complement_strand(text)[start:stop]
+    assert strand[::3] == text[::3]
+    if text:
+        assert strand[-1] == text[-1]
+    assert "".join(strand.iter_chunks(5)) == text
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_replace_matches_str_splicing(seed):
+    rng = random.Random(seed)
+    text = _random_bases(rng.randint(0, 60), rng)
+    strand = MutableStrand(text.lower())
+    complement = strand.complement()
+    for _ in range(300):
+        start = rng.randint(0, len(text))
+        removed = rng.randint(0, min(len(text) - start, 20))
+        inserted = _random_bases(rng.choice([0, 1, removed, 3, 25]), rng)
+        strand.replace(start, removed, inserted.lower())
+        text = text[:start] + inserted + text[start + removed:]
+        assert str(complement) == get_complement_strand(text)
+    _assert_same(strand, text)
+    assert all(len(block) <= 2 * dna_mutation.BLOCK_SIZE for block in strand._blocks)
+    assert len(strand._blocks) == 1 or all(strand._blocks)
+
+
+def test_journal_replays_onto_a_copy():
+    engine = MutationEngine("ACGT" * 30, seed=3)
+    copy = MutableStrand("ACGT" * 30)
+    for _ in range(20):
+        copy.apply(engine.step(7))
+        _assert_same(copy, str(engine.strand))
+    assert engine.generation == 20
+    assert engine.strand.take_edits() == []
+
+
+def test_edits_outside_the_strand_are_rejected():
+    strand = MutableStrand("ACGT")
+    for start, removed in ((5, 0), (-1, 1), (2, 3), (0, -1)):
+        with pytest.raises(IndexError):
+            strand.replace(start, removed, "A")
+    _assert_same(strand, "ACGT")
+
+
+def _reference_dirty(edits, old_length):
+    """Positions (after the edits) whose base may differ, base by base."""
+    # Track where every original base ends up; substituted or new bases are dirty
+    origin = list(range(old_length))
+    for start, removed, inserted in edits:
+        origin[start:start + removed] = [None] * len(inserted)
+    return {pos for pos, src in enumerate(origin) if src != pos}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_dirty_ranges_cover_every_changed_base(seed):
+    rng = random.Random(seed)
+    length = rng.randint(0, 50)
+    strand = MutableStrand("A" * length)
+    indels = seed % 2
+    for _ in range(rng.randint(0, 6)):
+        start = rng.randint(0, len(strand))
+        removed = rng.randint(0, min(len(strand) - start, 4))
+        size = rng.randint(0, 4) if indels else removed
+        strand.replace(start, removed, "C" * size)
+    edits = strand.take_edits()
+    ranges = dirty_ranges(edits, len(strand))
+
+    covered = set()
+    for a, b in ranges:
+        assert 0 <= a < b <= len(strand)
+        covered.update(range(a, b))
+    assert all(b1 < a2 for (_, b1), (a2, _) in zip(ranges, ranges[1:]))
+    changed = _reference_dirty(edits, length)
+    if indels:
+        assert changed <= covered
+    else:
+        assert changed == covered
+
+
+def test_dirty_ranges_examples():
+    assert dirty_ranges([], 10) == []
+    assert dirty_ranges([(2, 1, "A"), (3, 2, "CG"), (8, 1, "T")], 10) == [(2, 5), (8, 9)]
+    assert dirty_ranges([(6, 1, "A"), (4, 0, "GG"), (1, 1, "C")], 12) == [(1, 2), (4, 12)]
+    assert dirty_ranges([(3, 2, "")], 3) == []
+    assert dirty_ranges([(0, 0, "")], 5) == []
@@ -0,0 +1,73 @@
+import random
+import re
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import dna_search
+from dna_search import IUPAC_CODES, KmerIndex, kmer_spectrum, reverse_complement
+from dna_sequence import COMPLEMENT, PackedStrand
+
+
+def _regex_find(strand, pattern):
+    """Overlapping starts of an IUPAC *pattern*; N in the strand matches nothing."""
+    body = "".join(f"[{IUPAC_CODES[s]}]" for s in pattern.upper())
+    return [m.start() for m in re.finditer(f"(?=({body}))", strand)]
+
+
+def _reverse_strand_hits(strand, pattern):
+    """Hits on the complement strand read 5' to 3', as leftmost forward positions."""
+    other = "".join(COMPLEMENT.get(b, "N") for b in reversed(strand))
+    return sorted(len(strand) - start - len(pattern) for start in _regex_find(other, pattern))
+
+
+def _random_strand(n, seed):
+    rng = random.Random(seed)
+    bases = [rng.choice("ACGT") for _ in range(n)]
+    for _ in range(n // 100):
+        start = rng.randrange(n)
+        bases[start:start + rng.randint(1, 4)] = "N" * len(bases[start:start + 4])
+    return "".join(bases)[:n]
+
+
+PATTERNS = ["A", "GC", "TATA", "GATTACA", "ACGTACGT", "GAATTC", "GANTC", "RYRY",
+            "TTGACA", "WWWWWW", "CCWGGNNNNACGT", "NNNNNNNNN", "nnk", "GAUUACA",
+            "ACGTRYKMSWBDHV", "AAAAAAAAAAAAAAAAAAAA"]
+
+
+@pytest.mark.parametrize("k", [3, 8])
+def test_search_matches_regex_on_both_strands(k):
+    strand = _random_strand(3000, k)
+    strand += "GATTACA" + "N" + "TGTAATC" + "ACGTACGT"  # a few planted hits near the end
+    index = KmerIndex(strand, k=k)
+    for pattern in PATTERNS:
+        forward, reverse = index.search(pattern)
+        expected = _regex_find(strand, pattern.replace("u", "t").replace("U", "T"))
+        assert forward.tolist() == expected, pattern
+        assert reverse.tolist() == _reverse_strand_hits(strand, pattern.upper().replace("U", "T"))
+        assert reverse.tolist() == _regex_find(strand, reverse_complement(pattern))
+
+
+def test_degenerate_patterns_fall_back_to_scanning(monkeypatch):
+    strand = _random_strand(500, 1)
+    index = KmerIndex(PackedStrand.from_str(strand.replace("N", "A")))
+    monkeypatch.setattr(dna_search, "MAX_SEED_KEYS", 1)
+    for pattern in ("RY", "NNNNNNNNNN", "GANTC"):
+        assert index.find(pattern).tolist() == _regex_find(strand.replace("N", "A"), pattern)
+
+
+def test_index_counts_and_edge_cases():
+    strand = "ACGTNACGTA"
+    index = KmerIndex(strand, k=2)
+    counts = dict(zip(("AA AC AG AT CA CC CG CT GA GC GG GT TA TC TG TT").split(),
+                      index.counts.tolist()))
+    assert counts["AC"] == 2 and counts["TA"] == 1 and sum(counts.values()) == 7
+    assert kmer_spectrum(index.counts).tolist() == [12, 1, 3]
+    assert index.find("ACGTNACGTAA").tolist() == []
+    assert KmerIndex("").find("A").tolist() == []
+    assert reverse_complement("ACGRYN") == "NRYCGT"
+    with pytest.raises(ValueError):
+        index.find("")
+    with pytest.raises(ValueError):
+        index.find("AXG")
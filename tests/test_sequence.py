@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from dna_sequence import (COMPLEMENT, NUMPY_AVAILABLE, PackedStrand, as_packed, codes_array,
+                          get_complement_strand, to_codes)
+
+
+def _random_bases(n, seed):
+    rng = random.Random(seed)
+    return "".join(rng.choice("ACGT") for _ in range(n))
+
+
+@pytest.mark.parametrize("n", [0, 1, 3, 4, 5, 17, 64, 257])
+def test_round_trip_and_length(n):
+    text = _random_bases(n, n)
+    strand = PackedStrand.from_str(text)
+    assert len(strand) == n
+    assert str(strand) == text
+    assert list(strand) == list(text)
+    assert strand.nbytes == (n + 3) // 4
+    assert PackedStrand.from_str(text.lower()) == strand
+
+
+def test_indexing_and_slicing_match_str():
+    text = _random_bases(103, 1)
+    strand = PackedStrand.from_str(text)
+    for i in range(-len(text), len(text)):
+        assert strand[i] == text[i]
+    with pytest.raises(IndexError):
+        strand[len(text)]
+    rng = random.Random(2)
+    for _ in range(300):
+        start, stop = rng.randint(-110, 110), rng.randint(-110, 110)
+        step = rng.choice([None, 1, 2, 3, -1, -2])
+        piece = strand[start:stop:step]
+        assert isinstance(piece, PackedStrand)
+        assert str(piece) == text[start:stop:step]
+        # Padding bits must not leak into equality or counts
+        assert piece == PackedStrand.from_str(text[start:stop:step])
+
+
+def test_counts_match_str():
+    text = _random_bases(1001, 3)
+    strand = PackedStrand.from_str(text)
+    for start in range(4):
+        piece, ref = strand[start:], text[start:]
+        assert piece.base_counts() == {b: ref.count(b) for b in "ACGT"}
+        for base in "ACGT":
+            assert piece.count(base) == ref.count(base)
+        assert piece.count("GA") == ref.count("GA")
+
+
+def test_complement_matches_base_pairing():
+    text = _random_bases(77, 4)
+    strand = PackedStrand.from_str(text)
+    expected = "".join(COMPLEMENT[b] for b in text)
+    assert str(strand.complement()) == expected
+    assert str(get_complement_strand(strand)) == expected
+    assert get_complement_strand(text) == expected
+    assert strand.complement().complement() == strand
+    assert str(strand[5:30].complement()) == expected[5:30]
+
+
+def test_invalid_bases_are_rejected():
+    with pytest.raises(ValueError, match="invalid DNA base: 'N'"):
+        PackedStrand.from_str("ACNT")
+    with pytest.raises(ValueError):
+        PackedStrand(b"\x00", 5)
+    assert as_packed("ACGT") == PackedStrand.from_str("ACGT")
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="needs NumPy")
+def test_code_arrays_agree():
+    text = _random_bases(50, 5)
+    strand = PackedStrand.from_str(text)
+    assert codes_array(strand).tolist() == list(to_codes(text))
+    assert to_codes("ACGTN") == bytes([0, 1, 2, 3, 4])
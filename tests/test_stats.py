@@ -0,0 +1,114 @@
+import gc
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dna_io import open_sequence_file
+from dna_mutation import MutableStrand
+from dna_sequence import generate_dna_strand
+from dna_sequence import PackedStrand
+from dna_stats import (Composition, StrandStats, _bounded_map, gc_profile, get_composition,
+                       iter_gc_profile, map_statistics, parallel_statistics)
+
+pytest.importorskip("numpy")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_statistics_takes_records_and_mutable_strands_whole(tmp_path, workers):
+    strand = str(generate_dna_strand(20_000, seed=5))
+    path = tmp_path / "one.fa"
+    path.write_text(">one\n" + "\n".join(strand[i:i + 60] for i in range(0, len(strand), 60))
+                    + "\n>empty\n")
+    record, empty = open_sequence_file(str(path)).records
+    expected = StrandStats.from_strand(strand, 3)
+    for single in (record, MutableStrand(strand)):
+        assert parallel_statistics(single, 3, workers, chunk_size=4096) == expected
+    assert parallel_statistics([record, empty], 3, workers, chunk_size=4096) == expected
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_map_statistics_matches_from_strand(workers):
+    strands = [str(generate_dna_strand(n, seed=n)) for n in (0, 1, 5_000, 12_345)]
+    results = map_statistics(strands, 4, workers, chunk_size=1024)
+    assert results == [StrandStats.from_strand(s, 4) for s in strands]
+
+
+def test_bounded_map_reads_tasks_only_as_workers_finish():
+    read = []
+
+    def tasks():
+        for i in range(100):
+            read.append(i)
+            yield i
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = _bounded_map(pool, lambda x: x * x, tasks(), 4)
+        assert next(results) == 0
+        assert len(read) <= 5
+        assert list(results) == [i * i for i in range(1, 100)]
+
+
+def test_composition_memo_does_not_keep_strands_alive():
+    strand = generate_dna_strand(10_000, seed=9)
+    first = get_composition(strand)
+    assert get_composition(strand) is first
+    ref = weakref.ref(strand)
+    del strand
+    gc.collect()
+    assert ref() is None
+    assert get_composition("ACGTN").counts == dict.fromkeys("ATGCN", 1)
+
+
+def test_composition_matches_str_count_for_every_representation(tmp_path):
+    text = str(generate_dna_strand(4_999, seed=11))
+    mixed = text[:1000].lower() + "NNnn" + text[1000:]
+    expected = {b: mixed.upper().count(b) for b in "ATGCN"}
+    path = tmp_path / "mixed.fa"
+    path.write_text(">mixed\n" + "\n".join(mixed[i:i + 70] for i in range(0, len(mixed), 70)) + "\n")
+    with open_sequence_file(str(path)) as seq_file:
+        (record,) = seq_file.records
+        for strand in (mixed, mixed.encode(), list(mixed), record, MutableStrand(mixed)):
+            comp = Composition.from_strand(strand)
+            assert comp.counts == expected and comp.length == len(mixed)
+    comp = get_composition(PackedStrand.from_str(text))
+    assert comp == Composition({b: text.count(b) for b in "ATGC"}, len(text))
+    assert comp.gc_content == pytest.approx((text.count("G") + text.count("C")) * 100 / len(text))
+    assert comp.gc_content + comp.at_content == pytest.approx(100)
+    assert Composition.from_strand("NNN").gc_content == 0.0
+
+
+def _naive_gc_profile(text, window, step):
+    rows = []
+    for start in range(0, len(text) - window + 1, step):
+        piece = text[start:start + window]
+        g, c, n = piece.count("G"), piece.count("C"), piece.count("N")
+        known = window - n
+        rows.append((start, (g + c) * 100 / known if known else 0.0,
+                     (g - c) / (g + c) if g + c else 0.0))
+    return rows
+
+
+@pytest.mark.parametrize("window,step", [(1, 1), (10, 3), (12, 12), (7, 20), (50, 25)])
+@pytest.mark.parametrize("chunk_size", [1, 9, 64, 10_000])
+def test_gc_profile_matches_naive_windows(window, step, chunk_size):
+    text = str(generate_dna_strand(997, seed=window * step))
+    text = text[:300] + "N" * 60 + text[360:]
+    chunks = (text[i:i + chunk_size] for i in range(0, len(text), chunk_size))
+    batches = list(iter_gc_profile(chunks, window, step))
+    rows = [row for batch in batches for row in zip(*batch)]
+    expected = _naive_gc_profile(text, window, step)
+    assert [start for start, _, _ in rows] == [start for start, _, _ in expected]
+    for (_, gc, skew), (_, ref_gc, ref_skew) in zip(rows, expected):
+        assert gc == pytest.approx(ref_gc) and skew == pytest.approx(ref_skew)
+    starts, _, _ = gc_profile(PackedStrand.from_str(text.replace("N", "A")), window, step,
+                              chunk_size=chunk_size)
+    assert starts.tolist() == [start for start, _, _ in expected]
+
+
+def test_gc_profile_of_short_or_empty_strand_is_empty():
+    for text in ("", "ACG"):
+        starts, gc, skew = gc_profile(text, 10)
+        assert len(starts) == len(gc) == len(skew) == 0
+    with pytest.raises(ValueError):
+        list(iter_gc_profile(["ACGT"], 0))
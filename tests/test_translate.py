@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from dna_mutation import MutableStrand
+from dna_sequence import PackedStrand, get_complement_strand
+from dna_translate import FRAMES, Orf, find_orfs, iter_orfs, six_frame_translation, translate
+
+# The standard code as usually tabulated, codons in T/C/A/G order
+_STANDARD = "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG"
+CODON_TABLE = {a + b + c: _STANDARD[16 * i + 4 * j + k]
+               for i, a in enumerate("TCAG") for j, b in enumerate("TCAG")
+               for k, c in enumerate("TCAG")}
+
+
+def _reverse_complement(strand):
+    return get_complement_strand(strand)[::-1]
+
+
+def _translate(strand):
+    return "".join(CODON_TABLE.get(strand[i:i + 3], "X") for i in range(0, len(strand) - 2, 3))
+
+
+def _frame_sequence(strand, frame):
+    return (strand if frame > 0 else _reverse_complement(strand))[abs(frame) - 1:]
+
+
+def _brute_orfs(strand, min_codons):
+    """ATG to the next in-frame stop, first ATG after a stop only, in all six frames."""
+    length, orfs = len(strand), []
+    for frame in FRAMES:
+        offset = abs(frame) - 1
+        start = None
+        for i, amino in enumerate(_translate(_frame_sequence(strand, frame))):
+            if amino == "*":
+                if start is not None and i - start >= min_codons:
+                    a, b = offset + 3 * start, offset + 3 * i + 3
+                    orfs.append(Orf(frame, a, b) if frame > 0
+                                else Orf(frame, length - b, length - a))
+                start = None
+            elif amino == "M" and start is None:
+                start = i
+    return sorted(orfs, key=lambda orf: (orf.start, orf.frame))
+
+
+def _random_strand(rng, n, alphabet):
+    return "".join(rng.choice(alphabet) for _ in range(n))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_translate_matches_codon_table_in_all_frames(seed):
+    rng = random.Random(seed)
+    strand = _random_strand(rng, rng.randint(0, 200), "ACGT" if seed % 2 else "ACGTN")
+    frames = six_frame_translation(strand)
+    for frame in FRAMES:
+        expected = _translate(_frame_sequence(strand, frame))
+        assert translate(strand, frame) == frames[frame] == expected
+        assert translate(strand.lower(), frame) == expected
+        if "N" not in strand:
+            assert translate(PackedStrand.from_str(strand), frame) == expected
+    with pytest.raises(ValueError):
+        translate(strand, 0)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 50, 1 << 20])
+def test_orfs_match_brute_force(chunk_size):
+    rng = random.Random(chunk_size)
+    for trial in range(40):
+        # Stop- and start-rich alphabets give many short ORFs on both strands
+        alphabet = ("ACGT", "ACGTTTAAGN", "ATGCAT")[trial % 3]
+        strand = _random_strand(rng, rng.randint(0, 400), alphabet)
+        min_codons = rng.choice([0, 1, 5, 20])
+        orfs = find_orfs(strand, min_codons, chunk_size)
+        assert orfs == _brute_orfs(strand, min_codons), (strand, min_codons)
+        done = [done for done, _ in iter_orfs(strand, min_codons, chunk_size)]
+        assert done == sorted(done) and (not strand or done[-1] == len(strand))
+        for orf in orfs:
+            protein = orf.protein(strand)
+            assert protein[:1] == "M" and "*" not in protein and len(protein) == orf.codons
+            assert orf.protein(strand, 3) == protein[:3]
+
+
+def test_orfs_of_other_strand_types():
+    strand = "CCATGAAATTTGGGTAACCTTACCCAAATTTCATGG"
+    expected = [Orf(3, 2, 17), Orf(-3, 19, 34)]
+    assert find_orfs(strand, 1) == expected
+    for other in (PackedStrand.from_str(strand), MutableStrand(strand)):
+        assert find_orfs(other, 1, chunk_size=5) == expected
+    assert [orf.protein(strand) for orf in expected] == ["MKFG", "MKFG"]
+    assert [orf.strand for orf in expected] == ["+", "-"]
+    assert find_orfs(strand, 5) == []
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pygame")
+pytest.importorskip("OpenGL.GL")
+
+import dna_viewer
+from dna_viewer import FrameTimer, _percentile
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def perf_counter(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(dna_viewer, "time", clock)
+    return clock
+
+
+def test_percentile_is_nearest_rank():
+    rng = random.Random(1)
+    for n in (1, 2, 5, 99, 100, 1001):
+        ordered = sorted(rng.random() for _ in range(n))
+        for q in (1, 50, 95, 99, 100):
+            assert _percentile(ordered, q) == np.percentile(ordered, q, method="inverted_cdf")
+    assert _percentile([], 50) == 0.0
+
+
+def test_frame_timer_percentiles_over_window_and_session(clock):
+    timer = FrameTimer()
+    frames = [0.001 * (i % 50 + 1) for i in range(FrameTimer.WINDOW + 60)]
+    for i, seconds in enumerate(frames):
+        timer.add("draw", seconds / 2)
+        timer.add("draw", seconds / 4)
+        timer.add("flip", 0.0005)
+        clock.now += seconds
+        timer.end_frame()
+
+    assert timer.frames == len(frames)
+    recent = sorted(frames[-FrameTimer.WINDOW:])
+    expected = tuple(_percentile(recent, q) * 1e3 for q in (50, 95, 99))
+    assert timer.percentiles("frame") == pytest.approx(expected)
+    session = sorted(frames)
+    assert timer.percentiles("frame", session=True) == pytest.approx(
+        tuple(np.percentile(session, q, method="inverted_cdf") * 1e3 for q in (50, 95, 99)))
+    assert timer.percentiles("draw", session=True) == pytest.approx(
+        tuple(v * 0.75 for v in timer.percentiles("frame", session=True)))
+    assert timer.percentiles("events") == (0.0, 0.0, 0.0)
+    assert timer.fps() == pytest.approx(len(recent) / sum(recent))
+
+    summary = timer.summary()
+    assert summary["frames"] == len(frames)
+    assert summary["seconds"] == pytest.approx(sum(frames))
+    assert summary["stages"]["frame"]["mean_ms"] == pytest.approx(np.mean(frames) * 1e3)
+    assert summary["stages"]["frame"]["max_ms"] == pytest.approx(max(frames) * 1e3)
+    assert summary["stages"]["flip"]["p99_ms"] == pytest.approx(0.5)
+    assert len(timer.hud_lines()) == 2 + 1 + len(FrameTimer.STAGES)
+
+
+def test_empty_frame_timer(clock):
+    timer = FrameTimer()
+    assert timer.fps() == 0.0
+    summary = timer.summary()
+    assert summary["frames"] == 0 and summary["fps"] == 0.0
+    assert summary["stages"]["frame"]["mean_ms"] == 0.0
@@ -0,0 +1,121 @@
+import multiprocessing
+from multiprocessing import shared_memory
+
+import pytest
+
+from dna_sequence import PackedStrand, get_complement_strand
+from dna_viewer_process import ViewerProcess, _decode, _encode, _next_commands
+
+
+@pytest.fixture
+def published():
+    segments = []
+
+    def publish(strand):
+        payload, kind = _encode(strand)
+        segment = shared_memory.SharedMemory(create=True, size=max(len(payload), 1))
+        segment.buf[:len(payload)] = payload
+        segments.append(segment)
+        return ("show", segment.name, len(strand), kind)
+
+    yield publish
+    for segment in segments:
+        segment.close()
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture
+def pipe():
+    viewer_end, gui_end = multiprocessing.Pipe(duplex=False)
+    yield viewer_end, gui_end
+    viewer_end.close()
+    gui_end.close()
+
+
+@pytest.mark.parametrize("strand", ["", "A", "ACGTACG", "ACGTNNAC",
+                                    PackedStrand.from_str("GATTACAG")])
+def test_strands_round_trip_through_shared_memory(published, strand):
+    _, name, length, kind = published(strand)
+    assert kind == ("text" if "N" in str(strand) else "packed")
+    decoded, complement = _decode(name, length, kind)
+    assert str(decoded) == str(strand)
+    assert str(complement) == get_complement_strand(str(strand))
+
+
+def test_next_commands_keeps_newest_strand_and_merges_its_edits(published, pipe):
+    viewer_end, gui_end = pipe
+    assert _next_commands(viewer_end) == []
+    gui_end.send(("edit", [("e", 0)]))
+    gui_end.send(published("AAAA"))
+    gui_end.send(("edit", [("e", 1)]))
+    gui_end.send(published("CCGG"))
+    gui_end.send(("edit", [("e", 2)]))
+    gui_end.send(("edit", [("e", 3), ("e", 4)]))
+    (show, strand, complement), edit = _next_commands(viewer_end)
+    assert (show, str(strand), str(complement)) == ("show", "CCGG", "GGCC")
+    assert edit == ("edit", [("e", 2), ("e", 3), ("e", 4)])
+
+    gui_end.send(("edit", [("e", 5)]))
+    gui_end.send(("edit", [("e", 6)]))
+    assert _next_commands(viewer_end) == [("edit", [("e", 5), ("e", 6)])]
+
+
+def test_next_commands_close_wins(published, pipe):
+    viewer_end, gui_end = pipe
+    gui_end.send(published("ACGT"))
+    gui_end.send(("close",))
+    gui_end.send(("edit", [("e", 0)]))
+    assert _next_commands(viewer_end) == [("close",)]
+    gui_end.close()
+    assert _next_commands(viewer_end) == [("close",)]
+
+
+def test_next_commands_drops_a_superseded_strand(published, pipe):
+    viewer_end, gui_end = pipe
+    message = published("ACGT")
+    segment = shared_memory.SharedMemory(name=message[1])
+    segment.unlink()
+    segment.close()
+    gui_end.send(message)
+    gui_end.send(("edit", [("e", 0)]))
+    assert _next_commands(viewer_end) == []
+
+
+class _FakeProcess:
+    def __init__(self):
+        self.running = True
+
+    def is_alive(self):
+        return self.running
+
+    def join(self, timeout=None):
+        self.running = False
+
+
+def test_show_releases_the_previous_segment(monkeypatch):
+    viewer = ViewerProcess()
+    ends = []
+
+    def start():
+        viewer_end, gui_end = multiprocessing.Pipe(duplex=False)
+        ends.append(viewer_end)
+        viewer._process, viewer._conn = _FakeProcess(), gui_end
+
+    monkeypatch.setattr(viewer, "_start", start)
+    try:
+        viewer.show("ACGT")
+        first = viewer._segment.name
+        viewer.show(PackedStrand.from_str("TTGA"))
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=first)
+        viewer.edit([("e", 0)])
+        commands = _next_commands(ends[0])
+        assert [c[0] for c in commands] == ["show", "edit"]
+        assert str(commands[0][1]) == "TTGA"
+    finally:
+        viewer.close()
+        ends[0].close()
+    assert viewer._segment is None and not viewer.alive